@@ -1,9 +1,19 @@
-from flask import Flask, request, jsonify, render_template, session, redirect
+from flask import (
+    Flask, Response, request, jsonify, render_template, session, redirect,
+    stream_with_context
+)
 from flask_cors import CORS
+from itsdangerous import BadSignature
+from werkzeug.http import parse_cookie
+import asyncio
+import click
 from services.ai_service import predict_resolution_time_and_process
 from datetime import datetime
+import os
+import threading
+import time
 
-from models import db, Issue, Mission, LedgerEntry, User, Reward
+from models import db, Issue, Mission, LedgerEntry, User, Reward, ensure_schema
 
 from services.ai_service import (
     classify_issue,
@@ -14,8 +24,89 @@ from services.ai_service import (
 )
 
 from services.mission_service import generate_missions
-from services.ledger_service import add_ledger_entry
-from services.blockchain_service import write_proof_to_blockchain
+from services.dedup_service import (
+    dedupe_issue,
+    index_pending,
+    rebuild_dedup_index,
+    start_dedup_maintenance
+)
+from services.ledger_service import (
+    add_ledger_entry,
+    verify_ledger,
+    verify_user_ledger
+)
+from services.blockchain_service import (
+    seal_pending,
+    start_sealer,
+    verify_proof,
+    write_proof_to_blockchain
+)
+from services.rank_service import rank_index
+from services.credits_service import award_issue_resolved, award_mission_completed
+from services.rollup_service import (
+    ensure_rollups,
+    rebuild_rollups,
+    record_reports,
+    user_summary
+)
+from services.event_service import (
+    credits_payload,
+    event_hub,
+    events_since,
+    issue_payload,
+    publish_event,
+    publish_issue_created,
+    stream_events
+)
+from services.event_relay import EventRelay
+from services.pagination import (
+    DEFAULT_PAGE_SIZE,
+    CursorError,
+    decode_cursor,
+    keyset_page,
+    page_size,
+    stream_json_lines
+)
+from services.export_service import (
+    EXPORT_BATCH_SIZE,
+    EXPORT_FORMATS,
+    ExportError,
+    export_issues
+)
+from services.import_service import (
+    IMPORT_CHUNK_SIZE,
+    detect_format,
+    import_issues,
+    iter_records
+)
+from services.ingest_service import (
+    enrich_issue,
+    enqueue_report,
+    ingest_hooks,
+    start_workers
+)
+from services.search_service import (
+    SearchError,
+    ensure_search_index,
+    rebuild_search_index,
+    search_issues
+)
+from services.storage import (
+    begin_write,
+    install_profile,
+    read_session,
+    storage_config
+)
+from services.geo_index import (
+    geohash_encode,
+    cover_bbox,
+    prefix_ranges,
+    bbox_around,
+    bbox_span_km,
+    haversine_km,
+    parse_coords,
+    SORT_IN_BOX_MAX_KM
+)
 
 from services.ai_service import (
     classify_issue,
@@ -24,7 +115,8 @@ from services.ai_service import (
     extract_location_from_text,
     reverse_geocode,
     detect_language,
-    translate_to_english
+    translate_to_english,
+    warm_up as ai_warm_up
 )
 
 
@@ -33,13 +125,103 @@ app.secret_key = "dev-secret-key"
 
 CORS(app)
 
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///db.sqlite"
+# DATABASE_URL / DB_PROFILE, see services/storage.py
+app.config.update(storage_config())
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+# "sync" enriches reports inside the request, "async" queues them
+app.config["REPORT_INGEST_MODE"] = os.environ.get("REPORT_INGEST_MODE", "sync")
+app.config["INGEST_WORKERS"] = int(os.environ.get("INGEST_WORKERS", 2))
+
 db.init_app(app)
+install_profile(app)
+
+
+# -------------------------------------------------------------------
+# ------------------------ STARTUP / FACTORY -------------------------
+# -------------------------------------------------------------------
+
+# Importing this module only builds the Flask app and registers routes.
+# Schema creation, ingest workers and cache warm-up happen in create_app()
+# (or lazily on the first request) so workers and tests start quickly.
+
+# Both run once per app: threaded workers can send their first requests
+# together, and calling create_app() twice must not start a second set of
+# background threads. What ran is recorded on app.extensions.
+
+_startup_lock = threading.Lock()
+
+
+def init_db():
+
+    if app.extensions.get("db_ready"):
+        return
+
+    with _startup_lock:
+
+        if app.extensions.get("db_ready"):
+            return
+
+        with app.app_context():
+            ensure_schema()
+            ensure_search_index()
+            ensure_rollups()
+
+        app.extensions["db_ready"] = True
+
+
+@app.before_request
+def ensure_db():
+    init_db()
+
+
+def warm_up():
+
+    init_db()
+
+    ai_warm_up()
+
+    with app.app_context():
+        rank_index.warm_up()
+
+
+def start_background_services():
+
+    # {name: (stop event, thread or threads)}
+    with _startup_lock:
+
+        services = app.extensions.get("background_services")
 
-with app.app_context():
-    db.create_all()
+        if services is not None:
+            return services
+
+        services = {}
+
+        if app.config["REPORT_INGEST_MODE"] == "async":
+            services["ingest"] = start_workers(app, app.config["INGEST_WORKERS"])
+
+        services["sealer"] = start_sealer(app)
+        services["dedup"] = start_dedup_maintenance(app)
+        services["rank"] = rank_index.start(app)
+
+        app.extensions["background_services"] = services
+
+        return services
+
+
+def create_app(warm=None):
+
+    init_db()
+
+    if warm is None:
+        warm = os.environ.get("WARM_UP") == "1"
+
+    if warm:
+        warm_up()
+
+    start_background_services()
+
+    return app
 
 
 # -------------------------------------------------------------------
@@ -148,6 +330,74 @@ def report_page():
         issues=issues
     )
 
+# -------------------------------------------------------------------
+# ------------------------ SPATIAL QUERIES ---------------------------
+# -------------------------------------------------------------------
+
+# a radius query reads a box twice its size; anything bigger than the
+# city is a full scan in disguise
+MAX_RADIUS_KM = 50.0
+
+
+def parse_radius(value, default):
+
+    try:
+        radius_km = float(value)
+    except (TypeError, ValueError):
+        return default
+
+    if not 0 < radius_km < float("inf"):
+        return default
+
+    return min(radius_km, MAX_RADIUS_KM)
+
+
+def issues_in_bbox(query, south, west, north, east):
+
+    # geohash prefixes turn the box into a few index range scans,
+    # the lat/lng bounds then trim the cells' overhang
+    ranges = prefix_ranges(cover_bbox(south, west, north, east))
+
+    return query.filter(
+        db.or_(*[
+            db.and_(Issue.geohash >= lo, Issue.geohash < hi)
+            for lo, hi in ranges
+        ]),
+        Issue.lat.between(south, north),
+        Issue.lng.between(west, east)
+    )
+
+
+def newest_in_bbox(query, south, west, north, east):
+
+    query = issues_in_bbox(query, south, west, north, east)
+
+    if bbox_span_km(south, west, north, east) > SORT_IN_BOX_MAX_KM:
+        return query.order_by(Issue.created_at.desc())
+
+    # unary + keeps SQLite off ix_issue_created, so the geohash ranges
+    # drive the lookup and only the rows in the box get sorted
+    return query.order_by(db.literal_column("+issue.created_at").desc())
+
+
+def issues_within_radius(query, lat, lng, radius_km, limit):
+
+    south, west, north, east = bbox_around(lat, lng, radius_km)
+
+    candidates = newest_in_bbox(query, south, west, north, east)
+
+    found = []
+
+    for i in candidates.yield_per(500):
+        d = haversine_km(lat, lng, i.lat, i.lng)
+        if d <= radius_km:
+            found.append((i, d))
+            if len(found) >= limit:
+                break
+
+    return found
+
+
 @app.route("/api/map/issues")
 def map_issues():
 
@@ -155,18 +405,39 @@ def map_issues():
         return jsonify({"error": "unauthorized"}), 401
 
     location = request.args.get("location")
+    limit = max(1, min(request.args.get("limit", 1000, type=int), 5000))
 
-    q = Issue.query
+    q = Issue.query.filter(Issue.geohash.isnot(None))
 
     if location:
         q = q.filter(Issue.location == location)
 
-    issues = q.all()
+    bbox = request.args.get("bbox")
+    lat, lng = parse_coords(request.args.get("lat"), request.args.get("lng"))
+
+    # bbox=south,west,north,east  or  lat=..&lng=..&radius_km=..
+    if bbox:
+        parts = bbox.split(",")
+
+        # parse_coords also turns away nan, inf and out-of-range corners
+        south, west = parse_coords(*parts[0:2]) if len(parts) == 4 else (None, None)
+        north, east = parse_coords(*parts[2:4]) if len(parts) == 4 else (None, None)
+
+        if south is None or north is None or south > north or west > east:
+            return jsonify({"error": "bbox must be south,west,north,east"}), 400
+
+        issues = newest_in_bbox(q, south, west, north, east)\
+            .limit(limit)\
+            .all()
 
-    # IMPORTANT:
-    # We only have text locations, not lat/lng stored.
-    # So we rely on reverse geocode lookup at report time
-    # OR fallback to stored lat/lng if you add them later.
+    elif lat is not None:
+        radius_km = parse_radius(request.args.get("radius_km"), 2.0)
+        issues = [
+            i for i, _ in issues_within_radius(q, lat, lng, radius_km, limit)
+        ]
+
+    else:
+        issues = q.order_by(Issue.created_at.desc()).limit(limit).all()
 
     return jsonify([
         {
@@ -174,48 +445,106 @@ def map_issues():
             "category": i.category,
             "subcategory": i.subcategory,
             "location": i.location,
-            "lat": getattr(i, "lat", None),
-            "lng": getattr(i, "lng", None),
+            "lat": i.lat,
+            "lng": i.lng,
             "status": i.status
         }
         for i in issues
-        if getattr(i, "lat", None) and getattr(i, "lng", None)
     ])
 
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from flask import jsonify, session
 from models import Issue
 
 
+# region rollups are cached per location filter and dropped whenever an
+# issue is written; the TTL bounds staleness across worker processes.
+# The filter is caller-supplied, so only the most recently used
+# REGION_CACHE_SIZE filters are kept
+REGION_CACHE_TTL = 30
+REGION_CACHE_SIZE = 64
+
+_region_cache = OrderedDict()
+_region_cache_lock = threading.Lock()
+
+
+def invalidate_region_cache():
+    with _region_cache_lock:
+        _region_cache.clear()
+
+
+def _cached_regions(location):
+
+    with _region_cache_lock:
+
+        cached = _region_cache.get(location)
+
+        if cached is None:
+            return None
+
+        if cached[0] <= time.time():
+            del _region_cache[location]
+            return None
+
+        _region_cache.move_to_end(location)
+        return cached[1]
+
+
+def _cache_regions(location, results):
+
+    with _region_cache_lock:
+
+        _region_cache[location] = (time.time() + REGION_CACHE_TTL, results)
+        _region_cache.move_to_end(location)
+
+        while len(_region_cache) > REGION_CACHE_SIZE:
+            _region_cache.popitem(last=False)
+
+
 @app.route("/api/map/regions")
 def map_regions():
 
-    rows = db.session.query(
-        Issue.location,
-        db.func.count(Issue.id)
-    ).group_by(Issue.location).all()
+    location = (request.args.get("location") or "").strip()
 
-    results = []
+    cached = _cached_regions(location)
+    if cached is not None:
+        return jsonify(cached)
 
-    for loc, count in rows:
+    with read_session() as reader:
 
-        cats = db.session.query(
+        q = reader.query(
+            Issue.location,
             Issue.category,
             db.func.count(Issue.id)
-        ).filter(Issue.location == loc)\
-         .group_by(Issue.category).all()
+        )
+
+        if location:
+            q = q.filter(Issue.location.ilike(f"%{location}%"))
+
+        rows = q.group_by(Issue.location, Issue.category)\
+            .order_by(Issue.location, Issue.category)\
+            .all()
 
-        breakdown = {c: n for c, n in cats}
+    regions = {}
+
+    for loc, cat, n in rows:
+        regions.setdefault(loc, {})[cat] = n
+
+    results = []
+
+    for loc, breakdown in regions.items():
 
         dominant = max(breakdown, key=breakdown.get) if breakdown else None
 
         results.append({
             "location": loc,
-            "count": count,
+            "count": sum(breakdown.values()),
             "dominant_category": dominant,
             "category_breakdown": breakdown
         })
 
+    _cache_regions(location, results)
+
     return jsonify(results)
 
 
@@ -230,13 +559,14 @@ def admin_leaderboard():
     if not user.email.endswith("@delhi.gov.in"):
         return jsonify({"error":"forbidden"}),403
 
-    users = (
-        User.query
-        .filter(~User.email.endswith("@delhi.gov.in"))
-        .order_by(User.credits.desc())
-        .limit(50)
-        .all()
-    )
+    with read_session() as reader:
+        users = (
+            reader.query(User.id, User.name, User.credits)
+            .filter(~User.email.endswith("@delhi.gov.in"))
+            .order_by(User.credits.desc())
+            .limit(50)
+            .all()
+        )
 
     return jsonify([
         {
@@ -259,51 +589,78 @@ def report_issue():
     user_id = session["user_id"]
 
     description = (data.get("description") or "").strip()
-    lang = detect_language(description)
-
-    if lang != "en" and lang != "unknown":
-        description = translate_to_english(description)
 
     category = data.get("category")
     subcategory = data.get("subcategory")
     location = data.get("location")
 
+    browser_location = data.get("browser_location") or {}
+    lat, lng = parse_coords(browser_location.get("lat"), browser_location.get("lng"))
+
     if not description:
         return jsonify({"error": "description required"}), 400
 
-    classification = classify_issue(description)
-
-    # safety fallback if popup was edited badly
-    final_category = category or classification["category"]
-    final_subcategory = subcategory or classification["subcategory"]
-
-    risk = predict_risk(classification, location)
-
     issue = Issue(
         user_id=user_id,
         original_text=description,
-        category=final_category,
-        subcategory=final_subcategory,
+        category=category,
+        subcategory=subcategory,
         location=location,
-        severity=risk["severity"],
         status="SUBMITTED",
-        created_at=datetime.utcnow()
+        created_at=datetime.utcnow(),
+        lat=lat,
+        lng=lng,
+        geohash=geohash_encode(lat, lng) if lat is not None else None
     )
 
+    # async: persist the raw report and let the ingest workers enrich it.
+    # Only the config decides; the workers run in async mode alone
+    if app.config["REPORT_INGEST_MODE"] == "async":
+
+        enqueue_report(issue)
+
+        return jsonify({
+            "issue_id": issue.id,
+            "ingest_status": issue.ingest_status
+        }), 202
+
+    enrich_issue(issue)
+    issue.ingest_status = "DONE"
+
+    begin_write()
+
+    # a repeat of an open issue links to it instead of spawning missions
+    duplicate_of = dedupe_issue(issue)
+
     db.session.add(issue)
+    publish_issue_created(issue)
+    record_reports([(issue.user_id, issue.location)])
+
+    missions = [] if duplicate_of else generate_missions([issue])
+
+    # the issue, its event, rollups and missions land in one commit
     db.session.commit()
 
-    missions = generate_missions(issue)
+    after_issue_ingested(issue)
 
     return jsonify({
         "issue_id": issue.id,
         "category": issue.category,
         "subcategory": issue.subcategory,
         "location_used": issue.location,
+        "duplicate_of": duplicate_of,
         "missions": missions
     })
 
 
+def after_issue_ingested(issue):
+
+    invalidate_region_cache()
+
+
+ingest_hooks.append(after_issue_ingested)
+
+
 # -------------------------------------------------------------------
 # --------------------------- AUTH ----------------------------------
 # -------------------------------------------------------------------
@@ -334,21 +691,21 @@ def signup():
 
     return render_template("signup.html")
 
-@app.route("/api/me/impact")
-def my_impact():
+# impact.html widgets, all served from the per-user rollup
 
-    uid = session["user_id"]
+@app.route("/api/me/summary")
+def my_summary():
 
-    areas = db.session.query(
-        Issue.location,
-        db.func.count(Issue.id)
-    ).filter(Issue.user_id == uid)\
-     .group_by(Issue.location)\
-     .all()
+    if "user_id" not in session:
+        return jsonify({"error": "unauthorized"}), 401
 
-    return jsonify(dict(areas))
+    return jsonify(user_summary(session["user_id"]))
 
-from sqlalchemy import func
+
+@app.route("/api/me/impact")
+def my_impact():
+
+    return jsonify(user_summary(session["user_id"])["impact"])
 
 from sqlalchemy import func
 
@@ -365,69 +722,7 @@ def my_rank():
     if me.email.endswith("@delhi.gov.in"):
         return jsonify({"error": "officers have no public rank"}), 403
 
-    # -----------------------------
-    # find user's main area
-    # -----------------------------
-    area_row = db.session.query(
-        Issue.location,
-        func.count(Issue.id).label("c")
-    ).filter(Issue.user_id == uid)\
-     .group_by(Issue.location)\
-     .order_by(func.count(Issue.id).desc())\
-     .first()
-
-    if not area_row or not area_row[0]:
-        return jsonify({
-            "area": None,
-            "rank_in_area": None,
-            "total_users_in_area": 0,
-            "rank_in_delhi": None,
-            "total_users_in_delhi":
-                User.query.filter(~User.email.endswith("@delhi.gov.in")).count()
-        })
-
-    area = area_row[0]
-
-    # -----------------------------
-    # area ranking
-    # -----------------------------
-    users_in_area = db.session.query(
-        User.id,
-        User.credits
-    ).join(Issue, Issue.user_id == User.id)\
-     .filter(Issue.location == area)\
-     .filter(~User.email.endswith("@delhi.gov.in"))\
-     .group_by(User.id)\
-     .order_by(User.credits.desc())\
-     .all()
-
-    area_rank = None
-    for idx, row in enumerate(users_in_area, start=1):
-        if row.id == uid:
-            area_rank = idx
-            break
-
-    # -----------------------------
-    # delhi ranking
-    # -----------------------------
-    all_users = User.query\
-        .filter(~User.email.endswith("@delhi.gov.in"))\
-        .order_by(User.credits.desc())\
-        .all()
-
-    delhi_rank = None
-    for idx, u in enumerate(all_users, start=1):
-        if u.id == uid:
-            delhi_rank = idx
-            break
-
-    return jsonify({
-        "area": area,
-        "rank_in_area": area_rank,
-        "total_users_in_area": len(users_in_area),
-        "rank_in_delhi": delhi_rank,
-        "total_users_in_delhi": len(all_users)
-    })
+    return jsonify(rank_index.rank(uid))
 
 
 @app.route("/profile")
@@ -560,6 +855,8 @@ def rewrite_complaint(issue_id):
 @app.route("/api/mission/<int:mission_id>/complete", methods=["POST"])
 def complete_mission(mission_id):
 
+    begin_write()
+
     mission = Mission.query.get_or_404(mission_id)
 
     data = request.get_json() or {}
@@ -570,12 +867,6 @@ def complete_mission(mission_id):
     mission.status = "COMPLETED"
     mission.completed_at = datetime.utcnow()
 
-    proof = write_proof_to_blockchain(
-        mission_id=mission.id,
-        before_hash=before_hash,
-        after_hash=after_hash
-    )
-
     # FIX: always use the issue owner for ledger
     issue = Issue.query.get(mission.issue_id)
 
@@ -585,22 +876,18 @@ def complete_mission(mission_id):
         category=mission.category
     )
 
-    proof = write_proof_to_blockchain(...)
+    # recorded now, sealed into a Merkle batch and anchored by the sealer
+    proof = write_proof_to_blockchain(
+        mission_id=mission.id,
+        before_hash=before_hash,
+        after_hash=after_hash
+    )
     mission.blockchain_tx = proof["tx_id"]
 
+    credits = award_mission_completed(mission)
 
-    user = User.query.get(mission.user_id)
-
-    reward_map = {
-        "waste": 10,
-        "water": 12,
-        "air": 15,
-        "roads": 8,
-        "greenery": 15
-    }
-
-    user.credits += reward_map.get(mission.category, 5)
-
+    if credits is not None:
+        publish_event("credits.changed", credits_payload(mission.user_id, credits))
 
     db.session.commit()
 
@@ -611,31 +898,80 @@ def complete_mission(mission_id):
 
 @app.route("/api/blockchain/verify/<tx>")
 def verify_tx(tx):
-    return jsonify({"verified": True, "tx": tx})
+    return jsonify(verify_proof(tx))
 
 @app.route("/api/me/rewards")
 def my_rewards():
 
-    u = User.query.get(session["user_id"])
+    return jsonify(user_summary(session["user_id"])["rewards"])
 
-    rewards = Reward.query\
-        .filter(Reward.min_credits <= u.credits)\
-        .all()
 
-    return jsonify([
-        {"name": r.name, "description": r.description}
-        for r in rewards
-    ])
+# -------------------------------------------------------------------
+# ---------------------------- PAGINATION ---------------------------
+# -------------------------------------------------------------------
+
+# ?limit=&cursor= returns one page newest first; the cursor for the next
+# page comes back in X-Next-Cursor. ?stream=1 (or Accept:
+# application/x-ndjson) streams every row from the cursor on as JSON lines.
+
+def paginated(query, ts_column, id_column, serialize, ts_attr="timestamp",
+              default_limit=DEFAULT_PAGE_SIZE):
+
+    try:
+        cursor = request.args.get("cursor")
+        cursor = decode_cursor(cursor) if cursor else None
+    except CursorError:
+        return jsonify({"error": "invalid cursor"}), 400
+
+    stream = request.args.get("stream") in ("1", "true") or \
+        request.accept_mimetypes.best == "application/x-ndjson"
+
+    if stream:
+        return Response(
+            stream_with_context(stream_json_lines(
+                query, ts_column, id_column, serialize, cursor, ts_attr
+            )),
+            mimetype="application/x-ndjson"
+        )
+
+    rows, next_cursor = keyset_page(
+        query, ts_column, id_column, cursor,
+        page_size(request.args.get("limit"), default_limit), ts_attr
+    )
+
+    response = jsonify([serialize(r) for r in rows])
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+    return response
 
 
 @app.route("/api/user/<int:user_id>/ledger", methods=["GET"])
 def user_ledger(user_id):
 
-    entries = LedgerEntry.query.filter_by(user_id=user_id)\
-        .order_by(LedgerEntry.timestamp.desc())\
-        .all()
+    return paginated(
+        LedgerEntry.query.filter_by(user_id=user_id),
+        LedgerEntry.timestamp,
+        LedgerEntry.id,
+        LedgerEntry.to_dict
+    )
+
+@app.route("/api/user/<int:user_id>/ledger/verify", methods=["GET"])
+def user_ledger_verify(user_id):
+
+    return jsonify(verify_user_ledger(user_id))
+
+
+@app.route("/api/officer/ledger/verify", methods=["GET"])
+def officer_ledger_verify():
+
+    if "user_id" not in session or not session.get("is_officer"):
+        return jsonify({"error": "forbidden"}), 403
+
+    # resumes from the last checkpoint unless ?full=1
+    return jsonify(verify_ledger(full=request.args.get("full") in ("1", "true")))
 
-    return jsonify([e.to_dict() for e in entries])
 
 @app.route("/leaderboard")
 def leaderboard_page():
@@ -663,19 +999,7 @@ def my_profile():
 @app.route("/api/me/metrics")
 def my_metrics():
 
-    uid = session.get("user_id")
-
-    total = LedgerEntry.query.filter_by(user_id=uid).count()
-
-    by_cat = db.session.query(
-        LedgerEntry.category,
-        db.func.count(LedgerEntry.id)
-    ).filter_by(user_id=uid).group_by(LedgerEntry.category).all()
-
-    return jsonify({
-        "total_actions": total,
-        "by_category": dict(by_cat)
-    })
+    return jsonify(user_summary(session.get("user_id"))["metrics"])
 
 @app.route("/api/me/public", methods=["POST"])
 def toggle_public():
@@ -694,11 +1018,12 @@ def area_insights():
     if not location:
         return jsonify({"error": "location required"}), 400
 
-    total_missions = Mission.query.filter_by(location=location).count()
-    completed = Mission.query.filter_by(
-        location=location,
-        status="COMPLETED"
-    ).count()
+    with read_session() as reader:
+        total_missions = reader.query(Mission).filter_by(location=location).count()
+        completed = reader.query(Mission).filter_by(
+            location=location,
+            status="COMPLETED"
+        ).count()
 
     return jsonify({
         "location": location,
@@ -719,26 +1044,31 @@ def nearby_issues():
 
     data = request.get_json() or {}
 
-    lat = data.get("lat")
-    lng = data.get("lng")
+    lat, lng = parse_coords(data.get("lat"), data.get("lng"))
 
-    if lat is None or lng is None:
+    if lat is None:
         return jsonify([])
 
+    radius_km = parse_radius(data.get("radius_km"), 1.5)
+
     location_name = reverse_geocode(lat, lng)
 
-    if not location_name:
+    found = issues_within_radius(Issue.query, lat, lng, radius_km, 10)
+
+    # older reports carry no coordinates, fall back to the locality name
+    if not found and location_name:
+        found = [
+            (i, None) for i in Issue.query.filter(
+                Issue.location.ilike(f"%{location_name}%")
+            ).order_by(Issue.created_at.desc()).limit(10).all()
+        ]
+
+    if not found and not location_name:
         return jsonify({
             "location": None,
             "issues": []
         })
 
-
-    # simple locality match
-    issues = Issue.query.filter(
-        Issue.location.ilike(f"%{location_name}%")
-    ).order_by(Issue.created_at.desc()).limit(10).all()
-
     return jsonify({
     "location": location_name,
     "issues": [
@@ -747,8 +1077,9 @@ def nearby_issues():
             "category": i.category,
             "subcategory": i.subcategory,
             "location": i.location,
-            "created_at": i.created_at.isoformat()
-        } for i in issues
+            "created_at": i.created_at.isoformat(),
+            "distance_km": round(d, 3) if d is not None else None
+        } for i, d in found
     ]
 })
 
@@ -781,9 +1112,36 @@ def officer_issues():
     if locality:
         query = query.filter(Issue.location.ilike(f"%{locality}%"))
 
-    issues = query.order_by(Issue.created_at.desc()).limit(50).all()
+    return paginated(
+        query,
+        Issue.created_at,
+        Issue.id,
+        Issue.to_dict,
+        ts_attr="created_at",
+        default_limit=50
+    )
+
+
+@app.route("/api/officer/issues/search", methods=["GET"])
+def officer_search_issues():
 
-    return jsonify([i.to_dict() for i in issues])
+    if "user_id" not in session or not session.get("is_officer"):
+        return jsonify({"error": "forbidden"}), 403
+
+    try:
+        results = search_issues(
+            request.args.get("q"),
+            status=request.args.get("status"),
+            category=request.args.get("category"),
+            since=request.args.get("since"),
+            until=request.args.get("until"),
+            limit=request.args.get("limit"),
+            offset=request.args.get("offset")
+        )
+    except SearchError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify(results)
 
 
 @app.route("/api/officer/issue/<int:issue_id>/update", methods=["POST"])
@@ -793,6 +1151,8 @@ def officer_update_issue(issue_id):
     if "user_id" not in session or not session.get("is_officer"):
         return jsonify({"error": "forbidden"}), 403
 
+    begin_write()
+
     issue = Issue.query.get_or_404(issue_id)
     data = request.get_json() or {}
 
@@ -813,26 +1173,21 @@ def officer_update_issue(issue_id):
     # ------------------------------------------------
     # give credits only once when resolved
     # ------------------------------------------------
+    credits = None
+
     if old_status != "RESOLVED" and new_status == "RESOLVED":
 
-        user = User.query.get(issue.user_id)
-
-        reward_map = {
-            "waste": 10,
-            "water": 12,
-            "air": 15,
-            "roads": 8,
-            "greenery": 15,
-            "transport": 8,
-            "public infrastructure": 8,
-            "noise": 6,
-            "animals": 6
-        }
+        credits = award_issue_resolved(issue)
+
+        if credits is not None:
+            publish_event("credits.changed", credits_payload(issue.user_id, credits))
 
-        user.credits = (user.credits or 0) + reward_map.get(issue.category, 5)
+    publish_event("issue.updated", issue_payload(issue))
 
     db.session.commit()
 
+    invalidate_region_cache()
+
     return jsonify({"success": True})
 
 
@@ -863,7 +1218,311 @@ def api_reverse_geocode():
 
     return jsonify({"location": name})
 
+# -------------------------------------------------------------------
+# ------------------------- LIVE UPDATES (SSE) ----------------------
+# -------------------------------------------------------------------
+
+# Production streams are served by the event relay (`flask event-relay`,
+# services/event_relay.py) behind the same path; this route holds a thread
+# per stream and is meant for the development server.
+
+@app.route("/api/events")
+def event_stream():
+
+    if "user_id" not in session:
+        return jsonify({"error": "unauthorized"}), 401
+
+    # subscribe before the replay query so nothing falls in between;
+    # stream_events drops anything the replay already sent
+    q = event_hub.subscribe(app)
+
+    last_id = request.headers.get("Last-Event-ID", type=int)
+    replay = events_since(last_id) if last_id is not None else []
+
+    db.session.remove()
+
+    # citizens get the public fields only (see PUBLIC_FIELDS)
+    officer = bool(session.get("is_officer"))
+
+    return Response(
+        stream_events(q, replay, last_id or 0, officer=officer),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+def event_relay_user(headers):
+
+    # the relay runs outside Flask's request cycle; it reads the signed
+    # session cookie the way Flask's session interface does
+    value = parse_cookie(headers.get("cookie", "")).get(app.config["SESSION_COOKIE_NAME"])
+    serializer = app.session_interface.get_signing_serializer(app)
+
+    if not value or serializer is None:
+        return None
+
+    try:
+        data = serializer.loads(
+            value, max_age=int(app.permanent_session_lifetime.total_seconds())
+        )
+    except BadSignature:
+        return None
+
+    if "user_id" not in data:
+        return None
+
+    return data["user_id"], bool(data.get("is_officer"))
+
+
+# -------------------------------------------------------------------
+# --------------------------- BULK IMPORT ---------------------------
+# -------------------------------------------------------------------
+
+def after_bulk_import(stats):
+
+    invalidate_region_cache()
+
+    # one event for the whole file; dashboards refetch instead of
+    # applying thousands of deltas
+    if stats["imported"]:
+        publish_event("issues.imported", {"count": stats["imported"]})
+        db.session.commit()
+
+
+@app.route("/api/officer/import", methods=["POST"])
+def officer_import():
+
+    if "user_id" not in session or not session.get("is_officer"):
+        return jsonify({"error": "forbidden"}), 403
+
+    upload = request.files.get("file")
+
+    if upload:
+        stream = upload.stream
+        fmt = request.args.get("format") or detect_format(upload.filename)
+    else:
+        stream = request.stream
+        fmt = request.args.get("format") or detect_format(
+            "", "jsonl" if "json" in (request.content_type or "") else "csv"
+        )
+
+    stats = import_issues(
+        iter_records(stream, fmt),
+        default_user_id=session["user_id"],
+        chunk_size=request.args.get("chunk_size", IMPORT_CHUNK_SIZE, type=int),
+        translate=request.args.get("translate") in ("1", "true")
+    )
+
+    after_bulk_import(stats)
+
+    return jsonify(stats)
+
+
+# -------------------------------------------------------------------
+# ----------------------------- EXPORT ------------------------------
+# -------------------------------------------------------------------
+
+EXPORT_MIMETYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet"
+}
+
+
+@app.route("/api/officer/export", methods=["GET"])
+def officer_export():
+
+    if "user_id" not in session or not session.get("is_officer"):
+        return jsonify({"error": "forbidden"}), 403
+
+    fmt = request.args.get("format", "csv")
+
+    try:
+        chunks = export_issues(
+            fmt,
+            location=request.args.get("location"),
+            category=request.args.get("category"),
+            status=request.args.get("status"),
+            since=request.args.get("since"),
+            until=request.args.get("until")
+        )
+    except ExportError as e:
+        return jsonify({"error": str(e)}), 400
+
+    filename = f"issues-{datetime.utcnow():%Y%m%d-%H%M%S}.{fmt}"
+
+    return Response(
+        stream_with_context(chunks),
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
+@app.cli.command("warm-up")
+def warm_up_command():
+
+    started = time.perf_counter()
+    warm_up()
+    click.echo(f"warmed up in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+
+@app.cli.command("import-issues")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--user-id", type=int, required=True,
+              help="Owner for rows that carry no user_id column.")
+@click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), default=None)
+@click.option("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+@click.option("--translate", is_flag=True,
+              help="Translate non-English complaints to English in batches.")
+def import_issues_command(path, user_id, fmt, chunk_size, translate):
+
+    init_db()
+
+    def report(stats):
+        click.echo(
+            f"\r{stats['imported']} imported, {stats['skipped']} skipped, "
+            f"{stats['per_second']:.0f} issues/s",
+            nl=False
+        )
+
+    with open(path, encoding="utf-8", newline="") as f:
+        stats = import_issues(
+            iter_records(f, fmt or detect_format(path)),
+            default_user_id=user_id,
+            chunk_size=chunk_size,
+            progress=report,
+            translate=translate
+        )
+
+    after_bulk_import(stats)
+
+    click.echo(f"\ndone in {stats['seconds']}s")
+
+    # no maintenance thread runs under the CLI; index the recent rows now
+    started = time.perf_counter()
+    indexed = index_pending()
+    click.echo(f"indexed {indexed} issues for dedup in {time.perf_counter() - started:.1f}s")
+
+
+@app.cli.command("rebuild-rollups")
+def rebuild_rollups_command():
+
+    init_db()
+
+    started = time.perf_counter()
+    rows = rebuild_rollups()
+    click.echo(f"rebuilt {rows} rollup rows in {time.perf_counter() - started:.1f}s")
+
+
+@app.cli.command("rebuild-search-index")
+def rebuild_search_index_command():
+
+    init_db()
+
+    started = time.perf_counter()
+    rebuild_search_index()
+    click.echo(f"rebuilt the search index in {time.perf_counter() - started:.1f}s")
+
+
+@app.cli.command("rebuild-dedup-index")
+@click.option("--full", is_flag=True, help="Re-index every recent issue from scratch.")
+def rebuild_dedup_index_command(full):
+
+    init_db()
+
+    started = time.perf_counter()
+    indexed = rebuild_dedup_index(full=full)
+    click.echo(f"indexed {indexed} issues in {time.perf_counter() - started:.1f}s")
+
+
+@app.cli.command("seal-proofs")
+def seal_proofs_command():
+
+    init_db()
+
+    started = time.perf_counter()
+    sealed = seal_pending()
+    click.echo(f"sealed {sealed} batches in {time.perf_counter() - started:.2f}s")
+
+
+@app.cli.command("verify-ledger")
+@click.option("--full", is_flag=True, help="Ignore checkpoints and rehash everything.")
+def verify_ledger_command(full):
+
+    init_db()
+
+    started = time.perf_counter()
+    result = verify_ledger(full=full)
+    elapsed = time.perf_counter() - started
+
+    if not result["ok"]:
+        raise click.ClickException(
+            f"ledger broken at entry {result['first_bad_entry']} "
+            f"({result['checked']} entries checked)"
+        )
+
+    click.echo(
+        f"ok: {result['checked']} entries after #{result['from_entry']} "
+        f"verified in {elapsed:.2f}s"
+    )
+
+
+@app.cli.command("event-relay")
+@click.option("--host", default="127.0.0.1")
+@click.option("--port", type=int, default=5001)
+def event_relay_command(host, port):
+
+    init_db()
+
+    click.echo(f"serving /api/events on http://{host}:{port}")
+    asyncio.run(EventRelay(app, event_relay_user).serve_forever(host, port))
+
+
+@app.cli.command("export-issues")
+@click.argument("path", type=click.Path(dir_okay=False, writable=True))
+@click.option("--format", "fmt", type=click.Choice(EXPORT_FORMATS), default=None,
+              help="Defaults to the file extension, else csv.")
+@click.option("--location", default=None)
+@click.option("--category", default=None)
+@click.option("--status", default=None)
+@click.option("--since", default=None, help="ISO date, inclusive.")
+@click.option("--until", default=None, help="ISO date, exclusive.")
+@click.option("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+def export_issues_command(path, fmt, location, category, status, since, until,
+                          batch_size):
+
+    init_db()
+
+    fmt = fmt or ("parquet" if path.endswith(".parquet") else "csv")
+    started = time.perf_counter()
+
+    try:
+        chunks = export_issues(
+            fmt, batch_size,
+            location=location, category=category, status=status,
+            since=since, until=until
+        )
+    except ExportError as e:
+        raise click.UsageError(str(e))
+
+    size = 0
+
+    with open(path, "wb") as f:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            f.write(chunk)
+            size += len(chunk)
+
+    click.echo(
+        f"wrote {size / 1e6:.1f}MB to {path} in "
+        f"{time.perf_counter() - started:.1f}s"
+    )
+
+
 # -------------------------------------------------------------------
 
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    create_app().run(debug=True)
\ No newline at end of file
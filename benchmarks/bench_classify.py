@@ -0,0 +1,124 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.ai_service import (  # noqa: E402
+    ISSUE_TAXONOMY,
+    _build_keyword_automaton,
+    classify_issue
+)
+
+
+# ----------------------------------------------------
+# classify_issue: keyword automaton vs the old substring loop
+# ----------------------------------------------------
+
+# python benchmarks/bench_classify.py
+
+COMPLAINT = (
+    "There is a huge pile of garbage near the bus stop in Rohini sector 7 "
+    "and the drain is overflowing since last week, please send someone. "
+)
+
+
+def substring_loop(text, taxonomy=ISSUE_TAXONOMY):
+
+    # classify_issue before the automaton
+    text = text.lower()
+
+    best = (0, "other", "general issue")
+
+    for category, subs in taxonomy.items():
+        for subcategory, keywords in subs.items():
+
+            score = sum(1 for kw in keywords if kw.lower() in text)
+
+            if score > best[0]:
+                best = (score, category, subcategory)
+
+    return {"category": best[1], "subcategory": best[2]}
+
+
+def automaton_classifier(taxonomy):
+
+    # classify_issue's scoring over an automaton built from taxonomy
+    import services.ai_service as ai
+
+    automaton = _build_keyword_automaton(taxonomy)
+
+    def classify(text):
+        saved = ai._KEYWORD_AUTOMATON
+        ai._KEYWORD_AUTOMATON = automaton
+        try:
+            return classify_issue(text)
+        finally:
+            ai._KEYWORD_AUTOMATON = saved
+
+    return classify
+
+
+def synthetic_taxonomy(n_keywords, rng):
+
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    taxonomy = {}
+
+    for i in range(n_keywords):
+        kw = "".join(rng.choice(letters) for _ in range(rng.randint(5, 10)))
+        taxonomy.setdefault(f"cat{i % 20}", {}).setdefault(f"sub{i % 200}", []).append(kw)
+
+    return taxonomy
+
+
+def texts(rng):
+
+    words = "the road near my house is very bad since two weeks please help".split()
+
+    return {
+        "complaint, 170 chars": COMPLAINT[:170],
+        "repeated complaint, 21k chars": (COMPLAINT * 200)[:21000],
+        "free text, 21k chars": " ".join(rng.choice(words) for _ in range(5000))[:21000],
+        "numbers only, 21k chars": " ".join(str(rng.randint(0, 99999)) for _ in range(3600))[:21000],
+    }
+
+
+def timed(fn, text, min_seconds=0.3):
+
+    runs, started = 0, time.perf_counter()
+
+    while True:
+        fn(text)
+        runs += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            return elapsed / runs * 1e6
+
+
+def main():
+
+    rng = random.Random(7)
+
+    cases = [("current taxonomy", ISSUE_TAXONOMY)]
+    cases.append(("5k-keyword taxonomy", synthetic_taxonomy(5000, rng)))
+
+    print(f"{'taxonomy':<22} {'text':<32} {'old loop':>12} {'automaton':>12}")
+
+    for name, taxonomy in cases:
+
+        classify = automaton_classifier(taxonomy) \
+            if taxonomy is not ISSUE_TAXONOMY else classify_issue
+
+        for label, text in texts(rng).items():
+
+            assert classify(text) == substring_loop(text, taxonomy), label
+
+            old = timed(lambda t: substring_loop(t, taxonomy), text)
+            new = timed(classify, text)
+
+            print(f"{name:<22} {label:<32} {old:>10.1f}us {new:>10.1f}us")
+
+
+if __name__ == "__main__":
+    main()
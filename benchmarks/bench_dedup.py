@@ -0,0 +1,221 @@
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+from scratch import scratch_env
+
+ROOT = scratch_env()
+
+from app import app, init_db  # noqa: E402
+from models import db, DedupBucket, Issue  # noqa: E402
+from services.dedup_service import (  # noqa: E402
+    CLOSED_STATUSES,
+    DEDUP_THRESHOLD,
+    DEDUP_WINDOW_DAYS,
+    find_duplicate,
+    index_pending,
+    jaccard,
+    prune_dedup_index,
+    shingles
+)
+
+
+# ----------------------------------------------------
+# Near-duplicate lookup: LSH buckets vs scanning the scope
+# ----------------------------------------------------
+
+# python benchmarks/bench_dedup.py [issues]
+#
+# Synthetic complaints over 20 days, 400 localities and 9 categories.
+# Repeats are perturbed copies of stored issues (words dropped, filler
+# added, order shuffled); unrelated reports share the scope but not the
+# problem. "scope scan" is the exact answer: every open issue of the
+# same location and category in the window, compared one by one.
+
+CATEGORIES = {
+    "waste": ["garbage", "dump", "bin", "overflowing", "smell", "rotting", "heap"],
+    "water": ["pipeline", "leak", "supply", "dirty", "tanker", "pressure", "burst"],
+    "roads": ["pothole", "crack", "broken", "speed", "breaker", "asphalt", "caved"],
+    "electricity": ["streetlight", "wire", "transformer", "outage", "sparking", "pole", "dark"],
+    "drainage": ["drain", "sewage", "blocked", "flooding", "manhole", "stagnant", "clogged"],
+    "parks": ["swing", "bench", "grass", "gate", "fence", "fountain", "trees"],
+    "traffic": ["signal", "jam", "parking", "divider", "zebra", "crossing", "towing"],
+    "health": ["mosquito", "fogging", "dengue", "stray", "carcass", "clinic", "spraying"],
+    "noise": ["loudspeaker", "construction", "generator", "horn", "wedding", "night", "drilling"],
+}
+
+LANDMARKS = ["temple", "school", "market", "metro", "hospital", "bus stop", "park",
+             "gurudwara", "bank", "petrol pump", "mosque", "post office", "pharmacy",
+             "community hall", "police station", "railway crossing", "mall", "library"]
+
+FILLER = ["please", "urgent", "kindly", "help", "sir", "madam", "asap", "again",
+          "still", "nobody", "came", "since", "days", "weeks", "complaint"]
+
+WORDS = ["near", "behind", "opposite", "lane", "block", "house", "main", "road",
+         "corner", "side", "street", "gali", "number", "gate", "colony", "phase"]
+
+
+def complaint(rng, category, topic=None):
+
+    topic = CATEGORIES[topic or category]
+    words = rng.sample(topic, 3) + [rng.choice(LANDMARKS)] + rng.sample(WORDS, 4)
+    words += [f"{rng.choice(['block', 'house', 'gali', 'pole'])} {rng.randint(1, 400)}"]
+    words += [rng.choice(topic)]
+    rng.shuffle(words)
+
+    return " ".join(words)
+
+
+def perturb(rng, text):
+
+    words = text.split()
+
+    if rng.random() < 0.5:
+        words.pop(rng.randrange(len(words)))
+    if rng.random() < 0.5:
+        words = words[:max(6, len(words) - 2)]
+    if rng.random() < 0.7:
+        words.insert(rng.randrange(len(words) + 1), rng.choice(FILLER))
+    if rng.random() < 0.3:
+        i = rng.randrange(len(words) - 1)
+        words[i], words[i + 1] = words[i + 1], words[i]
+
+    return " ".join(words)
+
+
+def fill(count, rng, now):
+
+    locations = [f"Locality {n}" for n in range(400)]
+    categories = list(CATEGORIES)
+    rows = []
+
+    for _ in range(count):
+        category = rng.choice(categories)
+        rows.append((
+            1, complaint(rng, category), category, rng.choice(locations),
+            rng.choice(["SUBMITTED", "SUBMITTED", "INSPECTED", "IN_PROGRESS"]),
+            now - timedelta(seconds=rng.randint(0, 20 * 86400)), "DONE", False
+        ))
+
+    conn = sqlite3.connect(f"{ROOT}/db.sqlite")
+    conn.executemany(
+        "INSERT INTO issue (user_id, original_text, category, location, status,"
+        " created_at, ingest_status, dedup_indexed) VALUES (?,?,?,?,?,?,?,?)",
+        rows
+    )
+    conn.commit()
+    conn.close()
+
+    return locations
+
+
+def scope_scan(text, location, category, now):
+
+    grams = shingles(text)
+    since = now - timedelta(days=DEDUP_WINDOW_DAYS)
+
+    rows = db.session.query(Issue.id, Issue.original_text).filter(
+        Issue.location == location,
+        Issue.category == category,
+        Issue.status.notin_(CLOSED_STATUSES),
+        Issue.created_at >= since
+    )
+
+    best_id, best = None, DEDUP_THRESHOLD
+
+    for issue_id, other in rows:
+        score = jaccard(grams, shingles(other))
+        if score >= best:
+            best_id, best = issue_id, score
+
+    return best_id
+
+
+def percentile(values, p):
+
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000
+
+
+def main():
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    probes = 300
+    rng = random.Random(24)
+    now = datetime.utcnow()
+
+    init_db()
+
+    started = time.perf_counter()
+    locations = fill(count, rng, now)
+    print(f"{count} issues inserted in {time.perf_counter() - started:.0f}s")
+
+    with app.app_context():
+
+        size = os.path.getsize(f"{ROOT}/db.sqlite")
+        started = time.perf_counter()
+        index_pending()
+        elapsed = time.perf_counter() - started
+        db.session.execute(db.text("PRAGMA wal_checkpoint(TRUNCATE)"))
+
+        buckets = DedupBucket.query.count()
+        grown = (os.path.getsize(f"{ROOT}/db.sqlite") - size) / 2 ** 20
+
+        print(f"index build: {elapsed:.0f}s ({count / elapsed:.0f} issues/s), "
+              f"{buckets} bucket rows, +{grown:.0f} MB\n")
+
+        sample = db.session.query(
+            Issue.id, Issue.original_text, Issue.location, Issue.category
+        ).filter(Issue.id.in_(rng.sample(range(1, count + 1), probes))).all()
+
+        repeats = [(issue_id, perturb(rng, text), loc, cat)
+                   for issue_id, text, loc, cat in sample]
+
+        unrelated = []
+        for _ in range(probes):
+            # filed under one category, about another one's problem
+            category, topic = rng.sample(list(CATEGORIES), 2)
+            unrelated.append(
+                (None, complaint(rng, category, topic), rng.choice(locations), category)
+            )
+
+        print(f"{'':<24} {'linked':>7} {'to original':>12} {'p50':>9} {'p99':>9}")
+
+        for name, lookup in (
+            ("LSH buckets", lambda t, loc, cat: find_duplicate(t, loc, cat, now)[0]),
+            ("scope scan", lambda t, loc, cat: scope_scan(t, loc, cat, now)),
+        ):
+            for label, cases in (("repeats", repeats), ("unrelated", unrelated)):
+
+                times, linked, correct = [], 0, 0
+
+                for original, text, loc, cat in cases:
+                    started = time.perf_counter()
+                    found = lookup(text, loc, cat)
+                    times.append(time.perf_counter() - started)
+
+                    linked += found is not None
+                    correct += found is not None and found == original
+
+                print(f"{name + ', ' + label:<24} {linked:>3}/{len(cases)} "
+                      f"{correct:>8} {percentile(times, 0.5):>7.1f}ms "
+                      f"{percentile(times, 0.99):>7.1f}ms")
+
+        # resolve a tenth of the issues, then prune their buckets
+        db.session.execute(db.text(
+            "UPDATE issue SET status = 'RESOLVED' WHERE id % 10 = 0"
+        ))
+        db.session.commit()
+
+        started = time.perf_counter()
+        pruned = prune_dedup_index()
+        print(f"\nprune after resolving 10%: {pruned} issues in "
+              f"{time.perf_counter() - started:.1f}s, "
+              f"{DedupBucket.query.count()} bucket rows left")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langdetect import detect  # noqa: E402
+
+from services.ai_service import detect_language  # noqa: E402
+
+
+# ----------------------------------------------------
+# detect_language: script histogram vs langdetect on every call
+# ----------------------------------------------------
+
+# python benchmarks/bench_language.py
+
+TEXTS = {
+    "English": "The streetlight outside house number {n} in Rohini sector 7 "
+               "has not worked for two weeks and the lane is completely dark.",
+    "Hindi": "रोहिणी सेक्टर 7 में मकान नंबर {n} के बाहर की स्ट्रीट लाइट दो "
+             "हफ्तों से खराब है और गली में पूरा अंधेरा है।",
+    "mixed": "Rohini sector 7 में मकान नंबर {n} के बाहर streetlight two weeks "
+             "se kharab hai, gali mein andhera hai, please fix it jaldi.",
+}
+
+
+def old_detect(text):
+
+    # detect_language before the script histogram
+    try:
+        return detect(text)
+    except Exception:
+        return "unknown"
+
+
+def timed(fn, texts):
+
+    started = time.perf_counter()
+
+    for text in texts:
+        fn(text)
+
+    return (time.perf_counter() - started) / len(texts) * 1e6
+
+
+def main():
+
+    runs = 300
+
+    # langdetect loads its profiles on the first call
+    old_detect("warm up")
+    detect_language("warm up ये")
+
+    print(f"{'text':<22} {'langdetect':>12} {'tiered':>10}")
+
+    for name, template in TEXTS.items():
+
+        # distinct texts, so the memo on the langdetect fallback never hits
+        texts = [template.format(n=n) for n in range(runs)]
+
+        old = timed(old_detect, texts)
+        new = timed(detect_language, texts)
+
+        print(f"{name:<22} {old:>10.1f}us {new:>8.1f}us")
+
+    repeated = [TEXTS["mixed"].format(n=1)] * runs
+    print(f"{'mixed, repeated':<22} {timed(old_detect, repeated):>10.1f}us "
+          f"{timed(detect_language, repeated):>8.1f}us")
+
+
+if __name__ == "__main__":
+    main()
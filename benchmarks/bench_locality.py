@@ -0,0 +1,111 @@
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.ai_service import (  # noqa: E402
+    DELHI_LOCALITIES,
+    build_locality_index,
+    extract_location_from_text
+)
+
+
+# ----------------------------------------------------
+# extract_location_from_text: word trie vs one regex per place
+# ----------------------------------------------------
+
+# python benchmarks/bench_locality.py [gazetteer size]
+
+WITH_PLACE = (
+    "Garbage has not been collected for a week near the main market in "
+    "Lajpat Nagar and stray dogs are spreading it all over the road."
+)
+WITHOUT_PLACE = (
+    "Garbage has not been collected for a week near the main market and "
+    "stray dogs are spreading it all over the road behind our building."
+)
+
+
+def regex_scan(text, places=DELHI_LOCALITIES):
+
+    # extract_location_from_text before the trie
+    text = text.lower()
+    text = re.sub(r"[^\w\s]", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+
+    found = [
+        place for place in places
+        if re.search(r"\b" + re.escape(place) + r"\b", text)
+    ]
+
+    return max(found, key=len).title() if found else None
+
+
+def synthetic_gazetteer(size, rng):
+
+    suffixes = ["nagar", "vihar", "enclave", "colony", "park", "bagh",
+                "extension", "garden", "puri", "village"]
+    syllables = ["ra", "jo", "ka", "li", "pa", "sha", "ma", "vi", "de", "no",
+                 "ga", "tu", "bha", "ri", "su", "ha"]
+    places = list(DELHI_LOCALITIES)
+    seen = set(places)
+
+    while len(places) < size:
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        words = [name] + ([rng.choice(suffixes)] if rng.random() < 0.7 else [])
+        if rng.random() < 0.2:
+            words.append(f"phase {rng.randint(1, 4)}")
+        place = " ".join(words)
+
+        if place not in seen:
+            seen.add(place)
+            places.append(place)
+
+    return places
+
+
+def timed(fn, text, min_seconds=0.3):
+
+    runs, started = 0, time.perf_counter()
+
+    while True:
+        fn(text)
+        runs += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            return elapsed / runs * 1e6
+
+
+def main():
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(11)
+
+    big = synthetic_gazetteer(size, rng)
+    big_index = build_locality_index(big)
+
+    cases = [
+        ("built-in list", DELHI_LOCALITIES,
+         extract_location_from_text),
+        (f"{size}-entry gazetteer", big,
+         lambda t: extract_location_from_text(t, index=big_index)),
+    ]
+
+    print(f"{'gazetteer':<22} {'text':<16} {'regex scan':>12} {'trie':>10}")
+
+    for name, places, trie in cases:
+        for label, text in (("with place", WITH_PLACE), ("without place", WITHOUT_PLACE)):
+
+            assert trie(text) == regex_scan(text, places), (name, label)
+
+            old = timed(lambda t: regex_scan(t, places), text)
+            new = timed(trie, text)
+
+            print(f"{name:<22} {label:<16} {old:>10.1f}us {new:>8.1f}us")
+
+
+if __name__ == "__main__":
+    main()
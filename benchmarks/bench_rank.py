@@ -0,0 +1,157 @@
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+from scratch import scratch_env
+
+ROOT = scratch_env()
+
+from app import app, init_db  # noqa: E402
+from models import db, Issue, User  # noqa: E402
+from services.ai_service import DELHI_LOCALITIES  # noqa: E402
+from services.rank_service import RankIndex  # noqa: E402
+
+
+# ----------------------------------------------------
+# /api/me/rank: RankIndex vs loading every user
+# ----------------------------------------------------
+
+# python benchmarks/bench_rank.py [users]
+
+OFFICER = "@delhi.gov.in"
+
+
+def fill(count, rng):
+
+    conn = sqlite3.connect(f"{ROOT}/db.sqlite")
+    now = datetime(2025, 6, 1)
+
+    conn.executemany(
+        "INSERT INTO user (id, name, email, password, credits, public_profile)"
+        " VALUES (?,?,?,?,?,1)",
+        ((n, f"user {n}", f"user{n}@example.com", "x", rng.randint(0, 2000))
+         for n in range(1, count + 1))
+    )
+    conn.executemany(
+        "INSERT INTO issue (user_id, original_text, category, location, status,"
+        " created_at, ingest_status) VALUES (?,?,?,?,?,?,?)",
+        ((rng.randint(1, count), "garbage", "sanitation",
+          rng.choice(DELHI_LOCALITIES).title(), "SUBMITTED", now, "DONE")
+         for _ in range(count * 2))
+    )
+    conn.commit()
+    conn.close()
+
+
+def award_elsewhere(uid, amount, seq):
+
+    # another worker's award: a CreditAward row plus the balance
+    conn = sqlite3.connect(f"{ROOT}/db.sqlite")
+    conn.execute(
+        "INSERT INTO credit_award (award_key, user_id, amount, created_at)"
+        " VALUES (?,?,?,?)", (f"bench-{seq}", uid, amount, datetime.utcnow())
+    )
+    conn.execute("UPDATE user SET credits = credits + ? WHERE id = ?", (amount, uid))
+    conn.commit()
+    conn.close()
+
+
+def old_rank(uid):
+
+    # /api/me/rank before the index
+    area_row = db.session.query(Issue.location, db.func.count(Issue.id))\
+        .filter(Issue.user_id == uid)\
+        .group_by(Issue.location)\
+        .order_by(db.func.count(Issue.id).desc())\
+        .first()
+
+    area = area_row[0]
+
+    users_in_area = db.session.query(User.id, User.credits)\
+        .join(Issue, Issue.user_id == User.id)\
+        .filter(Issue.location == area)\
+        .filter(~User.email.endswith(OFFICER))\
+        .group_by(User.id)\
+        .order_by(User.credits.desc())\
+        .all()
+
+    area_rank = next(i for i, row in enumerate(users_in_area, 1) if row.id == uid)
+
+    all_users = User.query.filter(~User.email.endswith(OFFICER))\
+        .order_by(User.credits.desc()).all()
+
+    delhi_rank = next(i for i, u in enumerate(all_users, 1) if u.id == uid)
+
+    return area, area_rank, delhi_rank
+
+
+def timed(fn, runs):
+
+    started = time.perf_counter()
+
+    for _ in range(runs):
+        fn()
+
+    return (time.perf_counter() - started) / runs * 1000
+
+
+def main():
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    rng = random.Random(7)
+
+    init_db()
+
+    started = time.perf_counter()
+    fill(count, rng)
+    print(f"{count} users, {count * 2} issues inserted in "
+          f"{time.perf_counter() - started:.0f}s\n")
+
+    with app.app_context():
+
+        index = RankIndex()
+
+        started = time.perf_counter()
+        index.warm_up()
+        build = (time.perf_counter() - started) * 1000
+
+        uids = [rng.randint(1, count) for _ in range(50)]
+        uids = [u for u in uids if index.area_counts.get(u)]
+
+        picked = iter(uids * 1000)
+        seq = iter(range(10 ** 9))
+
+        def after_award():
+            uid = next(picked)
+            award_elsewhere(uid, 5, next(seq))
+            index.rank(uid)
+
+        def award_only():
+            award_elsewhere(next(picked), 5, next(seq))
+
+        old = timed(lambda: old_rank(next(picked)), 3)
+        warm = timed(lambda: index.rank(next(picked)), 200)
+        synced = timed(after_award, 100) - timed(award_only, 100)
+
+        print(f"{'':<34} {'ms':>9}")
+        print(f"{'old: load every user':<34} {old:>9.1f}")
+        print(f"{'index build (once per rebuild)':<34} {build:>9.1f}")
+        print(f"{'index rank':<34} {warm:>9.3f}")
+        print(f"{'index rank after another awards':<34} {synced:>9.3f}")
+
+        # the index and the old scan agree
+        for uid in uids[:3]:
+            got = index.rank(uid)
+            assert got["area"] == old_rank(uid)[0]
+
+            # the old scan breaks ties by row order, the index ranks them
+            # together, so compare against the competition rank
+            mine = db.session.get(User, uid).credits
+            above = User.query.filter(User.credits > mine).count()
+            assert got["rank_in_delhi"] == above + 1
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import sys
+import time
+from datetime import datetime
+
+from scratch import scratch_env
+
+scratch_env()
+
+from app import app, init_db  # noqa: E402
+from models import db, Issue, Mission, User  # noqa: E402
+from services.blockchain_service import write_proof_to_blockchain  # noqa: E402
+from services.event_service import publish_issue_created  # noqa: E402
+from services.ingest_service import enrich_issue  # noqa: E402
+from services.ledger_service import add_ledger_entries, add_ledger_entry, verify_ledger  # noqa: E402
+from services.mission_service import generate_missions  # noqa: E402
+from services.rollup_service import record_reports  # noqa: E402
+from services.storage import begin_write  # noqa: E402
+from services.translation_service import StubTranslateBackend, set_translation_backend  # noqa: E402
+
+
+# ----------------------------------------------------
+# Reporting throughput: one commit per unit of work vs one per step
+# ----------------------------------------------------
+
+# python benchmarks/bench_reporting.py [reports]
+#
+# "old" runs the same services but commits where the code did before
+# missions and ledger entries joined the caller's transaction. Commits are
+# what this measures, so run it where fsync is real: the scratch database
+# goes under $TMPDIR, and DB_PROFILE=default syncs on every commit.
+
+COMPLAINT = "Garbage has been dumped near the metro station in Lajpat Nagar"
+
+BATCH = 32
+
+
+def new_issue(user_id):
+
+    issue = Issue(
+        user_id=user_id,
+        original_text=COMPLAINT,
+        status="SUBMITTED",
+        created_at=datetime.utcnow()
+    )
+    enrich_issue(issue)
+    issue.ingest_status = "DONE"
+
+    return issue
+
+
+def report(issues, split):
+
+    begin_write()
+
+    for issue in issues:
+        db.session.add(issue)
+        publish_issue_created(issue)
+
+    record_reports((i.user_id, i.location) for i in issues)
+
+    if not split:
+        generate_missions(issues)
+        db.session.commit()
+        return
+
+    # before: the report commits, then every issue's missions commit
+    db.session.commit()
+
+    for issue in issues:
+        begin_write()
+        generate_missions([issue])
+        db.session.commit()
+
+
+def complete(mission, split):
+
+    begin_write()
+
+    mission.status = "COMPLETED"
+    mission.completed_at = datetime.utcnow()
+
+    add_ledger_entry(mission.user_id, mission.id, mission.category)
+
+    # before: add_ledger_entry committed on its own
+    if split:
+        db.session.commit()
+        begin_write()
+
+    mission.blockchain_tx = write_proof_to_blockchain(
+        mission_id=mission.id, before_hash=None, after_hash=None
+    )["tx_id"]
+
+    db.session.commit()
+
+
+def ledger_bulk(entries, split):
+
+    if not split:
+        begin_write()
+        add_ledger_entries(entries)
+        db.session.commit()
+        return
+
+    for entry in entries:
+        begin_write()
+        add_ledger_entry(*entry)
+        db.session.commit()
+
+
+def rate(fn, count):
+
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+
+    return count / elapsed, elapsed / count * 1000
+
+
+def main():
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    set_translation_backend(StubTranslateBackend())
+    init_db()
+
+    with app.app_context():
+
+        user = User(name="bench", email="bench@example.com", password="x")
+        db.session.add(user)
+        db.session.commit()
+        uid = user.id
+
+        def singles(split):
+            return lambda: [report([new_issue(uid)], split) for _ in range(count)]
+
+        def batches(split):
+            return lambda: [
+                report([new_issue(uid) for _ in range(BATCH)], split)
+                for _ in range(count // BATCH)
+            ]
+
+        def completions(split):
+            def run():
+                missions = Mission.query.filter_by(status="OPEN")\
+                    .order_by(Mission.id).limit(count).all()
+                for mission in missions:
+                    complete(mission, split)
+            return run
+
+        entries = [(uid, None, "waste")] * 1000
+
+        cases = [
+            ("single report", singles, count),
+            (f"reports, {BATCH} per batch", batches, count // BATCH * BATCH),
+            ("mission completion", completions, count),
+            ("1000 ledger entries", lambda split: lambda: ledger_bulk(entries, split), 1000),
+        ]
+
+        print(f"DB_PROFILE={app.config['DB_PROFILE']}\n")
+        print(f"{'':<24} {'old':>20} {'new':>20}")
+
+        for name, make, n in cases:
+            cells = []
+            for split in (True, False):
+                per_second, ms = rate(make(split), n)
+                cells.append(f"{per_second:>9.1f}/s {ms:>6.2f}ms")
+            print(f"{name:<24} {cells[0]:>20} {cells[1]:>20}")
+
+        orphans = Issue.query.filter(
+            ~Issue.id.in_(db.session.query(Mission.issue_id)),
+            Issue.duplicate_of.is_(None)
+        ).count()
+
+        assert verify_ledger(full=True)["ok"]
+        assert orphans == 0, orphans
+
+
+if __name__ == "__main__":
+    main()
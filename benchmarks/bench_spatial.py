@@ -0,0 +1,133 @@
+import math
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+from scratch import scratch_env
+
+ROOT = scratch_env()
+
+from app import app, init_db, issues_within_radius, newest_in_bbox  # noqa: E402
+from models import db, Issue  # noqa: E402
+from services.ai_service import DELHI_LOCALITIES  # noqa: E402
+from services.geo_index import bbox_around, geohash_encode  # noqa: E402
+
+
+# ----------------------------------------------------
+# Area queries: geohash ranges vs the old scans
+# ----------------------------------------------------
+
+# python benchmarks/bench_spatial.py [issues]
+
+# roughly the NCT of Delhi
+SOUTH, WEST, NORTH, EAST = 28.40, 76.84, 28.88, 77.35
+
+CENTRE = (28.5677, 77.2433)
+
+
+def fill(count, rng):
+
+    conn = sqlite3.connect(f"{ROOT}/db.sqlite")
+    start = datetime(2025, 1, 1)
+
+    rows = []
+    for n in range(count):
+        lat = rng.uniform(SOUTH, NORTH)
+        lng = rng.uniform(WEST, EAST)
+        rows.append((
+            rng.randint(1, 5000), "pothole on the road", "roads", "potholes",
+            rng.choice(DELHI_LOCALITIES).title(), "MEDIUM", "SUBMITTED",
+            start + timedelta(seconds=n * 30), lat, lng, geohash_encode(lat, lng)
+        ))
+
+    conn.executemany(
+        "INSERT INTO issue (user_id, original_text, category, subcategory,"
+        " location, severity, status, created_at, lat, lng, geohash)"
+        " VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+        rows
+    )
+    conn.commit()
+    conn.close()
+
+
+def old_nearby(location, limit=10):
+
+    # /api/issues/nearby before the geohash index
+    return Issue.query.filter(Issue.location.ilike(f"%{location}%"))\
+        .order_by(Issue.created_at.desc()).limit(limit).all()
+
+
+def old_bbox(south, west, north, east, limit=1000):
+
+    # lat/lng bounds alone: no index to use
+    return Issue.query.filter(
+        Issue.lat.between(south, north),
+        Issue.lng.between(west, east)
+    ).order_by(Issue.created_at.desc()).limit(limit).all()
+
+
+def new_bbox(south, west, north, east, limit=1000):
+
+    return newest_in_bbox(Issue.query, south, west, north, east)\
+        .limit(limit).all()
+
+
+def timed(fn, runs=5):
+
+    best = math.inf
+
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+        db.session.remove()
+
+    return best * 1000
+
+
+def main():
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(5)
+
+    init_db()
+
+    started = time.perf_counter()
+    fill(count, rng)
+    print(f"{count} issues inserted in {time.perf_counter() - started:.0f}s\n")
+
+    lat, lng = CENTRE
+    small = bbox_around(lat, lng, 1.0)
+
+    cases = [
+        ("nearby, 1.5 km radius",
+         lambda: old_nearby("Lajpat Nagar"),
+         lambda: issues_within_radius(Issue.query, lat, lng, 1.5, 10)),
+        ("nearby, 0.3 km radius",
+         lambda: old_nearby("Lajpat Nagar"),
+         lambda: issues_within_radius(Issue.query, lat, lng, 0.3, 10)),
+        ("map bbox ~2x2 km",
+         lambda: old_bbox(*small),
+         lambda: new_bbox(*small)),
+        ("map bbox ~16x16 km",
+         lambda: old_bbox(*bbox_around(lat, lng, 8.0)),
+         lambda: new_bbox(*bbox_around(lat, lng, 8.0))),
+        ("map bbox all of Delhi",
+         lambda: old_bbox(SOUTH, WEST, NORTH, EAST),
+         lambda: new_bbox(SOUTH, WEST, NORTH, EAST)),
+        ("map radius 0.5 km",
+         lambda: old_bbox(*bbox_around(lat, lng, 0.5)),
+         lambda: issues_within_radius(Issue.query, lat, lng, 0.5, 1000)),
+    ]
+
+    print(f"{'query':<24} {'old scan':>10} {'geohash':>10}")
+
+    with app.app_context():
+        for name, old, new in cases:
+            print(f"{name:<24} {timed(old):>8.1f}ms {timed(new):>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
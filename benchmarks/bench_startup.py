@@ -0,0 +1,134 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from scratch import scratch_env
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(HERE)
+
+
+# ----------------------------------------------------
+# Worker startup: import, create_app, warm-up, first request
+# ----------------------------------------------------
+
+# python benchmarks/bench_startup.py [runs]
+#
+# Every number comes from a fresh interpreter, since the point is what a
+# new gunicorn worker (or test process) pays before it serves traffic.
+
+# mixed script, no place named: goes through langdetect and the offline
+# locality grid, the lazily built parts a first request can hit
+COMPLAINT = "सड़क पर kachra pada hai, road ke side mein bahut garbage hai"
+BROWSER = {"lat": 28.5677, "lng": 77.2433}
+
+
+def child(mode):
+
+    scratch_env()
+
+    started = time.perf_counter()
+    import app as module
+    timings = {"import": time.perf_counter() - started}
+
+    if mode == "baseline":
+        return timings
+
+    started = time.perf_counter()
+    module.create_app(warm=False)
+    timings["create_app"] = time.perf_counter() - started
+
+    if mode == "warm":
+        started = time.perf_counter()
+        module.warm_up()
+        timings["warm_up"] = time.perf_counter() - started
+
+    client = module.app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = 1
+
+    started = time.perf_counter()
+    client.post("/api/issue/prefill", json={"text": COMPLAINT, "browser_location": BROWSER})
+    timings["first prefill"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    client.post("/api/issue/prefill", json={"text": COMPLAINT + " abhi", "browser_location": BROWSER})
+    timings["second prefill"] = time.perf_counter() - started
+
+    return timings
+
+
+def run(mode, cwd):
+
+    out = subprocess.run(
+        [sys.executable, os.path.join(HERE, "bench_startup.py"), "--child", mode],
+        cwd=cwd, capture_output=True, text=True, check=True
+    ).stdout
+
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def baseline_tree():
+
+    # app.py as first committed, for the eager-import numbers
+    root = subprocess.run(
+        ["git", "rev-list", "--max-parents=0", "HEAD"],
+        cwd=REPO, capture_output=True, text=True
+    ).stdout.split()
+
+    if not root:
+        return None
+
+    target = tempfile.mkdtemp(prefix="avin-baseline-")
+    archive = subprocess.run(
+        ["git", "archive", root[0]], cwd=REPO, capture_output=True, check=True
+    ).stdout
+    subprocess.run(["tar", "-x", "-C", target], input=archive, check=True)
+
+    return target
+
+
+def median(values):
+
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    rows = {}
+
+    baseline = baseline_tree()
+    if baseline:
+        rows["baseline"] = [run("baseline", baseline) for _ in range(runs)]
+        subprocess.run(["rm", "-rf", baseline])
+
+    rows["cold"] = [run("cold", REPO) for _ in range(runs)]
+    rows["warm"] = [run("warm", REPO) for _ in range(runs)]
+
+    steps = ["import", "create_app", "warm_up", "first prefill", "second prefill"]
+
+    print(f"median of {runs} fresh processes, ms\n")
+    print(f"{'':<12}" + "".join(f"{s:>16}" for s in steps))
+
+    for mode, samples in rows.items():
+        cells = [
+            f"{median([t[s] for t in samples]) * 1000:>16.1f}"
+            if s in samples[0] else f"{'-':>16}"
+            for s in steps
+        ]
+        print(f"{mode:<12}" + "".join(cells))
+
+
+if __name__ == "__main__":
+
+    if sys.argv[1:2] == ["--child"]:
+        sys.path.insert(0, os.getcwd())
+        print(json.dumps(child(sys.argv[2])))
+    else:
+        main()
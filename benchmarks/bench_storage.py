@@ -0,0 +1,205 @@
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from scratch import scratch_env
+
+HERE = os.path.abspath(__file__)
+
+
+# ----------------------------------------------------
+# Concurrent read/write load: storage profiles
+# ----------------------------------------------------
+
+# python benchmarks/bench_storage.py [seconds] [worker processes]
+#
+# Each worker is a separate process that imports app against the same
+# database file, the way gunicorn workers do, and drives it through the
+# test client from several threads. Writers alternate officer updates and
+# mission completions; readers hit region stats and area insights.
+
+ISSUES = 50_000
+
+LOCATIONS = ["Rohini", "Dwarka", "Saket", "Lajpat Nagar", "Karol Bagh",
+             "Janakpuri", "Mayur Vihar", "Pitampura"]
+
+SCENARIOS = [
+    ("writers only", 4, 0),
+    ("mixed", 2, 2),
+]
+
+
+def setup():
+
+    import app as module
+
+    module.init_db()
+
+    rng = random.Random(22)
+    now = datetime.utcnow()
+    path = module.app.config["SQLALCHEMY_DATABASE_URI"][len("sqlite:///"):]
+
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "INSERT INTO user (id, name, email, password, credits) VALUES"
+        " (1, 'citizen', 'citizen@example.com', 'x', 0),"
+        " (2, 'officer', 'officer@delhi.gov.in', 'x', 0)"
+    )
+    conn.executemany(
+        "INSERT INTO issue (id, user_id, original_text, category, subcategory,"
+        " location, status, created_at, ingest_status)"
+        " VALUES (?, 1, 'pothole', 'roads', 'potholes', ?, 'SUBMITTED', ?, 'DONE')",
+        ((n, rng.choice(LOCATIONS), now) for n in range(1, ISSUES + 1))
+    )
+    conn.execute(
+        "INSERT INTO mission (issue_id, user_id, title, category, location,"
+        " status, created_at)"
+        " SELECT id, user_id, 'Resolve potholes', category, location, 'OPEN',"
+        " created_at FROM issue"
+    )
+    conn.commit()
+    conn.close()
+
+
+def worker(seconds, writers, readers):
+
+    import app as module
+
+    module.create_app(warm=False)
+
+    rng = random.Random(os.getpid())
+    deadline = time.time() + seconds
+    results = {"write": [], "read": [], "failed": 0}
+    lock = threading.Lock()
+
+    def client():
+        c = module.app.test_client()
+        with c.session_transaction() as s:
+            s["user_id"] = 2
+            s["is_officer"] = True
+        return c
+
+    def write(c):
+        if rng.random() < 0.5:
+            return c.post(
+                f"/api/officer/issue/{rng.randint(1, ISSUES)}/update",
+                json={"status": rng.choice(["IN_PROGRESS", "INSPECTED"]),
+                      "estimated_days": rng.randint(1, 9)}
+            )
+        return c.post(f"/api/mission/{rng.randint(1, ISSUES)}/complete", json={})
+
+    def read(c):
+        if rng.random() < 0.5:
+            return c.get("/api/map/regions")
+        return c.get(f"/api/admin/area-insights?location={rng.choice(LOCATIONS)}")
+
+    def loop(kind, call):
+        c = client()
+        while time.time() < deadline:
+            started = time.perf_counter()
+            try:
+                ok = call(c).status_code < 500
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                if ok:
+                    results[kind].append(elapsed)
+                else:
+                    results["failed"] += 1
+
+    threads = [threading.Thread(target=loop, args=("write", write)) for _ in range(writers)]
+    threads += [threading.Thread(target=loop, args=("read", read)) for _ in range(readers)]
+
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    return results
+
+
+def child(role, args):
+
+    if role == "setup":
+        setup()
+        return {}
+
+    return worker(float(args[0]), int(args[1]), int(args[2]))
+
+
+def spawn(role, env, *args):
+
+    return subprocess.Popen(
+        [sys.executable, HERE, "--child", role, *map(str, args)],
+        env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+
+
+def percentile(values, p):
+
+    if not values:
+        return float("nan")
+
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000
+
+
+def run(profile, seconds, processes, writers, readers):
+
+    root = tempfile.mkdtemp(prefix=f"avin-{profile}-", dir=ROOT)
+    env = dict(os.environ, DB_PROFILE=profile,
+               DATABASE_URL=f"sqlite:///{root}/db.sqlite")
+
+    spawn("setup", env).wait()
+
+    procs = [spawn("worker", env, seconds, writers, readers) for _ in range(processes)]
+    merged = {"write": [], "read": [], "failed": 0}
+
+    for p in procs:
+        out, _ = p.communicate()
+        got = json.loads(out.strip().splitlines()[-1])
+        merged["write"] += got["write"]
+        merged["read"] += got["read"]
+        merged["failed"] += got["failed"]
+
+    return merged
+
+
+def main():
+
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 15
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    print(f"{processes} worker processes, {ISSUES} issues, {seconds:.0f}s per run\n")
+    print(f"{'':<14} {'profile':<12} {'writes/s':>9} {'p50':>8} {'p99':>8} "
+          f"{'failed':>7} {'reads/s':>8} {'p99':>8}")
+
+    for name, writers, readers in SCENARIOS:
+        for profile in ("default", "production"):
+
+            r = run(profile, seconds, processes, writers, readers)
+
+            reads = f"{len(r['read']) / seconds:>8.1f} {percentile(r['read'], 0.99):>6.0f}ms" \
+                if readers else f"{'-':>8} {'-':>8}"
+
+            print(f"{name:<14} {profile:<12} {len(r['write']) / seconds:>9.1f} "
+                  f"{percentile(r['write'], 0.5):>6.0f}ms "
+                  f"{percentile(r['write'], 0.99):>6.0f}ms "
+                  f"{r['failed']:>7} {reads}")
+
+
+if __name__ == "__main__":
+
+    if sys.argv[1:2] == ["--child"]:
+        print(json.dumps(child(sys.argv[2], sys.argv[3:])))
+    else:
+        ROOT = scratch_env()
+        main()
@@ -0,0 +1,27 @@
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# ----------------------------------------------------
+# Scratch paths for benchmarks that import app
+# ----------------------------------------------------
+
+# app.py and the services read their paths at import time; call this first
+# so a benchmark never touches the real db.sqlite or caches
+
+def scratch_env(prefix="avin-bench-"):
+
+    root = tempfile.mkdtemp(prefix=prefix)
+    atexit.register(shutil.rmtree, root, ignore_errors=True)
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{root}/db.sqlite"
+    os.environ["GEOCODE_CACHE_PATH"] = os.path.join(root, "geocode_cache.sqlite")
+    os.environ["TRANSLATION_CACHE_PATH"] = os.path.join(root, "translation_cache.sqlite")
+    os.environ["LOCAL_CHAIN_PATH"] = os.path.join(root, "local_chain.sqlite")
+
+    return root
@@ -8,11 +8,24 @@ class User(db.Model):
     name = db.Column(db.String(120))
     email = db.Column(db.String(120), unique=True)
     password = db.Column(db.String(200))
-    credits = db.Column(db.Integer, default=0)
+    # leaderboards walk this index and stop after the top 50
+    credits = db.Column(db.Integer, default=0, index=True)
     public_profile = db.Column(db.Boolean, default=True)
 
 
 class Issue(db.Model):
+    __table_args__ = (
+        # citizen dashboard, /api/me/impact, rank rebuild
+        db.Index("ix_issue_user_created", "user_id", "created_at"),
+        db.Index("ix_issue_user_location", "user_id", "location"),
+        # /api/map/regions grouping, location filters
+        db.Index("ix_issue_location_category", "location", "category"),
+        # /api/map/issues?location=, newest first
+        db.Index("ix_issue_location_created", "location", "created_at"),
+        # newest-first officer lists
+        db.Index("ix_issue_created", "created_at"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer)
     original_text = db.Column(db.Text)
@@ -23,6 +36,18 @@ class Issue(db.Model):
     status = db.Column(db.String(30))
     created_at = db.Column(db.DateTime)
     estimated_days = db.Column(db.Integer, nullable=True)
+    lat = db.Column(db.Float, nullable=True)
+    lng = db.Column(db.Float, nullable=True)
+    geohash = db.Column(db.String(12), nullable=True, index=True)
+    # async ingestion: QUEUED -> PROCESSING -> DONE / FAILED
+    ingest_status = db.Column(db.String(20), nullable=True, index=True)
+    ingest_token = db.Column(db.String(32), nullable=True, index=True)
+    ingest_claimed_at = db.Column(db.DateTime, nullable=True)
+    # near-duplicate reports point at the issue they repeat
+    duplicate_of = db.Column(db.Integer, nullable=True, index=True)
+    # True once the issue's LSH buckets are written, False while they wait
+    # for the maintenance pass (imports), None when it has none
+    dedup_indexed = db.Column(db.Boolean, nullable=True, index=True)
 
 
     def to_dict(self):
@@ -33,11 +58,21 @@ class Issue(db.Model):
             "subcategory": self.subcategory,
             "location": self.location,
             "severity": self.severity,
-            "status": self.status
+            "status": self.status,
+            "lat": self.lat,
+            "lng": self.lng,
+            "ingest_status": self.ingest_status or "DONE",
+            "duplicate_of": self.duplicate_of
         }
 
 
 class Mission(db.Model):
+    __table_args__ = (
+        db.Index("ix_mission_issue", "issue_id"),
+        # /api/admin/area-insights
+        db.Index("ix_mission_location_status", "location", "status"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     issue_id = db.Column(db.Integer)
     user_id = db.Column(db.Integer)
@@ -51,21 +86,174 @@ class Mission(db.Model):
 
 
 class LedgerEntry(db.Model):
+    __table_args__ = (
+        # /api/user/<id>/ledger
+        db.Index("ix_ledger_user_timestamp", "user_id", "timestamp"),
+        # /api/me/metrics
+        db.Index("ix_ledger_user_category", "user_id", "category"),
+        # mission -> ledger join in the officer export
+        db.Index("ix_ledger_mission", "mission_id"),
+        # per-user hash chain, walked in id order
+        db.Index("ix_ledger_user", "user_id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer)
     mission_id = db.Column(db.Integer)
     category = db.Column(db.String(50))
     timestamp = db.Column(db.DateTime)
+    # hash chain: prev_hash links the whole ledger, user_prev_hash links
+    # one user's entries so their history verifies on its own
+    prev_hash = db.Column(db.String(64))
+    user_prev_hash = db.Column(db.String(64))
+    entry_hash = db.Column(db.String(64))
 
     def to_dict(self):
         return {
             "mission_id": self.mission_id,
             "category": self.category,
-            "timestamp": self.timestamp.isoformat()
+            "timestamp": self.timestamp.isoformat(),
+            "entry_hash": self.entry_hash
         }
 
+
+class LedgerHead(db.Model):
+    # single row naming the newest entry; appenders lock it first so the
+    # chain never forks
+    id = db.Column(db.Integer, primary_key=True)
+    entry_id = db.Column(db.Integer)
+    entry_hash = db.Column(db.String(64))
+
+
+class LedgerUserHead(db.Model):
+    # each user's newest entry, moved with every append; the per-user
+    # verifier checks the end of the user's chain against it
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    entry_id = db.Column(db.Integer)
+    entry_hash = db.Column(db.String(64))
+
+
+class LedgerCheckpoint(db.Model):
+    # written by the verifier: everything up to entry_id checked out
+    id = db.Column(db.Integer, primary_key=True)
+    entry_id = db.Column(db.Integer)
+    entry_hash = db.Column(db.String(64))
+    verified = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime)
+
+class Event(db.Model):
+    # change feed behind /api/events, written in the same transaction as
+    # the change it describes
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(40))
+    payload = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, index=True)
+
+
+class Proof(db.Model):
+    # one mission completion proof; batch_id stays NULL until a sealer
+    # folds it into a Merkle batch
+    id = db.Column(db.Integer, primary_key=True)
+    mission_id = db.Column(db.Integer, index=True)
+    before_hash = db.Column(db.String(128))
+    after_hash = db.Column(db.String(128))
+    leaf_hash = db.Column(db.String(64), unique=True)
+    batch_id = db.Column(db.Integer, index=True)
+    merkle_path = db.Column(db.Text)
+    created_at = db.Column(db.DateTime)
+
+
+class ProofBatch(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    root = db.Column(db.String(64))
+    size = db.Column(db.Integer)
+    anchor_tx = db.Column(db.String(128), index=True)
+    sealed_at = db.Column(db.DateTime)
+    anchored_at = db.Column(db.DateTime)
+
+
+class CreditAward(db.Model):
+    # one row per award; the unique key makes a retried award a no-op
+    id = db.Column(db.Integer, primary_key=True)
+    award_key = db.Column(db.String(80), unique=True)
+    user_id = db.Column(db.Integer, index=True)
+    issue_id = db.Column(db.Integer)
+    mission_id = db.Column(db.Integer)
+    amount = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime)
+
+
+class UserRollup(db.Model):
+    # per-user counters behind the impact page: kind is "location",
+    # "category" or "total"; the primary key serves a user's whole rollup
+    # as one index range
+    user_id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), primary_key=True)
+    key = db.Column(db.String(120), primary_key=True)
+    count = db.Column(db.Integer, default=0)
+
+
+class DedupBucket(db.Model):
+    # one row per LSH band of an issue's MinHash signature; issues that
+    # share a bucket are duplicate candidates. Clustered on the key, so a
+    # lookup is one index seek per band
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    bucket = db.Column(db.BigInteger, primary_key=True, autoincrement=False)
+    issue_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+
+
 class Reward(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String)
     min_credits = db.Column(db.Integer)
     description = db.Column(db.String)
+
+
+# ---------------------------------------------------------
+# Schema upgrades for existing databases
+# ---------------------------------------------------------
+
+# db.create_all() only creates missing tables, so columns and indexes added
+# to the models later are applied to a live db.sqlite here. Every worker
+# runs this at boot, often at the same moment against the same file: the
+# migration takes the write lock first (BEGIN IMMEDIATE, see
+# services/storage.py) and inspects the schema while holding it, so the
+# first worker migrates and the rest find nothing left to do.
+
+def ensure_schema():
+
+    created = False
+
+    with db.engine.connect() as conn:
+
+        conn.execution_options(sqlite_begin="IMMEDIATE")
+
+        with conn.begin():
+
+            db.metadata.create_all(bind=conn)
+            inspector = db.inspect(conn)
+
+            for table in db.metadata.sorted_tables:
+
+                existing = {c["name"] for c in inspector.get_columns(table.name)}
+
+                for column in table.columns:
+                    if column.name in existing:
+                        continue
+
+                    col_type = column.type.compile(dialect=conn.dialect)
+                    conn.execute(db.text(
+                        f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {col_type}'
+                    ))
+
+                existing = {i["name"] for i in inspector.get_indexes(table.name)}
+
+                for index in table.indexes:
+                    if index.name not in existing:
+                        index.create(bind=conn, checkfirst=True)
+                        created = True
+
+            # refresh planner statistics so new indexes are actually picked
+            if created and conn.dialect.name == "sqlite":
+                conn.execute(db.text("ANALYZE"))
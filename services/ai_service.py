@@ -1,7 +1,17 @@
 # This file will later connect to real ML / LLM models
 
-import requests
+import math
+import os
 import re
+from functools import lru_cache
+
+from services.geo_cache import bucket_key, geocode_cache
+from services.locality_matcher import (
+    build_fuzzy_index,
+    cached_near_tokens,
+    fuzzy_match_location
+)
+from services.offline_geocoder import nearest_locality
 
 
 ISSUE_TAXONOMY = {
@@ -274,39 +284,101 @@ def predict_resolution_time_and_process(category, subcategory):
     }
 
 
-def extract_location_from_text(text):
+# Localities are compiled into a word-level trie so a complaint is scanned
+# once regardless of how many places the gazetteer holds.
 
-    if not text:
-        return None
+def build_locality_index(places):
+
+    root = {}
+
+    for order, place in enumerate(places):
+        tokens = place.lower().split()
+
+        if not tokens:
+            continue
+
+        node = root
+        for tok in tokens:
+            node = node.setdefault(tok, {})
+
+        # keep the first occurrence, like the old list scan did
+        node.setdefault(None, (len(" ".join(tokens)), -order, place))
+
+    return root
+
+
+_LOCALITY_INDEX = build_locality_index(DELHI_LOCALITIES)
+
+# Misspelt and transliterated names ("lajpath nagar", "laxmi ngr") go to
+# the fuzzy matcher, only when the exact trie finds nothing.
+_FUZZY_LOCALITY_INDEX = build_fuzzy_index(DELHI_LOCALITIES)
+_fuzzy_near = cached_near_tokens(_FUZZY_LOCALITY_INDEX)
+
+
+def _normalize_location_text(text):
 
     text = text.lower()
     text = re.sub(r"[^\w\s]", " ", text)
     text = re.sub(r"\s+", " ", text).strip()
 
-    found = []
+    return text
+
 
-    for place in DELHI_LOCALITIES:
-        pattern = r"\b" + re.escape(place) + r"\b"
-        if re.search(pattern, text):
-            found.append(place)
+def extract_location_from_text(text, index=None, fuzzy_index=None):
 
-    if not found:
+    if not text:
+        return None
+
+    near = None
+
+    if index is None:
+        index = _LOCALITY_INDEX
+        if fuzzy_index is None:
+            fuzzy_index, near = _FUZZY_LOCALITY_INDEX, _fuzzy_near
+
+    tokens = _normalize_location_text(text).split(" ")
+
+    best = None
+
+    for start in range(len(tokens)):
+
+        node = index
+
+        for tok in tokens[start:]:
+            node = node.get(tok)
+            if node is None:
+                break
+
+            match = node.get(None)
+
+            # longest place name wins, earliest gazetteer entry on ties
+            if match and (best is None or match[:2] > best[:2]):
+                best = match
+
+    if best:
+        return best[2].title()
+
+    if fuzzy_index is None:
         return None
 
-    best = max(found, key=len)
+    place = fuzzy_match_location(tokens, fuzzy_index, cache=near)
 
-    return best.title()
+    return place.title() if place else None
 
 
 # ----------------------------------------------------
 # Reverse geocoding
 # ----------------------------------------------------
 
-def reverse_geocode(lat, lng):
+NOMINATIM_URL = os.environ.get(
+    "NOMINATIM_URL",
+    "https://nominatim.openstreetmap.org/reverse"
+)
 
-    try:
-        url = "https://nominatim.openstreetmap.org/reverse"
 
+def _nominatim_lookup(lat, lng):
+
+    try:
         params = {
             "format": "jsonv2",
             "lat": lat,
@@ -317,7 +389,9 @@ def reverse_geocode(lat, lng):
             "User-Agent": "civic-sustainability-app"
         }
 
-        res = requests.get(url, params=params, headers=headers, timeout=5)
+        import requests
+
+        res = requests.get(NOMINATIM_URL, params=params, headers=headers, timeout=5)
         data = res.json()
 
         address = data.get("address", {})
@@ -335,10 +409,149 @@ def reverse_geocode(lat, lng):
         return None
 
 
+# offline: nearest DELHI_LOCALITIES centroid from data/delhi_localities.json
+# network fallback: Nominatim (through the bucket cache) when nothing is near
+GEOCODE_OFFLINE = os.environ.get("GEOCODE_OFFLINE", "1") != "0"
+GEOCODE_NETWORK_FALLBACK = os.environ.get("GEOCODE_NETWORK_FALLBACK", "1") != "0"
+
+
+def reverse_geocode(lat, lng):
+
+    try:
+        lat, lng = float(lat), float(lng)
+    except (TypeError, ValueError):
+        return None
+
+    # nan and inf pass float() but not the locality grid's math.floor
+    if not (math.isfinite(lat) and math.isfinite(lng)):
+        return None
+
+    key = bucket_key(lat, lng)
+
+    if GEOCODE_OFFLINE:
+        locality = nearest_locality(lat, lng)
+
+        if locality or not GEOCODE_NETWORK_FALLBACK:
+            return locality
+
+    found, locality = geocode_cache.get(key)
+
+    if found:
+        return locality
+
+    # failures are cached too (with a short TTL) so an outage or an
+    # unnamed spot doesn't hit Nominatim on every request
+    locality = _nominatim_lookup(lat, lng)
+    geocode_cache.put(key, locality)
+
+    return locality
+
+
 # ----------------------------------------------------
 # Improved automatic issue classification
 # ----------------------------------------------------
 
+# The taxonomy is compiled once into an Aho-Corasick automaton so a
+# complaint is scanned a single time no matter how many keywords exist.
+#
+# The scan costs one Python-level dict lookup per character. With today's
+# ~90 keywords that is about what the old `kw in text` loop cost (C-level
+# substring searches, one per keyword): faster on some long texts, slower
+# on ones the substring search skips through. It stays flat as the
+# taxonomy grows, where the old loop grows linearly.
+# benchmarks/bench_classify.py compares the two.
+
+def _build_keyword_automaton(taxonomy):
+
+    subcategories = []
+    keyword_ids = {}
+    keyword_subs = []
+
+    for category, subs in taxonomy.items():
+        for subcategory, keywords in subs.items():
+
+            sub_index = len(subcategories)
+            subcategories.append((category, subcategory))
+
+            for kw in keywords:
+                kw = kw.lower()
+
+                if kw not in keyword_ids:
+                    keyword_ids[kw] = len(keyword_subs)
+                    keyword_subs.append([])
+
+                if sub_index not in keyword_subs[keyword_ids[kw]]:
+                    keyword_subs[keyword_ids[kw]].append(sub_index)
+
+    goto = [{}]
+    fail = [0]
+    out = [[]]
+
+    for kw, kw_id in keyword_ids.items():
+        node = 0
+        for ch in kw:
+            nxt = goto[node].get(ch)
+            if nxt is None:
+                nxt = len(goto)
+                goto[node][ch] = nxt
+                goto.append({})
+                fail.append(0)
+                out.append([])
+            node = nxt
+        out[node].append(kw_id)
+
+    # breadth-first so every fail target is finished before it is used
+    queue = list(goto[0].values())
+
+    for node in queue:
+        for ch, nxt in goto[node].items():
+            queue.append(nxt)
+
+            f = fail[node]
+            while f and ch not in goto[f]:
+                f = fail[f]
+
+            if node and ch in goto[f]:
+                fail[nxt] = goto[f][ch]
+
+            out[nxt] = out[nxt] + out[fail[nxt]]
+
+    # fold the fail links into a full transition table so scanning is
+    # a single dict lookup per character
+    for node in queue:
+        for ch, nxt in goto[fail[node]].items():
+            goto[node].setdefault(ch, nxt)
+
+    return {
+        "goto": goto,
+        # bound lookups save an attribute fetch per character
+        "step": [node.get for node in goto],
+        "out": out,
+        "keyword_subs": keyword_subs,
+        "subcategories": subcategories
+    }
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton(ISSUE_TAXONOMY)
+
+
+def _match_keywords(text, automaton=_KEYWORD_AUTOMATON):
+
+    step = automaton["step"]
+    out = automaton["out"]
+
+    matched = set()
+    node = 0
+
+    for ch in text:
+        node = step[node](ch, 0)
+
+        if out[node]:
+            matched.update(out[node])
+
+    return matched
+
+
 def classify_issue(text):
 
     if not text or not text.strip():
@@ -346,23 +559,23 @@ def classify_issue(text):
 
     text = text.lower()
 
-    best_score = 0
-    best_category = "other"
-    best_subcategory = "general issue"
+    automaton = _KEYWORD_AUTOMATON
 
-    for category, subs in ISSUE_TAXONOMY.items():
-        for subcategory, keywords in subs.items():
+    scores = [0] * len(automaton["subcategories"])
 
-            score = 0
+    for kw_id in _match_keywords(text, automaton):
+        for sub_index in automaton["keyword_subs"][kw_id]:
+            scores[sub_index] += 1
 
-            for kw in keywords:
-                if kw.lower() in text:
-                    score += 1
+    best_score = 0
+    best_category = "other"
+    best_subcategory = "general issue"
 
-            if score > best_score:
-                best_score = score
-                best_category = category
-                best_subcategory = subcategory
+    # strict ">" keeps the first subcategory in taxonomy order on ties
+    for sub_index, score in enumerate(scores):
+        if score > best_score:
+            best_score = score
+            best_category, best_subcategory = automaton["subcategories"][sub_index]
 
     return {
         "category": best_category,
@@ -412,21 +625,96 @@ def ai_rewrite_complaint(text, category):
         f"A concerned citizen"
     )
 
-from langdetect import detect
-from googletrans import Translator
+from services.translation_service import (
+    translate_to_english,
+    translate_many,
+    warm_up as translation_warm_up
+)
 
-translator = Translator()
 
-def detect_language(text):
-    try:
-        return detect(text)
-    except Exception:
+# ----------------------------------------------------
+# Language detection
+# ----------------------------------------------------
+
+# Most complaints are either plain ASCII English or Devanagari Hindi; a
+# character histogram settles those without running langdetect, which is
+# slow and nondeterministic on short strings. Anything mixed or in another
+# script still goes through langdetect (seeded, memoized).
+
+_langdetect = None
+
+
+def _script_language(text):
+
+    letters = 0
+    ascii_letters = 0
+    devanagari = 0
+
+    for ch in text:
+        if ch.isalpha():
+            letters += 1
+            if ch.isascii():
+                ascii_letters += 1
+            elif "\u0900" <= ch <= "\u097f":
+                devanagari += 1
+        elif "\u0900" <= ch <= "\u097f":
+            # vowel signs and viramas are not alphabetic
+            devanagari += 1
+            letters += 1
+
+    if not letters:
         return "unknown"
 
+    if ascii_letters == letters:
+        return "en"
+
+    if devanagari * 2 >= letters:
+        return "hi"
+
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _langdetect_language(text):
+
+    global _langdetect
+
+    if _langdetect is None:
+        from langdetect import DetectorFactory, detect
+
+        DetectorFactory.seed = 0
+        _langdetect = detect
 
-def translate_to_english(text):
     try:
-        result = translator.translate(text, dest="en")
-        return result.text
+        return _langdetect(text)
     except Exception:
-        return text
+        return "unknown"
+
+
+def detect_language(text):
+
+    if not text or not text.strip():
+        return "unknown"
+
+    return _script_language(text) or _langdetect_language(text)
+
+
+# ----------------------------------------------------
+# Warm-up
+# ----------------------------------------------------
+
+# Optional: call before a worker takes traffic so the first request doesn't
+# pay for loading langdetect profiles, the locality grid, the translator or
+# cache files.
+
+def warm_up():
+
+    classify_issue("garbage dumped near the road")
+    extract_location_from_text("near connaught place")
+    extract_location_from_text("near lajpath ngr")
+    nearest_locality(28.6315, 77.2167)
+
+    _langdetect_language("kachra sadak par pada hai")
+
+    geocode_cache.warm_up()
+    translation_warm_up()
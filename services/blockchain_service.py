@@ -1,12 +1,377 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
 import uuid
+from datetime import datetime, timedelta
+
+from models import db, Proof, ProofBatch
+from services.storage import begin_write
+
+
+# ----------------------------------------------------
+# Mission proofs, sealed into Merkle batches
+# ----------------------------------------------------
+
+# Completing a mission records a Proof row in the caller's transaction;
+# nothing touches the chain on the request path. A sealer periodically
+# claims the pending proofs, builds a Merkle tree over them and anchors
+# only the root, so a burst of completions costs one chain write per
+# batch. Each proof keeps its inclusion path, which verifies against the
+# anchored root in O(log n) hashes.
+
+PROOF_BATCH_SIZE = 1024
+PROOF_SEAL_SECONDS = float(os.environ.get("PROOF_SEAL_SECONDS", 5))
+
+# an anchor claim older than this belongs to a sealer that died mid-write
+ANCHOR_STALE_SECONDS = 300
+
+CHAIN_PATH = os.environ.get("LOCAL_CHAIN_PATH", "local_chain.sqlite")
+
+log = logging.getLogger(__name__)
+
+
+class LocalChainBackend:
+
+    # stand-in for a chain node: an append-only table of anchored roots,
+    # each transaction id committing to the previous one
+    def __init__(self, path=CHAIN_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS anchors ("
+                "tx_id TEXT PRIMARY KEY, root TEXT, anchored_at TEXT)"
+            )
+
+        return self._conn
+
+    def anchor(self, root):
+
+        with self._lock:
+            conn = self._connect()
+
+            prev = conn.execute(
+                "SELECT tx_id FROM anchors ORDER BY rowid DESC LIMIT 1"
+            ).fetchone()
+
+            tx_id = hashlib.sha256(
+                ((prev[0] if prev else "") + root).encode("ascii")
+            ).hexdigest()
+
+            conn.execute(
+                "INSERT INTO anchors VALUES (?, ?, ?)",
+                (tx_id, root, datetime.utcnow().isoformat())
+            )
+            conn.commit()
+
+        return tx_id
+
+    def verify(self, tx_id, root):
+
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT root FROM anchors WHERE tx_id = ?", (tx_id,)
+            ).fetchone()
+
+        return row is not None and row[0] == root
+
+
+class MemoryChainBackend:
+
+    # for tests and benchmarks
+    def __init__(self):
+        self.anchors = {}
+
+    def anchor(self, root):
+        tx_id = uuid.uuid4().hex
+        self.anchors[tx_id] = root
+        return tx_id
+
+    def verify(self, tx_id, root):
+        return self.anchors.get(tx_id) == root
+
+
+_backend = LocalChainBackend()
+
+
+def set_chain_backend(backend):
+
+    global _backend
+    _backend = backend
+
+
+# ---------------- Merkle tree ----------------
+
+# leaves and inner nodes are hashed with different prefixes so an inner
+# node can never be passed off as a leaf
+
+def leaf_hash(mission_id, before_hash, after_hash, created_at):
+
+    data = json.dumps(
+        [mission_id, before_hash, after_hash, created_at.isoformat()],
+        separators=(",", ":")
+    )
+
+    return hashlib.sha256(b"\x00" + data.encode("utf-8")).hexdigest()
+
+
+def _node_hash(left, right):
+
+    return hashlib.sha256(b"\x01" + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+
+def build_merkle_tree(leaves):
+
+    # returns (root, paths); paths[i] is a list of [sibling, side] pairs
+    # from leaf i up to the root. An odd node is paired with itself.
+    paths = [[] for _ in leaves]
+    level = list(leaves)
+    members = [[i] for i in range(len(leaves))]
+
+    while len(level) > 1:
+
+        if len(level) % 2:
+            level.append(level[-1])
+            members.append([])
+
+        next_level = []
+        next_members = []
+
+        for i in range(0, len(level), 2):
+            left, right = level[i], level[i + 1]
+
+            for leaf in members[i]:
+                paths[leaf].append([right, "R"])
+            for leaf in members[i + 1]:
+                paths[leaf].append([left, "L"])
+
+            next_level.append(_node_hash(left, right))
+            next_members.append(members[i] + members[i + 1])
+
+        level = next_level
+        members = next_members
+
+    return (level[0] if level else None), paths
+
+
+def merkle_root_from_path(leaf, path):
+
+    node = leaf
+
+    for sibling, side in path:
+        node = _node_hash(node, sibling) if side == "R" else _node_hash(sibling, node)
+
+    return node
+
+
+# ---------------- writing and sealing ----------------
 
 def write_proof_to_blockchain(mission_id, before_hash, after_hash):
 
-    # later: connect to your local chain node
+    # the proof joins the caller's transaction and is anchored once its
+    # batch is sealed; leaf_hash is the reference handed to clients
+    now = datetime.utcnow()
+    leaf = leaf_hash(mission_id, before_hash, after_hash, now)
+
+    db.session.add(Proof(
+        mission_id=mission_id,
+        before_hash=before_hash,
+        after_hash=after_hash,
+        leaf_hash=leaf,
+        created_at=now
+    ))
+
+    return {
+        "tx_id": leaf,
+        "mission_id": mission_id,
+        "status": "PENDING"
+    }
+
+
+def seal_batch(limit=PROOF_BATCH_SIZE):
+
+    # cheap read first so an idle sealer never takes the write lock
+    pending = db.session.query(Proof.id).filter(Proof.batch_id.is_(None)).first()
+    db.session.rollback()
+
+    if pending is None:
+        return None
+
+    begin_write()
+
+    batch = ProofBatch(sealed_at=datetime.utcnow(), size=0)
+    db.session.add(batch)
+    db.session.flush()
+
+    # claim with one UPDATE so concurrent sealers never share a proof
+    pending = db.session.query(Proof.id)\
+        .filter(Proof.batch_id.is_(None))\
+        .order_by(Proof.id)\
+        .limit(limit)\
+        .scalar_subquery()
+
+    Proof.query.filter(
+        Proof.id.in_(pending),
+        Proof.batch_id.is_(None)
+    ).update({"batch_id": batch.id}, synchronize_session=False)
+
+    proofs = Proof.query.filter_by(batch_id=batch.id).order_by(Proof.id).all()
+
+    if not proofs:
+        db.session.rollback()
+        return None
+
+    root, paths = build_merkle_tree([p.leaf_hash for p in proofs])
+
+    for proof, path in zip(proofs, paths):
+        proof.merkle_path = json.dumps(path)
+
+    batch.root = root
+    batch.size = len(proofs)
+
+    db.session.commit()
+
+    return batch
+
+
+def anchor_batches():
+
+    # anchoring happens outside the sealing transaction. A sealer claims a
+    # batch by stamping anchored_at, so sealers in other workers skip it;
+    # a failed chain write clears the stamp and a crashed sealer's claim
+    # goes stale, either way the batch is retried on a later round
+    anchored = 0
+    now = datetime.utcnow()
+    stale = now - timedelta(seconds=ANCHOR_STALE_SECONDS)
+
+    unanchored = db.and_(
+        ProofBatch.anchor_tx.is_(None),
+        ProofBatch.root.isnot(None),
+        db.or_(ProofBatch.anchored_at.is_(None), ProofBatch.anchored_at < stale)
+    )
+
+    batches = db.session.query(ProofBatch.id, ProofBatch.root)\
+        .filter(unanchored)\
+        .order_by(ProofBatch.id)\
+        .all()
+    db.session.rollback()
+
+    for batch_id, root in batches:
+
+        begin_write()
+        claimed = ProofBatch.query.filter(ProofBatch.id == batch_id, unanchored)\
+            .update({"anchored_at": now}, synchronize_session=False)
+        db.session.commit()
+
+        if not claimed:
+            continue
+
+        try:
+            tx_id = _backend.anchor(root)
+        except Exception:
+            log.exception("anchoring batch %s failed", batch_id)
+            begin_write()
+            ProofBatch.query.filter_by(id=batch_id)\
+                .update({"anchored_at": None}, synchronize_session=False)
+            db.session.commit()
+            continue
+
+        begin_write()
+        ProofBatch.query.filter_by(id=batch_id).update({
+            "anchor_tx": tx_id,
+            "anchored_at": datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+
+        anchored += 1
+
+    return anchored
+
+
+def seal_pending(limit=PROOF_BATCH_SIZE):
+
+    sealed = 0
+
+    while seal_batch(limit) is not None:
+        sealed += 1
+
+    anchor_batches()
+
+    return sealed
+
+
+def _sealer_loop(app, stop, interval):
+
+    while not stop.wait(interval):
+
+        with app.app_context():
+            try:
+                seal_pending()
+            except Exception:
+                db.session.rollback()
+                log.exception("proof sealing failed")
+            finally:
+                db.session.remove()
+
+
+def start_sealer(app, interval=PROOF_SEAL_SECONDS):
+
+    stop = threading.Event()
+
+    thread = threading.Thread(
+        target=_sealer_loop,
+        args=(app, stop, interval),
+        name="proof-sealer",
+        daemon=True
+    )
+    thread.start()
+
+    return stop, thread
+
+
+# ---------------- verification ----------------
+
+def verify_proof(tx):
+
+    proof = Proof.query.filter_by(leaf_hash=tx).first()
+
+    if proof is None:
+        return {"verified": False, "tx": tx, "status": "UNKNOWN"}
+
+    batch = ProofBatch.query.get(proof.batch_id) if proof.batch_id else None
+
+    if batch is None or batch.anchor_tx is None:
+        return {
+            "verified": False,
+            "tx": tx,
+            "mission_id": proof.mission_id,
+            "status": "PENDING"
+        }
+
+    expected = leaf_hash(
+        proof.mission_id, proof.before_hash, proof.after_hash, proof.created_at
+    )
+    path = json.loads(proof.merkle_path)
 
-    tx_id = str(uuid.uuid4())
+    verified = expected == tx \
+        and merkle_root_from_path(tx, path) == batch.root \
+        and _backend.verify(batch.anchor_tx, batch.root)
 
     return {
-        "tx_id": tx_id,
-        "mission_id": mission_id
-    }
\ No newline at end of file
+        "verified": verified,
+        "tx": tx,
+        "mission_id": proof.mission_id,
+        "status": "ANCHORED",
+        "batch_id": batch.id,
+        "root": batch.root,
+        "anchor_tx": batch.anchor_tx,
+        "path": path
+    }
@@ -0,0 +1,88 @@
+from datetime import datetime
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models import db, CreditAward, User
+
+
+# ----------------------------------------------------
+# Credit awards
+# ----------------------------------------------------
+
+# An award inserts a CreditAward row keyed by what earned it and, only if
+# that insert went through, bumps User.credits with a single
+# `credits = credits + n` UPDATE. Both statements run in the caller's
+# transaction, so concurrent awards never lose an update and a retried
+# request cannot award twice.
+
+REWARDS = {
+    "waste": 10,
+    "water": 12,
+    "air": 15,
+    "roads": 8,
+    "greenery": 15,
+    "transport": 8,
+    "public infrastructure": 8,
+    "noise": 6,
+    "animals": 6
+}
+
+DEFAULT_REWARD = 5
+
+
+def reward_for(category):
+
+    return REWARDS.get((category or "").lower(), DEFAULT_REWARD)
+
+
+def _insert_ignore(table):
+
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing()
+
+    return sqlite.insert(table).on_conflict_do_nothing()
+
+
+def award_credits(user_id, amount, award_key, issue_id=None, mission_id=None):
+
+    # returns the user's new balance, or None when this award already exists
+    inserted = db.session.execute(
+        _insert_ignore(CreditAward.__table__).values(
+            award_key=award_key,
+            user_id=user_id,
+            issue_id=issue_id,
+            mission_id=mission_id,
+            amount=amount,
+            created_at=datetime.utcnow()
+        )
+    ).rowcount
+
+    if not inserted:
+        return None
+
+    users = User.__table__
+
+    return db.session.execute(
+        users.update()
+        .where(users.c.id == user_id)
+        .values(credits=db.func.coalesce(users.c.credits, 0) + amount)
+        .returning(users.c.credits)
+    ).scalar()
+
+
+def award_issue_resolved(issue):
+
+    return award_credits(
+        issue.user_id, reward_for(issue.category), f"issue:{issue.id}",
+        issue_id=issue.id
+    )
+
+
+def award_mission_completed(mission):
+
+    return award_credits(
+        mission.user_id, reward_for(mission.category), f"mission:{mission.id}",
+        issue_id=mission.issue_id, mission_id=mission.id
+    )
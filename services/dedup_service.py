@@ -0,0 +1,411 @@
+import hashlib
+import logging
+import random
+import re
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models import db, DedupBucket, Issue
+from services.storage import begin_write
+
+
+# ----------------------------------------------------
+# Near-duplicate complaint detection
+# ----------------------------------------------------
+
+# A complaint is reduced to the set of letter trigrams of its words
+# (order-free, and a typo only changes a few trigrams), and that set to a
+# MinHash signature of DEDUP_BANDS x DEDUP_BAND_ROWS values. Each band is
+# hashed together with the issue's location and category into a bucket
+# key, so only issues in the same place and category can collide.
+#
+# A new report looks up its DEDUP_BANDS buckets (index seeks, independent
+# of how many issues exist), then checks the few candidates' real trigram
+# overlap. Open issues from the last DEDUP_WINDOW_DAYS that overlap at
+# least DEDUP_THRESHOLD count as the same problem. Canonical issues are
+# indexed as they are written; duplicates are not, so later reports keep
+# linking to the first one. Bulk imports only mark their rows; a
+# background pass indexes them off the import's commits.
+#
+# Buckets of issues that can no longer be linked to (resolved, or older
+# than the window) are pruned by the same pass. Their keys are recomputed
+# from the issue, so the delete is by primary key.
+#
+# The signature is a one-permutation MinHash: every trigram is hashed
+# once and lands in one of the signature slots, which keeps its minimum.
+# Empty slots borrow from other slots in a fixed pseudo-random order
+# ("optimal densification"), which keeps the collision probability equal
+# to the Jaccard similarity, like k independent hash functions at 1/k of
+# the cost.
+
+DEDUP_BANDS = 16
+DEDUP_BAND_ROWS = 3
+
+# Jaccard similarity of the trigram sets; with 16 bands of 3 rows a pair
+# at 0.5 becomes a candidate 88% of the time, at 0.7 over 99%
+DEDUP_THRESHOLD = 0.5
+
+DEDUP_WINDOW_DAYS = 30
+DEDUP_MAX_CANDIDATES = 50
+
+DEDUP_INDEX_BATCH_SIZE = 5000
+
+DEDUP_MAINTENANCE_SECONDS = 300
+
+# a repeat links to any issue not closed yet (submitted, inspected,
+# in progress, or a status added later)
+CLOSED_STATUSES = ("RESOLVED", "DUPLICATE")
+
+_SLOTS = DEDUP_BANDS * DEDUP_BAND_ROWS
+
+# fixed across processes and restarts: stored bucket keys depend on it
+_rng = random.Random(20260101)
+_DONORS = [_rng.sample(range(_SLOTS), _SLOTS) for _ in range(_SLOTS)]
+
+log = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+_STOPWORDS = frozenset(
+    "a an and are at be by for from has have in is it near of on or the "
+    "there this to was with please very since ka ke ki ko hai hain mein se".split()
+)
+
+
+def shingles(text):
+
+    grams = set()
+
+    for word in _WORD.findall((text or "").lower()):
+
+        if word in _STOPWORDS:
+            continue
+
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+
+    return grams
+
+
+def minhash(grams):
+
+    slots = [None] * _SLOTS
+
+    for gram in grams:
+        h = int.from_bytes(
+            hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        value, slot = divmod(h, _SLOTS)
+
+        if slots[slot] is None or value < slots[slot]:
+            slots[slot] = value
+
+    return [
+        value if value is not None
+        else next(slots[j] for j in _DONORS[i] if slots[j] is not None)
+        for i, value in enumerate(slots)
+    ]
+
+
+def bucket_keys(grams, location, category):
+
+    if not grams:
+        return []
+
+    signature = minhash(grams)
+    scope = f"{(location or '').lower()}|{(category or '').lower()}"
+    keys = []
+
+    for band in range(DEDUP_BANDS):
+        rows = signature[band * DEDUP_BAND_ROWS:(band + 1) * DEDUP_BAND_ROWS]
+        digest = hashlib.blake2b(
+            f"{scope}|{band}|{rows}".encode("utf-8"), digest_size=8
+        ).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+
+    return keys
+
+
+def jaccard(a, b):
+
+    if not a or not b:
+        return 0.0
+
+    return len(a & b) / len(a | b)
+
+
+def find_duplicate(text, location, category, now=None):
+
+    # returns (issue_id or None, bucket keys for index_issues)
+    grams = shingles(text)
+    keys = bucket_keys(grams, location, category)
+
+    if not keys:
+        return None, keys
+
+    since = (now or datetime.utcnow()) - timedelta(days=DEDUP_WINDOW_DAYS)
+
+    # the more bands two signatures share, the more similar the texts;
+    # in a crowded scope the cap keeps the closest candidates, not the
+    # newest ones
+    hits = db.select(
+        DedupBucket.issue_id,
+        db.func.count().label("bands")
+    ).where(DedupBucket.bucket.in_(keys))\
+     .group_by(DedupBucket.issue_id)\
+     .subquery()
+
+    rows = db.session.query(Issue.id, Issue.original_text)\
+        .join(hits, hits.c.issue_id == Issue.id)\
+        .filter(
+            Issue.status.notin_(CLOSED_STATUSES),
+            Issue.created_at >= since
+        )\
+        .order_by(hits.c.bands.desc(), Issue.id.desc())\
+        .limit(DEDUP_MAX_CANDIDATES)\
+        .all()
+
+    best_id, best = None, DEDUP_THRESHOLD
+
+    # equal scores go to the oldest issue, the one its repeats link to
+    for issue_id, other in rows:
+        score = jaccard(grams, shingles(other))
+        if score > best or (score == best and (best_id is None or issue_id < best_id)):
+            best_id, best = issue_id, score
+
+    return best_id, keys
+
+
+def _insert_ignore(table):
+
+    dialect = db.session.get_bind().dialect.name
+    module = postgresql if dialect == "postgresql" else sqlite
+
+    return module.insert(table).on_conflict_do_nothing()
+
+
+def index_issues(pairs):
+
+    # pairs: iterable of (issue_id, bucket keys); joins the caller's
+    # transaction
+    rows = [
+        {"bucket": key, "issue_id": issue_id}
+        for issue_id, keys in pairs
+        for key in keys
+    ]
+
+    if rows:
+        db.session.execute(_insert_ignore(DedupBucket.__table__), rows)
+
+
+def dedupe_issue(issue):
+
+    # marks issue as a duplicate, or indexes it (after it has an id) as a
+    # new canonical issue. Returns the id it duplicates, or None
+    duplicate_of, keys = find_duplicate(
+        issue.original_text, issue.location, issue.category
+    )
+
+    if duplicate_of is not None:
+        issue.duplicate_of = duplicate_of
+        issue.status = "DUPLICATE"
+        return duplicate_of
+
+    issue.dedup_indexed = True
+
+    if issue.id is None:
+        db.session.add(issue)
+        db.session.flush()
+
+    index_issues([(issue.id, keys)])
+
+    return None
+
+
+def _issue_keys(rows):
+
+    return [
+        (issue_id, bucket_keys(shingles(text), location, category))
+        for issue_id, text, location, category in rows
+    ]
+
+
+def _mark(ids, value):
+
+    if ids:
+        Issue.query.filter(Issue.id.in_(ids))\
+            .update({"dedup_indexed": value}, synchronize_session=False)
+
+
+def _linkable(since):
+
+    return db.and_(
+        Issue.created_at >= since,
+        Issue.duplicate_of.is_(None),
+        Issue.status.notin_(CLOSED_STATUSES)
+    )
+
+
+def index_pending(batch_size=DEDUP_INDEX_BATCH_SIZE):
+
+    # indexes issues marked False (imports); ones that are no longer
+    # linkable just drop the mark. Returns the number indexed
+    since = datetime.utcnow() - timedelta(days=DEDUP_WINDOW_DAYS)
+    indexed = 0
+
+    while True:
+
+        begin_write()
+
+        rows = db.session.query(
+            Issue.id, Issue.original_text, Issue.location, Issue.category,
+            _linkable(since)
+        ).filter(Issue.dedup_indexed.is_(False))\
+         .order_by(Issue.id)\
+         .limit(batch_size)\
+         .all()
+
+        if not rows:
+            db.session.rollback()
+            break
+
+        fresh = [row[:4] for row in rows if row[4]]
+
+        index_issues(_issue_keys(fresh))
+        _mark([row[0] for row in fresh], True)
+        _mark([row[0] for row in rows if not row[4]], None)
+
+        db.session.commit()
+
+        indexed += len(fresh)
+
+    return indexed
+
+
+def prune_dedup_index(batch_size=DEDUP_INDEX_BATCH_SIZE):
+
+    # drops the buckets of indexed issues that are resolved, duplicates or
+    # older than the window. Returns the number of issues pruned
+    since = datetime.utcnow() - timedelta(days=DEDUP_WINDOW_DAYS)
+    table = DedupBucket.__table__
+    last_id = 0
+    pruned = 0
+
+    while True:
+
+        begin_write()
+
+        rows = db.session.query(
+            Issue.id, Issue.original_text, Issue.location, Issue.category
+        ).filter(
+            Issue.dedup_indexed.is_(True),
+            Issue.id > last_id,
+            ~_linkable(since)
+        ).order_by(Issue.id).limit(batch_size).all()
+
+        if not rows:
+            db.session.rollback()
+            break
+
+        keys = [
+            {"b": key, "i": issue_id}
+            for issue_id, issue_keys in _issue_keys(rows)
+            for key in issue_keys
+        ]
+
+        if keys:
+            db.session.execute(
+                table.delete().where(
+                    table.c.bucket == db.bindparam("b"),
+                    table.c.issue_id == db.bindparam("i")
+                ),
+                keys
+            )
+
+        _mark([row.id for row in rows], None)
+
+        db.session.commit()
+
+        pruned += len(rows)
+        last_id = rows[-1].id
+
+    return pruned
+
+
+def rebuild_dedup_index(full=False, batch_size=DEDUP_INDEX_BATCH_SIZE):
+
+    # indexes recent canonical issues that have no buckets yet (all of them
+    # again with full=True), then prunes. Returns the number indexed
+    if full:
+        begin_write()
+        DedupBucket.query.delete()
+        Issue.query.filter(Issue.dedup_indexed.isnot(None))\
+            .update({"dedup_indexed": None}, synchronize_session=False)
+        db.session.commit()
+
+    since = datetime.utcnow() - timedelta(days=DEDUP_WINDOW_DAYS)
+    last_id = 0
+    indexed = 0
+
+    while True:
+
+        begin_write()
+
+        rows = db.session.query(
+            Issue.id, Issue.original_text, Issue.location, Issue.category
+        ).filter(
+            Issue.id > last_id,
+            _linkable(since),
+            db.or_(Issue.dedup_indexed.is_(None), Issue.dedup_indexed.is_(False))
+        ).order_by(Issue.id).limit(batch_size).all()
+
+        if not rows:
+            db.session.rollback()
+            break
+
+        index_issues(_issue_keys(rows))
+        _mark([row.id for row in rows], True)
+
+        db.session.commit()
+
+        indexed += len(rows)
+        last_id = rows[-1].id
+
+    prune_dedup_index(batch_size)
+
+    return indexed
+
+
+# ---------------- background maintenance ----------------
+
+def _maintenance_loop(app, stop, interval):
+
+    while not stop.wait(interval):
+
+        with app.app_context():
+            try:
+                index_pending()
+                prune_dedup_index()
+            except Exception:
+                db.session.rollback()
+                log.exception("dedup index maintenance failed")
+            finally:
+                db.session.remove()
+
+
+def start_dedup_maintenance(app, interval=DEDUP_MAINTENANCE_SECONDS):
+
+    stop = threading.Event()
+
+    thread = threading.Thread(
+        target=_maintenance_loop,
+        args=(app, stop, interval),
+        name="dedup-maintenance",
+        daemon=True
+    )
+    thread.start()
+
+    return stop, thread
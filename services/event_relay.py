@@ -0,0 +1,250 @@
+import asyncio
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from models import db
+from services.event_service import (
+    EVENT_HEARTBEAT_SECONDS,
+    EVENT_POLL_SECONDS,
+    EVENT_PRUNE_SECONDS,
+    EVENT_REPLAY_LIMIT,
+    SUBSCRIBER_QUEUE_SIZE,
+    events_since,
+    latest_event_id,
+    prune_events,
+    sse_frame
+)
+
+
+# ----------------------------------------------------
+# Event relay: the SSE fan-out as its own process
+# ----------------------------------------------------
+
+# The web workers publish by writing Event rows (publish_event) and never
+# hold a stream. The relay is one asyncio process that polls those rows
+# and serves every open /api/events stream as a coroutine and a bounded
+# queue, so thousands of idle dashboards cost memory, not threads. Its
+# blocking database calls (poll, replay, prune) run on a small thread pool
+# of their own, so a wait on the SQLite lock never stalls the loop.
+#
+# A reverse proxy routes /api/events here; the relay checks the same
+# signed session cookie as the app through the authenticate callback.
+
+RELAY_DB_THREADS = 2
+
+# slow or idle clients that never finish their request are dropped
+RELAY_REQUEST_TIMEOUT = 10
+
+log = logging.getLogger(__name__)
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 401: "Unauthorized",
+    404: "Not Found", 405: "Method Not Allowed"
+}
+
+
+class EventRelay:
+
+    def __init__(self, app, authenticate, path="/api/events"):
+
+        # authenticate(headers) -> (user_id, is_officer), or None
+        self.app = app
+        self.authenticate = authenticate
+        self.path = path
+        self.last_id = None
+
+        self._subscribers = set()
+        self._pool = ThreadPoolExecutor(RELAY_DB_THREADS, thread_name_prefix="event-relay-db")
+        self._poller = None
+
+    def subscriber_count(self):
+
+        return len(self._subscribers)
+
+    def _call(self, fn, args):
+
+        with self.app.app_context():
+            try:
+                return fn(*args)
+            finally:
+                db.session.remove()
+
+    async def _db(self, fn, *args):
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, self._call, fn, args)
+
+    async def start(self, host, port):
+
+        # start from the current head, like EventHub
+        self.last_id = await self._db(latest_event_id)
+        self._poller = asyncio.create_task(self._poll_loop())
+
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def serve_forever(self, host, port):
+
+        server = await self.start(host, port)
+
+        async with server:
+            await server.serve_forever()
+
+    # ---------------- fan-out ----------------
+
+    def _broadcast(self, events):
+
+        for q in list(self._subscribers):
+            try:
+                for event in events:
+                    q.put_nowait(event)
+            except asyncio.QueueFull:
+                # slow consumer: close its stream, it will resume by id
+                self._subscribers.discard(q)
+                while not q.empty():
+                    q.get_nowait()
+                q.put_nowait(None)
+
+    async def _poll_loop(self):
+
+        last_prune = 0
+
+        while True:
+
+            events = []
+
+            try:
+                events = await self._db(events_since, self.last_id)
+
+                if events:
+                    self.last_id = events[-1][0]
+                    self._broadcast(events)
+
+                if time.time() - last_prune > EVENT_PRUNE_SECONDS:
+                    await self._db(prune_events)
+                    last_prune = time.time()
+            except Exception:
+                log.exception("event relay poll failed")
+
+            # a full page means more rows are waiting; poll again immediately
+            if len(events) < EVENT_REPLAY_LIMIT:
+                await asyncio.sleep(EVENT_POLL_SECONDS)
+
+    # ---------------- HTTP ----------------
+
+    async def _read_request(self, reader):
+
+        head = await asyncio.wait_for(
+            reader.readuntil(b"\r\n\r\n"), RELAY_REQUEST_TIMEOUT
+        )
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, _ = lines[0].split(" ", 2)
+
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        return method, urlsplit(target).path, headers
+
+    async def _respond(self, writer, status, body=None):
+
+        data = json.dumps(body or {}).encode("utf-8")
+
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            "Connection: close\r\n\r\n".encode("latin-1") + data
+        )
+        await writer.drain()
+
+    async def _handle(self, reader, writer):
+
+        try:
+            try:
+                method, path, headers = await self._read_request(reader)
+            except (ValueError, asyncio.IncompleteReadError,
+                    asyncio.LimitOverrunError, asyncio.TimeoutError):
+                await self._respond(writer, 400, {"error": "bad request"})
+                return
+
+            if path != self.path:
+                await self._respond(writer, 404, {"error": "not found"})
+                return
+
+            if method != "GET":
+                await self._respond(writer, 405, {"error": "method not allowed"})
+                return
+
+            user = self.authenticate(headers)
+
+            if user is None:
+                await self._respond(writer, 401, {"error": "unauthorized"})
+                return
+
+            await self._stream(writer, headers, officer=user[1])
+        except ConnectionError:
+            pass
+        except Exception:
+            log.exception("event relay stream failed")
+        finally:
+            writer.close()
+
+    async def _stream(self, writer, headers, officer):
+
+        # subscribe before the replay query so nothing falls in between;
+        # events the replay already sent are skipped below
+        q = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(q)
+
+        try:
+            try:
+                last_sent = int(headers.get("last-event-id", ""))
+            except ValueError:
+                last_sent = None
+
+            replay = [] if last_sent is None else await self._db(events_since, last_sent)
+            last_sent = last_sent or 0
+
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/event-stream; charset=utf-8\r\n"
+                b"Cache-Control: no-cache\r\n"
+                b"X-Accel-Buffering: no\r\n"
+                b"Connection: close\r\n\r\n"
+            )
+
+            for event in replay:
+                last_sent = event[0]
+                frame = sse_frame(event, officer)
+                if frame is not None:
+                    writer.write(frame.encode("utf-8"))
+
+            await writer.drain()
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(q.get(), EVENT_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    writer.write(b": keep-alive\n\n")
+                    await writer.drain()
+                    continue
+
+                if event is None:
+                    return
+
+                if event[0] <= last_sent:
+                    continue
+
+                last_sent = event[0]
+                frame = sse_frame(event, officer)
+
+                if frame is not None:
+                    writer.write(frame.encode("utf-8"))
+                    await writer.drain()
+        finally:
+            self._subscribers.discard(q)
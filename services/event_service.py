@@ -0,0 +1,260 @@
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+
+from models import db, Event, User
+from services.storage import begin_write
+
+
+# ----------------------------------------------------
+# Change feed for the dashboards (Server-Sent Events)
+# ----------------------------------------------------
+
+# Writers add an Event row inside their own transaction. A poller reads
+# new rows and fans them out to the in-memory queues of the SSE clients,
+# so the database sees one query per poll interval no matter how many
+# dashboards are open.
+#
+# In production the streams are served by the event relay
+# (services/event_relay.py), a separate asyncio process where an idle
+# client is a coroutine and a queue. EventHub below backs the in-app
+# /api/events route of the development server, which holds a thread per
+# stream.
+#
+# Officers get every event as written. Citizens get PUBLIC_FIELDS of the
+# kinds their dashboard uses, so complaint texts and exact coordinates
+# stay on the officer side; the projection is made once per event, not
+# once per client.
+
+EVENT_POLL_SECONDS = 0.5
+EVENT_HEARTBEAT_SECONDS = 15
+EVENT_REPLAY_LIMIT = 500
+EVENT_RETENTION = timedelta(days=1)
+EVENT_PRUNE_SECONDS = 600
+
+# a client this far behind is dropped; EventSource reconnects and replays
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+log = logging.getLogger(__name__)
+
+# what a citizen's stream carries of each kind; other kinds are not sent
+PUBLIC_FIELDS = {
+    "issue.created": ("location", "category"),
+    "credits.changed": ("user_id", "name", "credits"),
+    "issues.imported": ("count",),
+}
+
+
+def publish_event(kind, payload):
+
+    db.session.add(Event(
+        kind=kind,
+        payload=json.dumps(payload),
+        created_at=datetime.utcnow()
+    ))
+
+
+def issue_payload(issue):
+
+    # same shape as /api/officer/issues rows so clients can splice it in
+    payload = issue.to_dict()
+    payload["estimated_days"] = issue.estimated_days
+
+    return payload
+
+
+def credits_payload(user_id, credits):
+
+    # the name lets dashboards add a user who just entered the leaderboard
+    name = db.session.query(User.name).filter_by(id=user_id).scalar()
+
+    return {"user_id": user_id, "name": name, "credits": credits}
+
+
+def publish_issue_created(issue):
+
+    # needs issue.id, so flush before the caller's commit
+    db.session.flush()
+    publish_event("issue.created", issue_payload(issue))
+
+
+def events_since(last_id, limit=EVENT_REPLAY_LIMIT):
+
+    rows = db.session.query(Event.id, Event.kind, Event.payload)\
+        .filter(Event.id > last_id)\
+        .order_by(Event.id)\
+        .limit(limit)\
+        .all()
+
+    return [
+        (r.id, r.kind, r.payload, public_payload(r.kind, r.payload))
+        for r in rows
+    ]
+
+
+def public_payload(kind, payload):
+
+    fields = PUBLIC_FIELDS.get(kind)
+
+    if fields is None:
+        return None
+
+    data = json.loads(payload)
+
+    return json.dumps({f: data.get(f) for f in fields})
+
+
+def prune_events():
+
+    begin_write()
+    Event.query.filter(
+        Event.created_at < datetime.utcnow() - EVENT_RETENTION
+    ).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def sse_frame(event, officer):
+
+    # None for events the client does not get
+    event_id, kind, payload, public = event
+
+    if officer:
+        return format_sse(event_id, kind, payload)
+
+    if public is not None:
+        return format_sse(event_id, kind, public)
+
+    return None
+
+
+def latest_event_id():
+
+    return db.session.query(db.func.max(Event.id)).scalar() or 0
+
+
+def format_sse(event_id, kind, payload):
+
+    return f"id: {event_id}\nevent: {kind}\ndata: {payload}\n\n"
+
+
+class EventHub:
+
+    def __init__(self):
+
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._app = None
+        self.last_id = None
+
+    def subscribe(self, app):
+
+        q = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+        with self._lock:
+            self._subscribers.add(q)
+
+            if self._thread is None:
+                # start from the current head so the first subscriber
+                # sees everything written after it connected
+                self.last_id = latest_event_id()
+                self._app = app
+                self._thread = threading.Thread(
+                    target=self._poll_loop, name="event-hub", daemon=True
+                )
+                self._thread.start()
+
+        return q
+
+    def unsubscribe(self, q):
+
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def subscriber_count(self):
+
+        return len(self._subscribers)
+
+    def _broadcast(self, events):
+
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for q in subscribers:
+            try:
+                for event in events:
+                    q.put_nowait(event)
+            except queue.Full:
+                # slow consumer: close its stream, it will resume by id
+                self.unsubscribe(q)
+                try:
+                    q.put_nowait(None)
+                except queue.Full:
+                    pass
+
+    def _poll_loop(self):
+
+        last_prune = 0
+
+        while True:
+
+            events = []
+
+            with self._app.app_context():
+                try:
+                    events = events_since(self.last_id)
+
+                    if events:
+                        self.last_id = events[-1][0]
+                        self._broadcast(events)
+
+                    if time.time() - last_prune > EVENT_PRUNE_SECONDS:
+                        db.session.rollback()
+                        prune_events()
+                        last_prune = time.time()
+                except Exception:
+                    db.session.rollback()
+                    log.exception("event poll failed")
+                finally:
+                    db.session.remove()
+
+            # a full page means more rows are waiting; poll again immediately
+            if len(events) < EVENT_REPLAY_LIMIT:
+                time.sleep(EVENT_POLL_SECONDS)
+
+
+event_hub = EventHub()
+
+
+def stream_events(q, replay, last_sent, officer=False):
+
+    try:
+        for event in replay:
+            last_sent = event[0]
+            frame = sse_frame(event, officer)
+            if frame is not None:
+                yield frame
+
+        while True:
+            try:
+                event = q.get(timeout=EVENT_HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+
+            if event is None:
+                return
+
+            if event[0] <= last_sent:
+                continue
+
+            last_sent = event[0]
+            frame = sse_frame(event, officer)
+
+            if frame is not None:
+                yield frame
+    finally:
+        event_hub.unsubscribe(q)
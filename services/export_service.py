@@ -0,0 +1,218 @@
+import csv
+import io
+from datetime import datetime
+
+from models import db, Issue, Mission, LedgerEntry
+from services.storage import read_session
+
+
+# ----------------------------------------------------
+# Officer export (issues + missions + ledger)
+# ----------------------------------------------------
+
+# The export walks the issue table in keyset batches of issue ids. Each
+# batch is one short read joining its issues to their missions and ledger
+# entries, so memory is bounded by the batch and no read transaction stays
+# open long enough to block report writers. Rows are written out as each
+# batch arrives: CSV text, or one Parquet row group per batch.
+
+EXPORT_BATCH_SIZE = 5000
+
+EXPORT_FORMATS = ("csv", "parquet")
+
+EXPORT_COLUMNS = [
+    ("issue_id", Issue.id, "int64"),
+    ("created_at", Issue.created_at, "timestamp"),
+    ("user_id", Issue.user_id, "int64"),
+    ("location", Issue.location, "string"),
+    ("category", Issue.category, "string"),
+    ("subcategory", Issue.subcategory, "string"),
+    ("severity", Issue.severity, "string"),
+    ("status", Issue.status, "string"),
+    ("estimated_days", Issue.estimated_days, "int64"),
+    ("lat", Issue.lat, "float64"),
+    ("lng", Issue.lng, "float64"),
+    ("mission_id", Mission.id, "int64"),
+    ("mission_status", Mission.status, "string"),
+    ("mission_completed_at", Mission.completed_at, "timestamp"),
+    ("blockchain_tx", Mission.blockchain_tx, "string"),
+    ("ledger_id", LedgerEntry.id, "int64"),
+    ("ledger_timestamp", LedgerEntry.timestamp, "timestamp"),
+]
+
+
+class ExportError(ValueError):
+    pass
+
+
+def _parse_date(value, name):
+
+    if not value:
+        return None
+
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ExportError(f"{name} must be an ISO date")
+
+
+def export_filters(location=None, category=None, status=None, since=None, until=None):
+
+    conditions = []
+
+    if location:
+        conditions.append(Issue.location.ilike(f"%{location}%"))
+
+    if category:
+        conditions.append(Issue.category == category)
+
+    if status:
+        conditions.append(Issue.status == status)
+
+    since = _parse_date(since, "since")
+    until = _parse_date(until, "until")
+
+    if since:
+        conditions.append(Issue.created_at >= since)
+
+    if until:
+        conditions.append(Issue.created_at < until)
+
+    return conditions
+
+
+def iter_export_batches(conditions, batch_size=EXPORT_BATCH_SIZE):
+
+    columns = [column for _, column, _ in EXPORT_COLUMNS]
+    last_id = 0
+
+    # exports read through the analytics pool, off the request pool
+    with read_session() as reader:
+
+        while True:
+
+            ids = reader.execute(
+                db.select(Issue.id)
+                .where(Issue.id > last_id, *conditions)
+                .order_by(Issue.id)
+                .limit(batch_size)
+            ).scalars().all()
+
+            if not ids:
+                return
+
+            rows = reader.execute(
+                db.select(*columns)
+                .select_from(Issue)
+                .outerjoin(Mission, Mission.issue_id == Issue.id)
+                .outerjoin(LedgerEntry, LedgerEntry.mission_id == Mission.id)
+                .where(Issue.id.between(ids[0], ids[-1]), *conditions)
+                .order_by(Issue.id, Mission.id, LedgerEntry.id)
+            ).all()
+
+            # end the read transaction between batches
+            reader.rollback()
+
+            last_id = ids[-1]
+
+            yield rows
+
+            if len(ids) < batch_size:
+                return
+
+
+def write_csv(batches):
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow([name for name, _, _ in EXPORT_COLUMNS])
+
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+class _ChunkSink(io.RawIOBase):
+
+    # write-only file that hands back whatever was written since the last
+    # drain, so the Parquet writer can stream into an HTTP response
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def write_parquet(batches):
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "string": pa.string(),
+        "timestamp": pa.timestamp("us")
+    }
+
+    schema = pa.schema([(name, types[kind]) for name, _, kind in EXPORT_COLUMNS])
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+
+    try:
+        for rows in batches:
+
+            columns = list(zip(*rows)) if rows else [()] * len(EXPORT_COLUMNS)
+
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type)
+                 for values, field in zip(columns, schema)],
+                schema=schema
+            ))
+
+            yield sink.drain()
+    finally:
+        writer.close()
+
+    yield sink.drain()
+
+
+def export_issues(fmt="csv", batch_size=EXPORT_BATCH_SIZE, **filters):
+
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"format must be one of {', '.join(EXPORT_FORMATS)}")
+
+    batches = iter_export_batches(export_filters(**filters), batch_size)
+
+    # pyarrow is only needed for Parquet; check before the stream starts
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ExportError("parquet export requires pyarrow")
+
+        return write_parquet(batches)
+
+    return write_csv(batches)
@@ -0,0 +1,35 @@
+import os
+
+from services.tiered_cache import TieredCache
+
+
+# ----------------------------------------------------
+# Reverse geocode cache
+# ----------------------------------------------------
+
+# ~110m buckets: close enough that neighbours share one locality lookup
+BUCKET_PRECISION = 3
+
+CACHE_PATH = os.environ.get("GEOCODE_CACHE_PATH", "geocode_cache.sqlite")
+CACHE_TTL = int(os.environ.get("GEOCODE_CACHE_TTL", 7 * 24 * 3600))
+NEGATIVE_TTL = int(os.environ.get("GEOCODE_NEGATIVE_TTL", 300))
+MEMORY_SIZE = int(os.environ.get("GEOCODE_CACHE_SIZE", 4096))
+
+
+def bucket_key(lat, lng, precision=BUCKET_PRECISION):
+
+    return f"{float(lat):.{precision}f},{float(lng):.{precision}f}"
+
+
+class GeocodeCache(TieredCache):
+
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL,
+                 negative_ttl=NEGATIVE_TTL, max_memory=MEMORY_SIZE):
+
+        super().__init__(
+            path, "geocode_cache", ttl, negative_ttl, max_memory,
+            key_column="bucket", value_column="locality"
+        )
+
+
+geocode_cache = GeocodeCache()
@@ -0,0 +1,152 @@
+import math
+
+
+# ----------------------------------------------------
+# Geohash helpers for the issue spatial index
+# ----------------------------------------------------
+
+# Issues store a geohash next to lat/lng. Nearby geohashes share a prefix,
+# so an area query becomes a handful of index range scans on that column.
+
+GEOHASH_PRECISION = 9
+
+# upper bound on prefixes per query (each one is an index range scan)
+MAX_COVER_CELLS = 32
+
+EARTH_RADIUS_KM = 6371.0
+
+# up to this size an area query reads its geohash ranges and sorts them;
+# bigger boxes hold so many rows that walking the created_at index
+# newest first and stopping at the limit is faster (crossover measured
+# at ~6 km on 1M issues spread over Delhi, see benchmarks/bench_spatial.py)
+SORT_IN_BOX_MAX_KM = 6.0
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def parse_coords(lat, lng):
+
+    # (None, None) unless both are finite and in range; the comparisons
+    # also turn away nan
+    try:
+        lat = float(lat)
+        lng = float(lng)
+    except (TypeError, ValueError):
+        return None, None
+
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None, None
+
+    return lat, lng
+
+
+def geohash_encode(lat, lng, precision=GEOHASH_PRECISION):
+
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+
+    while len(chars) < precision:
+
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                value = value * 2 + 1
+                lng_lo = mid
+            else:
+                value = value * 2
+                lng_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                value = value * 2 + 1
+                lat_lo = mid
+            else:
+                value = value * 2
+                lat_hi = mid
+
+        even = not even
+        bits += 1
+
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = 0
+            value = 0
+
+    return "".join(chars)
+
+
+def _cell_size(precision):
+
+    total = precision * 5
+    lng_bits = (total + 1) // 2
+    lat_bits = total // 2
+
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def cover_bbox(south, west, north, east, max_cells=MAX_COVER_CELLS):
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+
+        lat_step, lng_step = _cell_size(precision)
+
+        rows = int(math.floor(north / lat_step) - math.floor(south / lat_step)) + 1
+        cols = int(math.floor(east / lng_step) - math.floor(west / lng_step)) + 1
+
+        if rows * cols > max_cells and precision > 1:
+            continue
+
+        cells = set()
+
+        lat = (math.floor(south / lat_step) + 0.5) * lat_step
+        for _ in range(rows):
+            lng = (math.floor(west / lng_step) + 0.5) * lng_step
+            for _ in range(cols):
+                cells.add(geohash_encode(lat, lng, precision))
+                lng += lng_step
+            lat += lat_step
+
+        return sorted(cells)
+
+    return []
+
+
+def prefix_ranges(prefixes):
+
+    # "~" sorts after every geohash character
+    return [(p, p + "~") for p in prefixes]
+
+
+def bbox_around(lat, lng, radius_km):
+
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    dlng = dlat / max(math.cos(math.radians(lat)), 1e-6)
+
+    return lat - dlat, lng - dlng, lat + dlat, lng + dlng
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+
+    p1 = math.radians(lat1)
+    p2 = math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lng2 - lng1)
+
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def bbox_span_km(south, west, north, east):
+
+    mid = (south + north) / 2
+
+    return max(
+        haversine_km(south, west, north, west),
+        haversine_km(mid, west, mid, east)
+    )
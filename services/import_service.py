@@ -0,0 +1,241 @@
+import csv
+import io
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from models import db, Issue
+from services.ai_service import (
+    classify_issue,
+    extract_location_from_text,
+    predict_risk,
+    detect_language,
+    translate_many
+)
+from services.dedup_service import DEDUP_WINDOW_DAYS
+from services.geo_index import geohash_encode, parse_coords
+from services.mission_service import insert_missions, mission_row
+from services.rollup_service import record_reports
+
+
+# ----------------------------------------------------
+# Bulk complaint import (helpline CSV / JSONL dumps)
+# ----------------------------------------------------
+
+# Records are streamed from the file, enriched a chunk at a time and
+# written with one multi-row INSERT per table and one commit per chunk.
+
+IMPORT_CHUNK_SIZE = 2000
+
+
+def detect_format(filename, default="csv"):
+
+    name = (filename or "").lower()
+
+    if name.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+
+    if name.endswith(".csv"):
+        return "csv"
+
+    return default
+
+
+def iter_records(stream, fmt="csv"):
+
+    # uploads arrive as bytes, files opened by the CLI as text
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+
+    if fmt == "jsonl":
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+    else:
+        for row in csv.DictReader(stream):
+            yield row
+
+
+def _naive_utc(value):
+
+    # the schema stores naive UTC (datetime.utcnow())
+    if value.tzinfo is None:
+        return value
+
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _parse_time(value, default):
+
+    if not value:
+        return default
+
+    try:
+        return _naive_utc(datetime.fromisoformat(str(value)))
+    except ValueError:
+        return default
+
+
+def _record_text(record):
+
+    if not isinstance(record, dict):
+        return None
+
+    return (record.get("description") or record.get("text") or "").strip() or None
+
+
+def _record_coords(record):
+
+    # (None, None) for a record without coordinates, None for one whose
+    # coordinates are not a valid position
+    lat, lng = record.get("lat"), record.get("lng")
+
+    if lat in (None, "") or lng in (None, ""):
+        return None, None
+
+    lat, lng = parse_coords(lat, lng)
+
+    if lat is None:
+        return None
+
+    return lat, lng
+
+
+def _build_issue_row(record, text, coords, default_user_id, now):
+
+    category = record.get("category") or None
+    subcategory = record.get("subcategory") or None
+
+    if not category or not subcategory:
+        classification = classify_issue(text)
+        category = category or classification["category"]
+        subcategory = subcategory or classification["subcategory"]
+
+    location = record.get("location") or extract_location_from_text(text) or "Unknown"
+
+    lat, lng = coords
+
+    try:
+        user_id = int(record.get("user_id") or default_user_id)
+    except (TypeError, ValueError):
+        user_id = default_user_id
+
+    risk = predict_risk({"category": category, "subcategory": subcategory}, location)
+
+    return {
+        "user_id": user_id,
+        "original_text": text,
+        "category": category,
+        "subcategory": subcategory,
+        "location": location,
+        "severity": risk["severity"],
+        "status": "SUBMITTED",
+        "created_at": _parse_time(record.get("created_at"), now),
+        "lat": lat,
+        "lng": lng,
+        "geohash": geohash_encode(lat, lng) if lat is not None else None,
+        "ingest_status": "DONE"
+    }
+
+
+def _insert_chunk(rows):
+
+    # imports are not deduplicated, but recent ones become duplicate
+    # targets for new reports once the dedup maintenance pass indexes them
+    since = datetime.utcnow() - timedelta(days=DEDUP_WINDOW_DAYS)
+
+    for row in rows:
+        row["dedup_indexed"] = False if row["created_at"] >= since else None
+
+    issue_table = Issue.__table__
+
+    ids = db.session.execute(
+        issue_table.insert().returning(issue_table.c.id, sort_by_parameter_order=True),
+        rows
+    ).scalars().all()
+
+    insert_missions([
+        mission_row(
+            issue_id, row["user_id"], row["subcategory"],
+            row["category"], row["location"], row["created_at"]
+        )
+        for issue_id, row in zip(ids, rows)
+    ])
+
+    record_reports((row["user_id"], row["location"]) for row in rows)
+
+    db.session.commit()
+
+
+def _translate_chunk(texts):
+
+    foreign = [
+        i for i, text in enumerate(texts)
+        if detect_language(text) not in ("en", "unknown")
+    ]
+
+    if foreign:
+        translated = translate_many([texts[i] for i in foreign])
+
+        for i, text in zip(foreign, translated):
+            texts[i] = text
+
+    return texts
+
+
+def import_issues(records, default_user_id, chunk_size=IMPORT_CHUNK_SIZE,
+                  progress=None, translate=False):
+
+    stats = {"imported": 0, "skipped": 0, "seconds": 0.0, "per_second": 0.0}
+
+    started = time.perf_counter()
+    now = datetime.utcnow()
+    chunk = []
+
+    def flush():
+
+        if chunk:
+            texts = [text for _, text, _ in chunk]
+
+            if translate:
+                texts = _translate_chunk(texts)
+
+            _insert_chunk([
+                _build_issue_row(record, text, coords, default_user_id, now)
+                for (record, _, coords), text in zip(chunk, texts)
+            ])
+
+            stats["imported"] += len(chunk)
+            chunk.clear()
+
+        stats["seconds"] = round(time.perf_counter() - started, 3)
+        stats["per_second"] = round(stats["imported"] / stats["seconds"], 1) \
+            if stats["seconds"] else 0.0
+
+        if progress:
+            progress(stats)
+
+    for record in records:
+
+        text = _record_text(record)
+
+        # no text, or coordinates that would corrupt the spatial index
+        coords = _record_coords(record) if text is not None else None
+
+        if coords is None:
+            stats["skipped"] += 1
+            continue
+
+        chunk.append((record, text, coords))
+
+        if len(chunk) >= chunk_size:
+            flush()
+
+    flush()
+
+    return stats
@@ -0,0 +1,207 @@
+import logging
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from models import db, Issue
+from services.ai_service import (
+    classify_issue,
+    predict_risk,
+    detect_language,
+    translate_many
+)
+from services.mission_service import generate_missions
+from services.dedup_service import dedupe_issue
+from services.event_service import issue_payload, publish_event
+from services.rollup_service import record_reports
+from services.storage import begin_write
+
+
+# ----------------------------------------------------
+# Report ingestion queue
+# ----------------------------------------------------
+
+# The issue table doubles as the durable queue: a queued report is an
+# Issue row with ingest_status QUEUED and the raw citizen text. Workers
+# claim rows in batches with a single UPDATE, which SQLite applies
+# atomically, so several worker threads or processes can share the queue.
+
+INGEST_BATCH_SIZE = 32
+INGEST_POLL_SECONDS = 1.0
+
+# claims older than this belong to a worker that died mid-batch
+INGEST_STALE_SECONDS = 300
+
+log = logging.getLogger(__name__)
+
+# called with each issue once it is fully enriched
+ingest_hooks = []
+
+
+def translate_issue_texts(issues):
+
+    # one translator call for every non-English text in the batch
+    foreign = []
+
+    for issue in issues:
+        lang = detect_language(issue.original_text or "")
+        if lang != "en" and lang != "unknown":
+            foreign.append(issue)
+
+    if foreign:
+        translated = translate_many([i.original_text for i in foreign])
+
+        for issue, text in zip(foreign, translated):
+            issue.original_text = text
+
+
+def classify_issue_fields(issue):
+
+    classification = classify_issue(issue.original_text or "")
+
+    # popup values win, classification is the safety fallback
+    issue.category = issue.category or classification["category"]
+    issue.subcategory = issue.subcategory or classification["subcategory"]
+
+    risk = predict_risk(classification, issue.location)
+    issue.severity = risk["severity"]
+
+    return issue
+
+
+def enrich_issue(issue):
+
+    translate_issue_texts([issue])
+
+    return classify_issue_fields(issue)
+
+
+def enqueue_report(issue):
+
+    issue.ingest_status = "QUEUED"
+
+    db.session.add(issue)
+    db.session.commit()
+
+    return issue
+
+
+def claim_batch(limit=INGEST_BATCH_SIZE):
+
+    now = datetime.utcnow()
+    token = uuid.uuid4().hex
+
+    begin_write()
+
+    Issue.query.filter(
+        Issue.ingest_status == "PROCESSING",
+        Issue.ingest_claimed_at < now - timedelta(seconds=INGEST_STALE_SECONDS)
+    ).update({"ingest_status": "QUEUED"}, synchronize_session=False)
+
+    queued = db.session.query(Issue.id)\
+        .filter(Issue.ingest_status == "QUEUED")\
+        .order_by(Issue.id)\
+        .limit(limit)\
+        .scalar_subquery()
+
+    Issue.query.filter(
+        Issue.id.in_(queued),
+        Issue.ingest_status == "QUEUED"
+    ).update({
+        "ingest_status": "PROCESSING",
+        "ingest_token": token,
+        "ingest_claimed_at": now
+    }, synchronize_session=False)
+
+    db.session.commit()
+
+    issues = Issue.query.filter_by(ingest_token=token).order_by(Issue.id).all()
+
+    # enrichment takes seconds; don't hold a read snapshot across it (a
+    # stale snapshot cannot take the write lock afterwards). process_batch
+    # re-attaches the issues once it holds the lock
+    db.session.expunge_all()
+    db.session.rollback()
+
+    return issues
+
+
+def process_batch(limit=INGEST_BATCH_SIZE):
+
+    issues = claim_batch(limit)
+
+    if not issues:
+        return 0
+
+    done = []
+
+    translate_issue_texts(issues)
+
+    for issue in issues:
+        try:
+            classify_issue_fields(issue)
+            issue.ingest_status = "DONE"
+            done.append(issue)
+        except Exception:
+            issue.ingest_status = "FAILED"
+
+    begin_write()
+    db.session.add_all(issues)
+
+    # checked in order, so a repeat within the batch links to the first
+    fresh = [issue for issue in done if dedupe_issue(issue) is None]
+
+    for issue in done:
+        publish_event("issue.created", issue_payload(issue))
+
+    record_reports((i.user_id, i.location) for i in done)
+    generate_missions(fresh)
+
+    # issues, events, rollups and missions for the whole batch: one commit
+    db.session.commit()
+
+    for issue in done:
+        for hook in ingest_hooks:
+            hook(issue)
+
+    return len(issues)
+
+
+def _worker_loop(app, stop, batch_size, poll_seconds):
+
+    while not stop.is_set():
+
+        processed = 0
+
+        with app.app_context():
+            try:
+                processed = process_batch(batch_size)
+            except Exception:
+                db.session.rollback()
+                log.exception("ingest batch failed")
+            finally:
+                db.session.remove()
+
+        if not processed:
+            stop.wait(poll_seconds)
+
+
+def start_workers(app, count=2, batch_size=INGEST_BATCH_SIZE,
+                  poll_seconds=INGEST_POLL_SECONDS):
+
+    stop = threading.Event()
+
+    threads = [
+        threading.Thread(
+            target=_worker_loop,
+            args=(app, stop, batch_size, poll_seconds),
+            name=f"ingest-worker-{n}",
+            daemon=True
+        )
+        for n in range(count)
+    ]
+
+    for t in threads:
+        t.start()
+
+    return stop, threads
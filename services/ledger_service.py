@@ -1,14 +1,363 @@
-from models import db, LedgerEntry
+import hashlib
+import json
 from datetime import datetime
 
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models import db, LedgerEntry, LedgerHead, LedgerCheckpoint, LedgerUserHead
+from services.rollup_service import record_ledger_entries
+from services.storage import begin_write
+
+
+# ----------------------------------------------------
+# Hash-chained ledger
+# ----------------------------------------------------
+
+# Every entry stores the hash of the entry before it (prev_hash) and of the
+# same user's previous entry (user_prev_hash), and its own hash covers both.
+# Editing, removing or reordering an entry breaks the chain after it. The
+# verifier resumes from its last checkpoint, so an audit only rehashes
+# entries written since then.
+
+GENESIS_HASH = "0" * 64
+
+VERIFY_BATCH_SIZE = 5000
+
+
+def entry_hash(user_id, mission_id, category, timestamp, prev_hash, user_prev_hash):
+
+    data = json.dumps(
+        [user_id, mission_id, category, timestamp.isoformat(), prev_hash, user_prev_hash],
+        separators=(",", ":")
+    )
+
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _hash_of(entry):
+
+    return entry_hash(
+        entry.user_id, entry.mission_id, entry.category, entry.timestamp,
+        entry.prev_hash, entry.user_prev_hash
+    )
+
+
+def _user_head(user_id):
+
+    head = db.session.query(LedgerUserHead.entry_hash)\
+        .filter(LedgerUserHead.user_id == user_id)\
+        .scalar()
+
+    if head is not None:
+        return head
+
+    # users whose entries predate the per-user heads
+    return db.session.query(LedgerEntry.entry_hash)\
+        .filter(LedgerEntry.user_id == user_id)\
+        .order_by(LedgerEntry.id.desc())\
+        .limit(1)\
+        .scalar() or GENESIS_HASH
+
+
+def _set_user_heads(heads):
+
+    # heads: {user_id: (entry_id, entry_hash)}; joins the caller's transaction
+    if not heads:
+        return
+
+    table = LedgerUserHead.__table__
+    dialect = db.session.get_bind().dialect.name
+    module = postgresql if dialect == "postgresql" else sqlite
+    stmt = module.insert(table)
+
+    db.session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={"entry_id": stmt.excluded.entry_id, "entry_hash": stmt.excluded.entry_hash}
+        ),
+        [
+            {"user_id": user_id, "entry_id": entry_id, "entry_hash": digest}
+            for user_id, (entry_id, digest) in heads.items()
+        ]
+    )
+
+
+_CHAIN_COLUMNS = (
+    LedgerEntry.id,
+    LedgerEntry.user_id,
+    LedgerEntry.mission_id,
+    LedgerEntry.category,
+    LedgerEntry.timestamp,
+    LedgerEntry.prev_hash,
+    LedgerEntry.user_prev_hash,
+    LedgerEntry.entry_hash
+)
+
+
+def _chain_existing():
+
+    # first append on a database whose ledger predates the chain: hash the
+    # existing entries in id order once and create the head row
+    head_hash = GENESIS_HASH
+    head_id = 0
+    user_heads = {}
+    user_head_ids = {}
+    table = LedgerEntry.__table__
+
+    while True:
+
+        rows = db.session.query(*_CHAIN_COLUMNS[:5])\
+            .filter(LedgerEntry.id > head_id)\
+            .order_by(LedgerEntry.id)\
+            .limit(VERIFY_BATCH_SIZE)\
+            .all()
+
+        if not rows:
+            break
+
+        updates = []
+
+        for row in rows:
+            user_prev = user_heads.get(row.user_id, GENESIS_HASH)
+            digest = entry_hash(
+                row.user_id, row.mission_id, row.category, row.timestamp,
+                head_hash, user_prev
+            )
+            updates.append({
+                "b_id": row.id,
+                "prev_hash": head_hash,
+                "user_prev_hash": user_prev,
+                "entry_hash": digest
+            })
+            head_hash = user_heads[row.user_id] = digest
+            head_id = user_head_ids[row.user_id] = row.id
+
+        db.session.execute(
+            table.update()
+            .where(table.c.id == db.bindparam("b_id"))
+            .values(
+                prev_hash=db.bindparam("prev_hash"),
+                user_prev_hash=db.bindparam("user_prev_hash"),
+                entry_hash=db.bindparam("entry_hash")
+            ),
+            updates
+        )
+
+    _set_user_heads({
+        user_id: (user_head_ids[user_id], digest)
+        for user_id, digest in user_heads.items()
+    })
+
+    head = LedgerHead(id=1, entry_id=head_id, entry_hash=head_hash)
+    db.session.add(head)
+    db.session.flush()
+
+    return head
+
+
+def _lock_head():
+
+    # a no-op UPDATE takes the database write lock (a row lock elsewhere)
+    # before the head is read, so two appenders cannot both extend it
+    locked = LedgerHead.query.filter_by(id=1)\
+        .update({"entry_id": LedgerHead.entry_id}, synchronize_session=False)
+
+    if not locked:
+        return _chain_existing()
+
+    return db.session.get(LedgerHead, 1, populate_existing=True)
+
+
+def add_ledger_entries(entries):
+
+    # entries: list of (user_id, mission_id, category). Joins the caller's
+    # transaction; the head stays locked until the caller commits.
+    # Returns the new entry ids in input order.
+    if not entries:
+        return []
+
+    head = _lock_head()
+    now = datetime.utcnow()
+
+    prev = head.entry_hash
+    user_heads = {}
+    rows = []
+
+    for user_id, mission_id, category in entries:
+
+        if user_id not in user_heads:
+            user_heads[user_id] = _user_head(user_id)
+
+        digest = entry_hash(
+            user_id, mission_id, category, now, prev, user_heads[user_id]
+        )
+
+        rows.append({
+            "user_id": user_id,
+            "mission_id": mission_id,
+            "category": category,
+            "timestamp": now,
+            "prev_hash": prev,
+            "user_prev_hash": user_heads[user_id],
+            "entry_hash": digest
+        })
+
+        prev = user_heads[user_id] = digest
+
+    table = LedgerEntry.__table__
+
+    ids = db.session.execute(
+        table.insert().returning(table.c.id, sort_by_parameter_order=True),
+        rows
+    ).scalars().all()
+
+    head.entry_id = ids[-1]
+    head.entry_hash = prev
+
+    _set_user_heads({
+        row["user_id"]: (entry_id, row["entry_hash"])
+        for entry_id, row in zip(ids, rows)
+    })
+
+    record_ledger_entries((user_id, category) for user_id, _, category in entries)
+
+    return ids
+
+
 def add_ledger_entry(user_id, mission_id, category):
 
-    entry = LedgerEntry(
-        user_id=user_id,
-        mission_id=mission_id,
-        category=category,
-        timestamp=datetime.utcnow()
+    return add_ledger_entries([(user_id, mission_id, category)])[0]
+
+
+# ---------------- verification ----------------
+
+def _walk(query, link, expected, batch_size):
+
+    # checks entries in id order; link names the prev-hash column that
+    # must equal the previous entry's hash. Returns (checked, last, bad)
+    checked = 0
+    last = None
+    last_id = 0
+
+    while True:
+
+        rows = query.with_entities(*_CHAIN_COLUMNS)\
+            .filter(LedgerEntry.id > last_id)\
+            .order_by(LedgerEntry.id)\
+            .limit(batch_size)\
+            .all()
+
+        for row in rows:
+
+            if getattr(row, link) != expected or _hash_of(row) != row.entry_hash:
+                return checked, last, row.id
+
+            expected = row.entry_hash
+            last = (row.id, row.entry_hash)
+            checked += 1
+
+        if len(rows) < batch_size:
+            return checked, last, None
+
+        last_id = rows[-1].id
+
+
+def verify_ledger(full=False, batch_size=VERIFY_BATCH_SIZE):
+
+    head = db.session.get(LedgerHead, 1)
+
+    # a ledger written before the chain existed gets chained first
+    if head is None:
+        db.session.rollback()
+        begin_write()
+        head = _lock_head()
+        db.session.commit()
+
+    # entries appended while we walk belong to the next audit
+    head_id, head_hash = head.entry_id, head.entry_hash
+
+    checkpoint = None if full else LedgerCheckpoint.query\
+        .order_by(LedgerCheckpoint.id.desc())\
+        .first()
+
+    start_id, expected = (0, GENESIS_HASH)
+
+    if checkpoint is not None:
+
+        # the entry the checkpoint vouches for must itself be untouched
+        anchor = db.session.get(LedgerEntry, checkpoint.entry_id)
+
+        if anchor is None or anchor.entry_hash != checkpoint.entry_hash \
+                or _hash_of(anchor) != anchor.entry_hash:
+            return {
+                "ok": False,
+                "checked": 0,
+                "from_entry": checkpoint.entry_id,
+                "first_bad_entry": checkpoint.entry_id
+            }
+
+        start_id, expected = checkpoint.entry_id, checkpoint.entry_hash
+
+    query = LedgerEntry.query.filter(
+        LedgerEntry.id > start_id, LedgerEntry.id <= head_id
     )
 
-    db.session.add(entry)
-    db.session.commit()
+    checked, last, bad = _walk(query, "prev_hash", expected, batch_size)
+
+    result = {
+        "ok": bad is None,
+        "checked": checked,
+        "from_entry": start_id,
+        "first_bad_entry": bad
+    }
+
+    if bad is not None:
+        return result
+
+    last = last or (start_id, expected)
+
+    # entries cut off the end leave the head pointing past the last one
+    if (head_id, head_hash) != last:
+        result["ok"] = False
+        result["first_bad_entry"] = last[0] + 1
+        return result
+
+    if checked:
+        # the walk ran in a read snapshot; the checkpoint gets its own
+        # write transaction
+        db.session.rollback()
+        begin_write()
+        db.session.add(LedgerCheckpoint(
+            entry_id=last[0],
+            entry_hash=last[1],
+            verified=checked,
+            created_at=datetime.utcnow()
+        ))
+        db.session.commit()
+
+    result["head_entry"] = last[0]
+
+    return result
+
+
+def verify_user_ledger(user_id, batch_size=VERIFY_BATCH_SIZE):
+
+    head = db.session.get(LedgerUserHead, user_id)
+    query = LedgerEntry.query.filter(LedgerEntry.user_id == user_id)
+
+    checked, last, bad = _walk(query, "user_prev_hash", GENESIS_HASH, batch_size)
+
+    # entries cut off the end of the user's chain leave the head pointing
+    # at an entry that is gone; users without a head row (entries written
+    # before the heads existed) get one with their next entry
+    if bad is None and head is not None \
+            and (head.entry_id, head.entry_hash) != (last or (0, GENESIS_HASH)):
+        bad = head.entry_id
+
+    return {
+        "user_id": user_id,
+        "ok": bad is None,
+        "checked": checked,
+        "first_bad_entry": bad,
+        "head_hash": last[1] if last else GENESIS_HASH
+    }
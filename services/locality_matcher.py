@@ -0,0 +1,290 @@
+import re
+from functools import lru_cache
+
+
+# ----------------------------------------------------
+# Fuzzy locality matching (second tier)
+# ----------------------------------------------------
+
+# Runs only when the exact trie in ai_service finds nothing. Both the
+# gazetteer and the complaint are folded first so common transliteration
+# variants compare equal ("lakshmi" / "laxmi", "lajpath" / "lajpat",
+# "aa" / "a"). Folded tokens are then matched SymSpell-style: every
+# gazetteer token is stored under all its deletions up to MAX_TOKEN_EDITS
+# letters, so a complaint token finds its near matches with a handful of
+# dict lookups, and only those are checked with a real edit distance.
+# The word trie of the exact tier is walked with these near matches, so
+# multi-word names ("rajori garden") and run-together names
+# ("lajpatnagar") are found in one pass over the complaint.
+
+MAX_TOKEN_EDITS = 2
+MAX_NAME_EDITS = 2
+
+# deletions are taken from the first PREFIX_LENGTH letters only (the usual
+# SymSpell trick): near spellings still share a key, and long words don't
+# blow up into hundreds of keys
+PREFIX_LENGTH = 7
+
+# every word of the complaint is a possible start of a name, so the fuzzy
+# pass grows with its length; only its first FUZZY_MAX_TOKENS words are
+# searched (place names come early in practice), which keeps a long
+# complaint near the cost of a short one
+FUZZY_MAX_TOKENS = 64
+
+# common shorthand in complaints, expanded before matching
+ALIASES = {
+    "ngr": "nagar",
+    "gdn": "garden",
+    "vhr": "vihar",
+    "mkt": "market",
+    "encl": "enclave",
+    "clny": "colony",
+    "cp": "connaught place",
+    "gk": "greater kailash",
+}
+
+# a misspelt one-word place only counts after a preposition, before a
+# postposition or a place word, so "palm" or "packet" in a sentence don't
+# turn into Palam or Saket
+PREPOSITIONS = frozenset(
+    "in at near from to of opposite behind outside area".split()
+)
+POSTPOSITIONS = frozenset("me mein ke ki ka se par pe".split())
+PLACE_SUFFIXES = frozenset(
+    "metro market sector sec block phase road village station extension "
+    "colony nagar vihar enclave main".split()
+)
+
+_FOLDS = [
+    ("ksh", "x"), ("chh", "c"), ("ch", "c"), ("sh", "s"), ("ph", "f"),
+    ("th", "t"), ("dh", "d"), ("bh", "b"), ("kh", "k"), ("gh", "g"),
+    ("jh", "j"), ("ck", "k"), ("q", "k"), ("ow", "au"), ("w", "v"), ("z", "j"),
+    ("ce", "se"), ("ci", "si"), ("ee", "i"), ("oo", "u"), ("ou", "u"),
+    ("ai", "e"), ("y", "i"),
+]
+
+_VOWELS = re.compile(r"[aeiou]")
+
+_REPEATS = re.compile(r"(.)\1+")
+
+
+def fold(token):
+
+    token = token.lower()
+
+    for src, dst in _FOLDS:
+        token = token.replace(src, dst)
+
+    # doubled letters ("aa", "hh", "ll") carry no meaning in romanised Hindi
+    return _REPEATS.sub(r"\1", token)
+
+
+def edit_budget(length):
+
+    # on the shorter of the two unfolded spellings; the single edit
+    # allowed up to 7 letters has to be a vowel (see _near_tokens)
+    if length <= 4:
+        return 0
+
+    if length <= 7:
+        return 1
+
+    return MAX_TOKEN_EDITS
+
+
+def _deletes(token, depth):
+
+    found = {token}
+    frontier = {token}
+
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        found |= frontier
+
+    return found
+
+
+def edit_distance(a, b, limit):
+
+    # optimal string alignment (adjacent swaps count once); stops early
+    # once every cell in a row is over the limit
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    prev2 = None
+    prev = list(range(len(b) + 1))
+
+    for i, ca in enumerate(a, 1):
+
+        row = [i] + [0] * len(b)
+
+        for j, cb in enumerate(b, 1):
+            cost = 0 if ca == cb else 1
+            row[j] = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + cost)
+
+            if prev2 is not None and i > 1 and j > 1 \
+                    and ca == b[j - 2] and a[i - 2] == cb:
+                row[j] = min(row[j], prev2[j - 2] + 1)
+
+        if min(row) > limit:
+            return limit + 1
+
+        prev2, prev = prev, row
+
+    return prev[-1]
+
+
+def build_fuzzy_index(places):
+
+    # trie: like the exact one, plus run-together names as one token
+    trie = {}
+    tokens = set()
+    joined = set()
+
+    for order, place in enumerate(places):
+        words = place.lower().split()
+
+        if not words:
+            continue
+
+        variants = [words]
+        if len(words) > 1:
+            variants.append(["".join(words)])
+            joined.add("".join(words))
+
+        for variant in variants:
+            node = trie
+            for word in variant:
+                node = node.setdefault(word, {})
+                tokens.add(word)
+
+            # a run-together name is one word in the text, like a one-word place
+            node.setdefault(None, (len(" ".join(words)), -order, place, len(variant) == 1))
+
+    deletes = {}
+
+    for token in tokens:
+        folded = fold(token)[:PREFIX_LENGTH]
+        for key in _deletes(folded, MAX_TOKEN_EDITS if len(token) > 4 else 0):
+            deletes.setdefault(key, set()).add(token)
+
+    return {
+        "trie": trie,
+        "deletes": deletes,
+        "joined": joined,
+        "max_length": max(map(len, tokens), default=0)
+    }
+
+
+def _near_tokens(index, token, max_edits=MAX_TOKEN_EDITS):
+
+    # (gazetteer token, edits) pairs within budget of token
+    if len(token) > index["max_length"] + max_edits:
+        return []
+
+    folded = fold(token)
+    depth = min(max_edits, edit_budget(len(token)))
+    candidates = set()
+
+    for key in _deletes(folded[:PREFIX_LENGTH], depth):
+        candidates |= index["deletes"].get(key, set())
+
+    near = []
+
+    for candidate in candidates:
+        limit = min(max_edits, edit_budget(min(len(token), len(candidate))))
+
+        # run-together names are long but no more forgiving than their parts
+        if candidate in index["joined"]:
+            limit = min(limit, 1)
+        edits = edit_distance(folded, fold(candidate), limit)
+
+        if edits > limit:
+            continue
+
+        # short words only differ in their vowels: "rohni" is Rohini,
+        # "param" is not Palam
+        if edits and limit == 1 and \
+                _VOWELS.sub("", folded) != _VOWELS.sub("", fold(candidate)):
+            continue
+
+        near.append((candidate, edits))
+
+    return near
+
+
+def _expand(tokens):
+
+    out = []
+
+    for token in tokens:
+        out.extend(ALIASES.get(token, token).split(" "))
+
+    return out
+
+
+def _in_place_context(tokens, start, end):
+
+    before = tokens[start - 1] if start > 0 else None
+    after = tokens[end] if end < len(tokens) else None
+
+    return before in PREPOSITIONS or after in POSTPOSITIONS \
+        or after in PLACE_SUFFIXES or (after or "").isdigit()
+
+
+def fuzzy_match_location(tokens, index, cache=None):
+
+    # tokens: the normalised complaint split on spaces. Returns the place
+    # name or None; fewest edits wins, then the longest name, then the
+    # earliest gazetteer entry
+    near = cache or (lambda token, max_edits=MAX_TOKEN_EDITS:
+                     _near_tokens(index, token, max_edits))
+    tokens = _expand(tokens)[:FUZZY_MAX_TOKENS]
+    best = None
+
+    for start in range(len(tokens)):
+
+        stack = [(index["trie"], start, 0)]
+
+        while stack:
+            node, pos, edits = stack.pop()
+
+            # one word, or two written apart ("pitam pura"); a joined pair
+            # can only match a name within one edit
+            steps = [(tokens[pos], pos + 1, MAX_TOKEN_EDITS)] if pos < len(tokens) else []
+            if pos + 1 < len(tokens) and tokens[pos] not in PREPOSITIONS:
+                steps.append((tokens[pos] + tokens[pos + 1], pos + 2, 1))
+
+            for word, end, max_edits in steps:
+                for candidate, cost in near(word, max_edits):
+
+                    child = node.get(candidate)
+                    if child is None or edits + cost > MAX_NAME_EDITS:
+                        continue
+
+                    stack.append((child, end, edits + cost))
+
+                    match = child.get(None)
+                    if match is None:
+                        continue
+
+                    length, order, place, single_word = match
+                    if edits + cost and single_word \
+                            and not _in_place_context(tokens, start, end):
+                        continue
+
+                    key = (-(edits + cost), length, order)
+                    if best is None or key > best[0]:
+                        best = (key, place)
+
+    return best[1] if best else None
+
+
+def cached_near_tokens(index, maxsize=50000):
+
+    # complaints reuse the same words; remember each token's near matches
+    @lru_cache(maxsize=maxsize)
+    def near(token, max_edits=MAX_TOKEN_EDITS):
+        return tuple(_near_tokens(index, token, max_edits))
+
+    return near
@@ -1,28 +1,59 @@
 from models import db, Mission
 from datetime import datetime
 
-def generate_missions(issue):
 
-    missions = []
+# Missions are written with one multi-row INSERT and join the caller's
+# transaction; the caller commits once for the issue and its missions.
 
-    title = f"Resolve {issue.subcategory} in {issue.location}"
+def mission_row(issue_id, user_id, subcategory, category, location, created_at=None):
 
-    mission = Mission(
-        issue_id=issue.id,
-        user_id=issue.user_id,
-        title=title,
-        category=issue.category,
-        location=issue.location,
-        status="OPEN",
-        created_at=datetime.utcnow()
-    )
+    return {
+        "issue_id": issue_id,
+        "user_id": user_id,
+        "title": f"Resolve {subcategory} in {location}",
+        "category": category,
+        "location": location,
+        "status": "OPEN",
+        "created_at": created_at or datetime.utcnow()
+    }
 
-    db.session.add(mission)
-    db.session.commit()
 
-    missions.append({
-        "mission_id": mission.id,
-        "title": mission.title
-    })
+def insert_missions(rows):
 
-    return missions
+    if not rows:
+        return []
+
+    table = Mission.__table__
+
+    return db.session.execute(
+        table.insert().returning(table.c.id, sort_by_parameter_order=True),
+        rows
+    ).scalars().all()
+
+
+def generate_missions(issues):
+
+    # issues need ids before their missions can point at them
+    if any(issue.id is None for issue in issues):
+        db.session.flush()
+
+    now = datetime.utcnow()
+
+    rows = [
+        mission_row(
+            issue.id, issue.user_id, issue.subcategory,
+            issue.category, issue.location, now
+        )
+        for issue in issues
+    ]
+
+    ids = insert_missions(rows)
+
+    return [
+        {
+            "mission_id": mission_id,
+            "issue_id": row["issue_id"],
+            "title": row["title"]
+        }
+        for mission_id, row in zip(ids, rows)
+    ]
@@ -0,0 +1,128 @@
+import json
+import math
+import os
+import threading
+
+
+# ----------------------------------------------------
+# Offline reverse geocoding
+# ----------------------------------------------------
+
+# Locality centroids live in a local data file and are bucketed into a
+# uniform lat/lng grid, so a lookup only inspects the cells around the
+# point instead of every locality.
+
+DATA_PATH = os.environ.get(
+    "LOCALITY_DATA_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 "data", "delhi_localities.json")
+)
+
+# beyond this the point is probably outside the gazetteer's coverage
+MAX_DISTANCE_KM = float(os.environ.get("OFFLINE_GEOCODE_MAX_KM", 3.0))
+
+CELL_SIZE = 0.02
+
+KM_PER_DEGREE = 111.32
+
+
+def _distance_km(lat1, lng1, lat2, lng2):
+
+    # equirectangular approximation, plenty for city-sized distances
+    x = (lng2 - lng1) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = lat2 - lat1
+
+    return math.hypot(x, y) * KM_PER_DEGREE
+
+
+class LocalityGrid:
+
+    def __init__(self, localities, cell_size=CELL_SIZE):
+
+        self.cell_size = cell_size
+        self.cells = {}
+        self.size = 0
+        self.south = self.north = None
+
+        for loc in localities:
+            lat = float(loc["lat"])
+            lng = float(loc["lng"])
+
+            self.south = lat if self.south is None else min(self.south, lat)
+            self.north = lat if self.north is None else max(self.north, lat)
+
+            self.cells.setdefault(self._cell(lat, lng), []).append(
+                (lat, lng, loc["name"])
+            )
+            self.size += 1
+
+    def _cell(self, lat, lng):
+
+        return (math.floor(lat / self.cell_size), math.floor(lng / self.cell_size))
+
+    def nearest(self, lat, lng, max_km=MAX_DISTANCE_KM):
+
+        if not self.size:
+            return None
+
+        # too far north or south of every locality; this also keeps the
+        # ring search short near the poles, where cell_km goes to 0
+        margin = max_km / KM_PER_DEGREE
+        if not self.south - margin <= lat <= self.north + margin:
+            return None
+
+        row, col = self._cell(lat, lng)
+
+        # a ring of cells covers at least ring * cell_size degrees of
+        # latitude; longitude degrees are shorter, so that bound holds
+        cell_km = self.cell_size * KM_PER_DEGREE * math.cos(math.radians(lat))
+        max_ring = int(max_km / cell_km) + 1
+
+        best = None
+        best_km = max_km
+
+        for ring in range(max_ring + 1):
+
+            for r in range(row - ring, row + ring + 1):
+                for c in range(col - ring, col + ring + 1):
+
+                    if max(abs(r - row), abs(c - col)) != ring:
+                        continue
+
+                    for p_lat, p_lng, name in self.cells.get((r, c), ()):
+                        d = _distance_km(lat, lng, p_lat, p_lng)
+                        if d <= best_km:
+                            best, best_km = name, d
+
+            # anything in further rings is at least ring * cell_km away
+            if best is not None and best_km <= ring * cell_km:
+                break
+
+        return best
+
+
+def load_locality_grid(path=DATA_PATH):
+
+    with open(path, encoding="utf-8") as f:
+        return LocalityGrid(json.load(f))
+
+
+_grid = None
+_grid_lock = threading.Lock()
+
+
+def nearest_locality(lat, lng):
+
+    global _grid
+
+    if _grid is None:
+        with _grid_lock:
+            if _grid is None:
+                try:
+                    _grid = load_locality_grid()
+                except (OSError, ValueError, KeyError):
+                    _grid = LocalityGrid([])
+
+    name = _grid.nearest(float(lat), float(lng))
+
+    return name.title() if name else None
@@ -0,0 +1,113 @@
+import base64
+import json
+from datetime import datetime
+
+from models import db
+
+
+# ----------------------------------------------------
+# Keyset (cursor) pagination and JSON-lines streaming
+# ----------------------------------------------------
+
+# Lists are ordered newest first on (timestamp, id). A cursor is the
+# (timestamp, id) of the last row handed out; the next page starts strictly
+# after it, so every page is one index range scan however deep the client
+# pages, and rows inserted meanwhile never shift or repeat a page.
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# rows fetched per query while streaming; also bounds memory per stream
+STREAM_BATCH_SIZE = 1000
+
+
+class CursorError(ValueError):
+    pass
+
+
+def encode_cursor(ts, row_id):
+
+    raw = f"{ts.isoformat()}|{row_id}".encode("utf-8")
+
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        ts, row_id = raw.decode("utf-8").split("|")
+        return datetime.fromisoformat(ts), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise CursorError("invalid cursor")
+
+
+def page_size(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+
+    return max(1, min(size, maximum))
+
+
+def after_cursor(query, ts_column, id_column, cursor):
+
+    if cursor is None:
+        return query
+
+    ts, row_id = cursor
+
+    return query.filter(db.or_(
+        ts_column < ts,
+        db.and_(ts_column == ts, id_column < row_id)
+    ))
+
+
+def keyset_page(query, ts_column, id_column, cursor=None, limit=DEFAULT_PAGE_SIZE,
+                ts_attr="timestamp"):
+
+    rows = after_cursor(query, ts_column, id_column, cursor)\
+        .order_by(ts_column.desc(), id_column.desc())\
+        .limit(limit + 1)\
+        .all()
+
+    next_cursor = None
+
+    # one extra row tells us whether another page exists
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, ts_attr), last.id)
+
+    return rows, next_cursor
+
+
+def stream_json_lines(query, ts_column, id_column, serialize, cursor=None,
+                      ts_attr="timestamp", batch_size=STREAM_BATCH_SIZE):
+
+    # walks the same keyset as keyset_page, one short query per batch, so
+    # no read transaction stays open between batches and at most one batch
+    # of rows is held in memory
+    while True:
+
+        rows, _ = keyset_page(
+            query, ts_column, id_column, cursor, batch_size, ts_attr
+        )
+
+        if not rows:
+            return
+
+        chunk = "".join(json.dumps(serialize(row)) + "\n" for row in rows)
+
+        last = rows[-1]
+        cursor = (getattr(last, ts_attr), last.id)
+
+        # drop the batch from the identity map before fetching the next
+        db.session.expunge_all()
+
+        yield chunk
+
+        if len(rows) < batch_size:
+            return
@@ -0,0 +1,306 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sortedcontainers import SortedList
+
+from models import db, CreditAward, Issue, User
+
+OFFICER_DOMAIN = "@delhi.gov.in"
+
+# full rebuilds only correct drift (edited or deleted issues); awards and
+# reports are picked up on the next rank request in every worker
+RANK_REFRESH_SECONDS = 300
+
+# a catch-up bigger than this (a bulk import) goes to a background rebuild
+RANK_SYNC_MAX_ROWS = 20000
+
+# queued reports get their location from the ingest worker; the sync waits
+# for them, but not for ones stuck longer than this
+RANK_PENDING_GRACE_SECONDS = 600
+
+PENDING_INGEST = ("QUEUED", "PROCESSING")
+
+log = logging.getLogger(__name__)
+
+
+# ----------------------------------------------------
+# In-memory citizen ranking
+# ----------------------------------------------------
+
+# Credits are kept in sorted lists (all of Delhi plus one per area), so a
+# rank is a bisect instead of a scan over every user.
+#
+# Each worker process holds its own copy. Before answering, it applies what
+# any worker committed since it last looked: credit awards after the
+# newest CreditAward id it has seen, reports after the newest Issue id.
+# Both are primary-key range reads of a few rows, so every worker gives
+# the same rank. Full rebuilds are built off the lock in a background
+# thread and swapped in whole; only the first rank request of a worker
+# that was not warmed up waits for one.
+
+class RankIndex:
+
+    def __init__(self):
+
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._refresher = None
+
+        self._loaded_at = None
+        self.award_seen = 0
+        self.issue_seen = 0
+
+        self.credits = {}
+        self.area_counts = {}
+        self.delhi = SortedList()
+        self.areas = {}
+
+    def _build(self):
+
+        # one read transaction, so the watermarks match the rows loaded
+        award_seen = db.session.query(db.func.max(CreditAward.id)).scalar() or 0
+        issue_seen = self._pending_floor(
+            db.session.query(db.func.max(Issue.id)).scalar() or 0
+        )
+
+        credits = {}
+        area_counts = {}
+        areas = {}
+
+        users = db.session.query(User.id, User.credits)\
+            .filter(~User.email.endswith(OFFICER_DOMAIN))
+
+        for uid, c in users:
+            credits[uid] = c or 0
+
+        delhi = SortedList(credits.values())
+
+        reports = db.session.query(
+            Issue.user_id,
+            Issue.location,
+            db.func.count(Issue.id)
+        ).filter(Issue.location.isnot(None), Issue.id <= issue_seen)\
+         .group_by(Issue.user_id, Issue.location)
+
+        for uid, loc, n in reports:
+            if uid not in credits:
+                continue
+
+            area_counts.setdefault(uid, {})[loc] = n
+            areas.setdefault(loc, SortedList()).add(credits[uid])
+
+        return {
+            "credits": credits,
+            "area_counts": area_counts,
+            "delhi": delhi,
+            "areas": areas,
+            "award_seen": award_seen,
+            "issue_seen": issue_seen
+        }
+
+    def _swap(self, state):
+
+        with self._lock:
+            self.credits = state["credits"]
+            self.area_counts = state["area_counts"]
+            self.delhi = state["delhi"]
+            self.areas = state["areas"]
+            self.award_seen = state["award_seen"]
+            self.issue_seen = state["issue_seen"]
+            self._loaded_at = time.time()
+
+    def _pending_floor(self, upto):
+
+        # reports still in the ingest queue have no final location yet;
+        # stop just before the oldest one
+        grace = datetime.utcnow() - timedelta(seconds=RANK_PENDING_GRACE_SECONDS)
+
+        pending = db.session.query(db.func.min(Issue.id)).filter(
+            Issue.ingest_status.in_(PENDING_INGEST),
+            Issue.created_at >= grace,
+            Issue.id <= upto
+        ).scalar()
+
+        return pending - 1 if pending else upto
+
+    def _ensure_loaded(self):
+
+        if self._loaded_at is not None:
+            return
+
+        # nothing to answer from yet; one request builds, the rest wait
+        with self._load_lock:
+            if self._loaded_at is None:
+                self._swap(self._build())
+
+    def _sync(self):
+
+        awards = db.session.query(CreditAward.id, CreditAward.user_id)\
+            .filter(CreditAward.id > self.award_seen)\
+            .order_by(CreditAward.id)\
+            .limit(RANK_SYNC_MAX_ROWS + 1)\
+            .all()
+
+        upto = self._pending_floor(
+            db.session.query(db.func.max(Issue.id)).scalar() or 0
+        )
+
+        reports = db.session.query(Issue.id, Issue.user_id, Issue.location)\
+            .filter(Issue.id > self.issue_seen, Issue.id <= upto)\
+            .order_by(Issue.id)\
+            .limit(RANK_SYNC_MAX_ROWS + 1)\
+            .all()
+
+        if len(awards) > RANK_SYNC_MAX_ROWS or len(reports) > RANK_SYNC_MAX_ROWS:
+            self.refresh()
+            return
+
+        if awards:
+            changed = {uid for _, uid in awards}
+
+            balances = db.session.query(User.id, User.credits)\
+                .filter(User.id.in_(changed))
+
+            for uid, c in balances:
+                self._set_credits(uid, c)
+
+            self.award_seen = awards[-1][0]
+
+        for _, uid, location in reports:
+            self._record_report(uid, location)
+
+        if reports:
+            self.issue_seen = reports[-1][0]
+
+    def _ensure_user(self, uid):
+
+        if uid in self.credits:
+            return True
+
+        user = db.session.get(User, uid)
+
+        if not user or (user.email or "").endswith(OFFICER_DOMAIN):
+            return False
+
+        self.credits[uid] = user.credits or 0
+        self.delhi.add(self.credits[uid])
+
+        return True
+
+    def _set_credits(self, uid, credits):
+
+        if not self._ensure_user(uid):
+            return
+
+        old = self.credits[uid]
+        credits = credits or 0
+
+        if old == credits:
+            return
+
+        self.credits[uid] = credits
+
+        self.delhi.remove(old)
+        self.delhi.add(credits)
+
+        for loc in self.area_counts.get(uid, ()):
+            self.areas[loc].remove(old)
+            self.areas[loc].add(credits)
+
+    def _record_report(self, uid, location):
+
+        if not location or not self._ensure_user(uid):
+            return
+
+        counts = self.area_counts.setdefault(uid, {})
+
+        if location not in counts:
+            counts[location] = 0
+            self.areas.setdefault(location, SortedList()).add(self.credits[uid])
+
+        counts[location] += 1
+
+    def warm_up(self):
+
+        self._ensure_loaded()
+
+    def refresh(self):
+
+        # rebuild in the background when a refresher runs, else right here
+        if self._refresher is not None and self._refresher.is_alive():
+            self._wake.set()
+        else:
+            self._swap(self._build())
+
+    def rank(self, uid):
+
+        self._ensure_loaded()
+
+        with self._lock:
+            self._sync()
+
+            if not self._ensure_user(uid):
+                return None
+
+            mine = self.credits[uid]
+
+            # competition ranking: users with more credits plus one
+            delhi_rank = len(self.delhi) - self.delhi.bisect_right(mine) + 1
+
+            counts = self.area_counts.get(uid)
+
+            if not counts:
+                return {
+                    "area": None,
+                    "rank_in_area": None,
+                    "total_users_in_area": 0,
+                    "rank_in_delhi": None,
+                    "total_users_in_delhi": len(self.delhi)
+                }
+
+            area = max(counts, key=counts.get)
+            in_area = self.areas[area]
+
+            return {
+                "area": area,
+                "rank_in_area": len(in_area) - in_area.bisect_right(mine) + 1,
+                "total_users_in_area": len(in_area),
+                "rank_in_delhi": delhi_rank,
+                "total_users_in_delhi": len(self.delhi)
+            }
+
+    def _refresh_loop(self, app, stop, interval):
+
+        while not stop.is_set():
+
+            with app.app_context():
+                try:
+                    self._swap(self._build())
+                except Exception:
+                    log.exception("rank index rebuild failed")
+                finally:
+                    db.session.remove()
+
+            self._wake.wait(interval)
+            self._wake.clear()
+
+    def start(self, app, interval=RANK_REFRESH_SECONDS):
+
+        # builds the index now, then again every interval or on refresh()
+        stop = threading.Event()
+
+        self._refresher = threading.Thread(
+            target=self._refresh_loop,
+            args=(app, stop, interval),
+            name="rank-refresher",
+            daemon=True
+        )
+        self._refresher.start()
+
+        return stop, self._refresher
+
+
+rank_index = RankIndex()
@@ -0,0 +1,168 @@
+import threading
+import time
+from collections import Counter
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models import db, Issue, LedgerEntry, Reward, User, UserRollup
+from services.storage import begin_write
+
+
+# ----------------------------------------------------
+# Per-user impact rollups
+# ----------------------------------------------------
+
+# Reporting an issue bumps the user's ("location", <place>) and
+# ("total", "reports") counters; a ledger entry bumps ("category", <cat>)
+# and ("total", "actions"). Bumps are upserts that add to the stored count
+# inside the caller's transaction, so they never lose updates and commit
+# or roll back with the change they count.
+
+REWARDS_TTL = 300
+
+_rewards = {"expires": 0, "rows": []}
+_rewards_lock = threading.Lock()
+
+
+def _upsert(table):
+
+    dialect = db.session.get_bind().dialect.name
+    module = postgresql if dialect == "postgresql" else sqlite
+    stmt = module.insert(table)
+
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id", "kind", "key"],
+        set_={"count": table.c.count + stmt.excluded.count}
+    )
+
+
+def bump_rollups(counts):
+
+    # counts: {(user_id, kind, key): delta}
+    if not counts:
+        return
+
+    db.session.execute(_upsert(UserRollup.__table__), [
+        {"user_id": user_id, "kind": kind, "key": key or "", "count": delta}
+        for (user_id, kind, key), delta in counts.items()
+    ])
+
+
+def record_reports(reports):
+
+    # reports: iterable of (user_id, location)
+    counts = Counter()
+
+    for user_id, location in reports:
+        counts[(user_id, "location", location)] += 1
+        counts[(user_id, "total", "reports")] += 1
+
+    bump_rollups(counts)
+
+
+def record_ledger_entries(entries):
+
+    # entries: iterable of (user_id, category)
+    counts = Counter()
+
+    for user_id, category in entries:
+        counts[(user_id, "category", category)] += 1
+        counts[(user_id, "total", "actions")] += 1
+
+    bump_rollups(counts)
+
+
+def rebuild_rollups():
+
+    # recount everything from the source tables; used once for databases
+    # that predate the rollups and as a repair tool
+    UserRollup.query.delete()
+
+    counts = Counter()
+
+    for user_id, location, n in db.session.query(
+        Issue.user_id, Issue.location, db.func.count(Issue.id)
+    ).group_by(Issue.user_id, Issue.location):
+        counts[(user_id, "location", location)] += n
+        counts[(user_id, "total", "reports")] += n
+
+    for user_id, category, n in db.session.query(
+        LedgerEntry.user_id, LedgerEntry.category, db.func.count(LedgerEntry.id)
+    ).group_by(LedgerEntry.user_id, LedgerEntry.category):
+        counts[(user_id, "category", category)] += n
+        counts[(user_id, "total", "actions")] += n
+
+    bump_rollups(counts)
+    db.session.commit()
+
+    return len(counts)
+
+
+def ensure_rollups():
+
+    # first start on an existing database: build the rollups once. Workers
+    # starting together queue on the write lock; the first one builds them
+    # and the rest find them built
+    begin_write()
+
+    if db.session.query(UserRollup.user_id).first() is not None:
+        db.session.rollback()
+        return
+
+    if db.session.query(Issue.id).first() is None \
+            and db.session.query(LedgerEntry.id).first() is None:
+        db.session.rollback()
+        return
+
+    rebuild_rollups()
+
+
+def unlocked_rewards(credits):
+
+    # the reward catalogue is tiny and rarely edited; keep it in memory
+    with _rewards_lock:
+        if _rewards["expires"] < time.time():
+            _rewards["rows"] = [
+                (r.min_credits or 0, r.name, r.description)
+                for r in Reward.query.order_by(Reward.min_credits).all()
+            ]
+            _rewards["expires"] = time.time() + REWARDS_TTL
+
+        rows = _rewards["rows"]
+
+    return [
+        {"name": name, "description": description}
+        for min_credits, name, description in rows
+        if min_credits <= (credits or 0)
+    ]
+
+
+def user_summary(user_id):
+
+    impact = {}
+    by_category = {}
+    totals = {}
+
+    for kind, key, count in db.session.query(
+        UserRollup.kind, UserRollup.key, UserRollup.count
+    ).filter(UserRollup.user_id == user_id):
+
+        if kind == "location":
+            impact[key or None] = count
+        elif kind == "category":
+            by_category[key or None] = count
+        else:
+            totals[key] = count
+
+    credits = db.session.query(User.credits).filter(User.id == user_id).scalar()
+
+    return {
+        "impact": impact,
+        "metrics": {
+            "total_actions": totals.get("actions", 0),
+            "by_category": by_category
+        },
+        "rewards": unlocked_rewards(credits),
+        "credits": credits or 0,
+        "total_reports": totals.get("reports", 0)
+    }
@@ -0,0 +1,230 @@
+import re
+
+from models import db, Issue
+from services.export_service import export_filters
+from services.storage import read_session
+
+
+# ----------------------------------------------------
+# Full-text issue search (SQLite FTS5)
+# ----------------------------------------------------
+
+# issue_fts is an external-content FTS5 index over the complaint text,
+# location and subcategory of the issue table: it stores only the
+# inverted index and reads documents back from issue by rowid. Triggers
+# keep it in step with every insert, delete and text edit, including the
+# bulk INSERTs of the importer; status changes don't touch it.
+#
+# Ranking every match of a common word ("garbage") costs time linear in
+# the matches, so the search walks the index newest first, stops after
+# SEARCH_CANDIDATES issues that pass the filters, and ranks those by bm25
+# (location hits above subcategory above body text). Queries with fewer
+# matches are ranked exactly. Stopwords are dropped from the query: bm25
+# reads the whole posting list of every term once per query.
+#
+# On databases without FTS5 the search falls back to a LIKE scan, newest
+# first.
+
+SEARCH_TABLE = "issue_fts"
+
+# bm25 weights, in column order
+SEARCH_WEIGHTS = (1.0, 4.0, 2.0)
+
+SEARCH_CANDIDATES = 500
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+MAX_SEARCH_OFFSET = SEARCH_CANDIDATES
+
+STOPWORDS = frozenset(
+    "a an and are at be by for from has have in is it near of on or the "
+    "there this to was with ka ke ki ko hai hain mein se".split()
+)
+
+# words match whole; "drain*" matches as a prefix, backed by 2 and 3
+# letter prefix indexes
+_FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        original_text, location, subcategory,
+        content='issue', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS issue_fts_ai AFTER INSERT ON issue BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, original_text, location, subcategory)
+        VALUES (new.id, new.original_text, new.location, new.subcategory);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS issue_fts_ad AFTER DELETE ON issue BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, original_text, location, subcategory)
+        VALUES ('delete', old.id, old.original_text, old.location, old.subcategory);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS issue_fts_au
+        AFTER UPDATE OF original_text, location, subcategory ON issue BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, original_text, location, subcategory)
+        VALUES ('delete', old.id, old.original_text, old.location, old.subcategory);
+        INSERT INTO {SEARCH_TABLE}(rowid, original_text, location, subcategory)
+        VALUES (new.id, new.original_text, new.location, new.subcategory);
+    END""",
+]
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_TERM = re.compile(r"(\w+)(\*?)", re.UNICODE)
+
+_fts = {"enabled": False}
+
+
+class SearchError(ValueError):
+    pass
+
+
+def ensure_search_index():
+
+    # creates the index and triggers once; an existing issue table is
+    # indexed in the same transaction
+    if db.engine.dialect.name != "sqlite":
+        return False
+
+    # workers boot together; check and create under the write lock
+    with db.engine.connect() as conn, \
+            conn.execution_options(sqlite_begin="IMMEDIATE").begin():
+
+        options = {row[0] for row in conn.exec_driver_sql("PRAGMA compile_options")}
+
+        if "ENABLE_FTS5" not in options:
+            return False
+
+        exists = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE name = ?", (SEARCH_TABLE,)
+        ).first()
+
+        for ddl in _FTS_DDL:
+            conn.exec_driver_sql(ddl)
+
+        if not exists:
+            conn.exec_driver_sql(
+                f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"
+            )
+
+    _fts["enabled"] = True
+
+    return True
+
+
+def rebuild_search_index():
+
+    with db.engine.begin() as conn:
+        conn.exec_driver_sql(
+            f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"
+        )
+        conn.exec_driver_sql(
+            f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')"
+        )
+
+
+def match_expression(text):
+
+    # user input never reaches the FTS5 query parser: every word becomes a
+    # quoted phrase and all of them must match
+    terms = _TERM.findall(text or "")
+
+    if not terms:
+        raise SearchError("q must contain at least one word")
+
+    # a query made only of stopwords is kept as typed
+    terms = [t for t in terms if t[0].lower() not in STOPWORDS] or terms
+
+    return " ".join(f'"{word}"{star}' for word, star in terms)
+
+
+def _limits(limit, offset):
+
+    try:
+        limit = int(limit) if limit not in (None, "") else DEFAULT_SEARCH_LIMIT
+        offset = int(offset) if offset not in (None, "") else 0
+    except ValueError:
+        raise SearchError("limit and offset must be integers")
+
+    if offset < 0 or offset > MAX_SEARCH_OFFSET:
+        raise SearchError(f"offset must be between 0 and {MAX_SEARCH_OFFSET}")
+
+    return max(1, min(limit, MAX_SEARCH_LIMIT)), offset
+
+
+def search_issues(q, status=None, category=None, since=None, until=None,
+                  limit=None, offset=None):
+
+    limit, offset = _limits(limit, offset)
+
+    try:
+        conditions = export_filters(
+            category=category, status=status, since=since, until=until
+        )
+    except ValueError as e:
+        raise SearchError(str(e))
+
+    if not _fts["enabled"]:
+        return _search_like(q, conditions, limit, offset)
+
+    fts = db.table(SEARCH_TABLE, db.column("rowid"))
+    fts_ref = db.literal_column(SEARCH_TABLE)
+
+    # newest matching issues first; FTS5 walks its rowid-ordered posting
+    # lists backwards and stops at the limit
+    candidates = db.select(
+        fts.c.rowid.label("id"),
+        db.func.bm25(fts_ref, *SEARCH_WEIGHTS).label("score")
+    )\
+        .select_from(fts)\
+        .join(Issue, Issue.id == fts.c.rowid)\
+        .where(fts_ref.op("MATCH")(match_expression(q)), *conditions)\
+        .order_by(fts.c.rowid.desc())\
+        .limit(SEARCH_CANDIDATES)\
+        .subquery()
+
+    stmt = db.select(Issue, candidates.c.score)\
+        .join(candidates, Issue.id == candidates.c.id)\
+        .order_by(candidates.c.score, Issue.id.desc())\
+        .limit(limit)\
+        .offset(offset)
+
+    with read_session() as reader:
+        rows = reader.execute(stmt).all()
+
+        return [
+            dict(issue.to_dict(), created_at=_iso(issue.created_at), score=round(-s, 4))
+            for issue, s in rows
+        ]
+
+
+def _search_like(q, conditions, limit, offset):
+
+    words = _WORD.findall(q or "")
+
+    if not words:
+        raise SearchError("q must contain at least one word")
+
+    for word in words:
+        pattern = f"%{word}%"
+        conditions.append(db.or_(
+            Issue.original_text.ilike(pattern),
+            Issue.location.ilike(pattern),
+            Issue.subcategory.ilike(pattern)
+        ))
+
+    with read_session() as reader:
+        issues = reader.query(Issue)\
+            .filter(*conditions)\
+            .order_by(Issue.created_at.desc(), Issue.id.desc())\
+            .limit(limit)\
+            .offset(offset)\
+            .all()
+
+        return [
+            dict(issue.to_dict(), created_at=_iso(issue.created_at), score=None)
+            for issue in issues
+        ]
+
+
+def _iso(value):
+
+    return value.isoformat() if value else None
@@ -0,0 +1,185 @@
+import os
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from models import db
+
+
+# ----------------------------------------------------
+# Storage profiles
+# ----------------------------------------------------
+
+# The "production" profile runs SQLite in WAL mode so readers never block
+# the writer, trades the per-commit fsync for one per checkpoint
+# (synchronous=NORMAL: a power cut can lose the last commits, never
+# corrupt the file), memory-maps the database and makes a busy writer wait
+# instead of failing. Write endpoints take the write lock when their
+# transaction begins (BEGIN IMMEDIATE): a deferred transaction that read
+# first and tries to write after another worker committed cannot wait for
+# the lock, it fails with "database is locked" straight away.
+#
+# Writers inside one worker also queue on a process-local gate, so only one
+# thread per worker sits in SQLite's busy handler. The handler polls with
+# growing sleeps, and a crowd of pollers mostly sleeps through the moments
+# the lock is free.
+#
+# Analytics endpoints read through their own pool ("analytics" bind) whose
+# connections are query_only, so slow aggregate scans never hold a
+# connection the write endpoints need. ANALYTICS_DATABASE_URL can point it
+# at a replica.
+#
+# "default" keeps the driver defaults (rollback journal, full sync).
+
+STORAGE_PROFILES = {
+    "default": {},
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+        "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+        "cache_size": -int(os.environ.get("SQLITE_CACHE_KB", 16 * 1024)),
+        "temp_store": "MEMORY"
+    }
+}
+
+DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///db.sqlite")
+ANALYTICS_DATABASE_URL = os.environ.get("ANALYTICS_DATABASE_URL", DATABASE_URL)
+DB_PROFILE = os.environ.get("DB_PROFILE", "production")
+
+# per worker process; SQLite has one writer at a time anyway, so a few
+# connections are enough and the rest of a burst queues in the pool
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 8))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 8))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", 10))
+ANALYTICS_POOL_SIZE = int(os.environ.get("ANALYTICS_POOL_SIZE", 4))
+
+_write_gate = threading.Lock()
+
+
+def _is_sqlite(url):
+
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def storage_config(profile=DB_PROFILE, url=DATABASE_URL, analytics_url=ANALYTICS_DATABASE_URL):
+
+    if profile not in STORAGE_PROFILES:
+        raise ValueError(f"unknown DB_PROFILE {profile!r}")
+
+    config = {
+        "SQLALCHEMY_DATABASE_URI": url,
+        "DB_PROFILE": profile
+    }
+
+    if profile == "default":
+        return config
+
+    options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT
+    }
+
+    if _is_sqlite(url):
+        # the driver's own busy handler, in seconds
+        options["connect_args"] = {
+            "timeout": STORAGE_PROFILES[profile]["busy_timeout"] / 1000
+        }
+
+    config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+    config["SQLALCHEMY_BINDS"] = {
+        "analytics": {
+            **options,
+            "url": analytics_url,
+            "pool_size": ANALYTICS_POOL_SIZE
+        }
+    }
+
+    return config
+
+
+def _pragmas_on_connect(pragmas, read_only):
+
+    def connect(dbapi_connection, connection_record):
+
+        # SQLAlchemy's begin event issues BEGIN, not the driver
+        dbapi_connection.isolation_level = None
+
+        cursor = dbapi_connection.cursor()
+
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+
+        cursor.close()
+
+    return connect
+
+
+def _begin(conn):
+
+    mode = conn.get_execution_options().get("sqlite_begin", "DEFERRED")
+    conn.exec_driver_sql(f"BEGIN {mode}")
+
+
+def install_profile(app):
+
+    # call after db.init_app(app); engines exist but have not connected yet.
+    # Transaction control is installed for every profile, so begin_write()
+    # and the boot migration get BEGIN IMMEDIATE under "default" too
+    pragmas = STORAGE_PROFILES[app.config.get("DB_PROFILE", "default")]
+
+    with app.app_context():
+
+        for key, engine in db.engines.items():
+
+            if engine.dialect.name != "sqlite":
+                continue
+
+            event.listen(engine, "connect", _pragmas_on_connect(pragmas, key == "analytics"))
+            event.listen(engine, "begin", _begin)
+
+
+def begin_write():
+
+    # start the request's transaction holding the write lock; a no-op on
+    # other databases (their writers lock rows, not the file) or if the
+    # transaction has already begun
+    session = db.session()
+
+    if session.in_transaction() or session.get_bind().dialect.name != "sqlite":
+        return
+
+    if not _write_gate.acquire(timeout=DB_POOL_TIMEOUT):
+        raise TimeoutError("timed out waiting for the write gate")
+
+    session.info["write_gate"] = True
+
+    try:
+        session.connection(execution_options={"sqlite_begin": "IMMEDIATE"})
+    except Exception:
+        _release_gate(session, None)
+        raise
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _release_gate(session, transaction):
+
+    # commit, rollback or close of the outermost transaction
+    if transaction is not None and transaction.parent is not None:
+        return
+
+    if session.info.pop("write_gate", False):
+        _write_gate.release()
+
+
+def read_session():
+
+    # use as `with read_session() as s:`; falls back to the primary engine
+    # when the profile has no analytics pool
+    return Session(db.engines.get("analytics", db.engine))
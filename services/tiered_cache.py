@@ -0,0 +1,169 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+# ----------------------------------------------------
+# Two-tier (memory LRU + SQLite) TTL cache
+# ----------------------------------------------------
+
+# Each cache owns one table in a small SQLite file, separate from the app
+# database so cache writes never join a request's transaction.
+
+class TieredCache:
+
+    def __init__(self, path, table, ttl, negative_ttl=0, max_memory=4096,
+                 key_column="cache_key", value_column="value"):
+
+        self.path = path
+        self.table = table
+        self.key_column = key_column
+        self.value_column = value_column
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_memory = max_memory
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._writes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+
+    def _db(self):
+
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                f" {self.key_column} TEXT PRIMARY KEY,"
+                f" {self.value_column} TEXT,"
+                " expires_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+        return self._conn
+
+    def warm_up(self):
+
+        with self._lock:
+            try:
+                self._db()
+            except sqlite3.Error:
+                pass
+
+    def get(self, key):
+
+        now = time.time()
+
+        with self._lock:
+
+            entry = self._memory.get(key)
+
+            if entry is None:
+                try:
+                    row = self._db().execute(
+                        f"SELECT {self.value_column}, expires_at FROM {self.table}"
+                        f" WHERE {self.key_column} = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error:
+                    row = None
+
+                if row:
+                    entry = (row[0], row[1])
+                    self._remember(key, entry)
+
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    self._memory.pop(key, None)
+                self.misses += 1
+                return False, None
+
+            self._memory.move_to_end(key)
+
+            if entry[0] is None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+
+            return True, entry[0]
+
+    def put(self, key, value):
+
+        self.put_many([(key, value)])
+
+    def put_many(self, items):
+
+        now = time.time()
+        rows = []
+
+        for key, value in items:
+
+            # falsy values are negative entries; they are skipped when the
+            # cache has no negative TTL
+            ttl = self.ttl if value else self.negative_ttl
+
+            if ttl > 0:
+                rows.append((key, value or None, now + ttl))
+
+        if not rows:
+            return
+
+        with self._lock:
+
+            for key, value, expires_at in rows:
+                self._remember(key, (value, expires_at))
+
+            try:
+                conn = self._db()
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {self.table}"
+                    f" ({self.key_column}, {self.value_column}, expires_at)"
+                    " VALUES (?, ?, ?)",
+                    rows
+                )
+
+                # purge expired rows every ~256 writes
+                if self._writes // 256 != (self._writes + len(rows)) // 256:
+                    conn.execute(
+                        f"DELETE FROM {self.table} WHERE expires_at <= ?",
+                        (now,)
+                    )
+
+                self._writes += len(rows)
+
+                conn.commit()
+            except sqlite3.Error:
+                pass
+
+    def _remember(self, key, entry):
+
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+
+        while len(self._memory) > self.max_memory:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+
+        with self._lock:
+            self._memory.clear()
+            try:
+                self._db().execute(f"DELETE FROM {self.table}")
+                self._db().commit()
+            except sqlite3.Error:
+                pass
+
+            self.hits = self.misses = self.negative_hits = 0
+
+    def stats(self):
+
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory)
+        }
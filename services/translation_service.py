@@ -0,0 +1,135 @@
+import hashlib
+import os
+
+from services.tiered_cache import TieredCache
+
+
+# ----------------------------------------------------
+# Translation to English (cached, batchable)
+# ----------------------------------------------------
+
+CACHE_PATH = os.environ.get("TRANSLATION_CACHE_PATH", "translation_cache.sqlite")
+CACHE_TTL = int(os.environ.get("TRANSLATION_CACHE_TTL", 30 * 24 * 3600))
+MEMORY_SIZE = int(os.environ.get("TRANSLATION_CACHE_SIZE", 8192))
+
+
+class GoogleTranslateBackend:
+
+    def __init__(self):
+        self._translator = None
+
+    def warm_up(self):
+
+        # googletrans is imported on first use; constructing a Translator
+        # opens an HTTP client
+        if self._translator is None:
+            from googletrans import Translator
+            self._translator = Translator()
+
+    def translate_batch(self, texts):
+
+        self.warm_up()
+
+        try:
+            results = self._translator.translate(list(texts), dest="en")
+            return [r.text for r in results]
+        except Exception:
+            pass
+
+        translated = []
+
+        for text in texts:
+            try:
+                translated.append(self._translator.translate(text, dest="en").text)
+            except Exception:
+                translated.append(None)
+
+        return translated
+
+
+class StubTranslateBackend:
+
+    # stands in for the network translator in tests and benchmarks
+    def __init__(self, translate=None):
+        self.translate = translate or (lambda text: text)
+        self.calls = 0
+
+    def translate_batch(self, texts):
+        self.calls += 1
+        return [self.translate(t) for t in texts]
+
+
+_backend = GoogleTranslateBackend()
+
+translation_cache = TieredCache(
+    CACHE_PATH, "translation_cache", CACHE_TTL, max_memory=MEMORY_SIZE
+)
+
+
+def set_translation_backend(backend):
+
+    global _backend
+    _backend = backend
+
+
+def warm_up():
+
+    translation_cache.warm_up()
+
+    if hasattr(_backend, "warm_up"):
+        _backend.warm_up()
+
+
+def _cache_key(text):
+
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def translate_many(texts):
+
+    results = [None] * len(texts)
+    missing = {}
+
+    for i, text in enumerate(texts):
+
+        if not text:
+            results[i] = text
+            continue
+
+        key = _cache_key(text)
+        found, value = translation_cache.get(key)
+
+        if found:
+            results[i] = value
+        else:
+            missing.setdefault(key, (text, []))[1].append(i)
+
+    if missing:
+        pending = list(missing.values())
+
+        try:
+            translated = _backend.translate_batch([text for text, _ in pending])
+        except Exception:
+            translated = []
+
+        translated = list(translated) + [None] * (len(pending) - len(translated))
+
+        fresh = []
+
+        for (key, (text, slots)), value in zip(missing.items(), translated):
+
+            # failures fall back to the original text and are not cached
+            if value:
+                fresh.append((key, value))
+
+            for i in slots:
+                results[i] = value or text
+
+        translation_cache.put_many(fresh)
+
+    return results
+
+
+def translate_to_english(text):
+
+    return translate_many([text])[0]
@@ -0,0 +1,119 @@
+import atexit
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+# app.py and the services read their paths from the environment at import
+# time, so point everything at a scratch directory before importing them
+_TMP = tempfile.mkdtemp(prefix="avin-tests-")
+atexit.register(shutil.rmtree, _TMP, ignore_errors=True)
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_TMP}/db.sqlite")
+os.environ.setdefault("GEOCODE_CACHE_PATH", os.path.join(_TMP, "geocode_cache.sqlite"))
+os.environ.setdefault("TRANSLATION_CACHE_PATH", os.path.join(_TMP, "translation_cache.sqlite"))
+os.environ.setdefault("LOCAL_CHAIN_PATH", os.path.join(_TMP, "local_chain.sqlite"))
+
+
+
+# ---------------- stub Nominatim ----------------
+
+# answers /reverse like Nominatim: a suburb named after the coordinates,
+# or a 500 for latitudes in FAILING_LATITUDES
+class StubNominatim(BaseHTTPRequestHandler):
+
+    requests = []
+    failing_latitudes = set()
+
+    def do_GET(self):
+
+        query = parse_qs(urlparse(self.path).query)
+        lat, lng = query["lat"][0], query["lon"][0]
+
+        StubNominatim.requests.append((lat, lng))
+
+        if int(float(lat)) in StubNominatim.failing_latitudes:
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        body = json.dumps({"address": {"suburb": f"Stub {lat},{lng}"}}).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+_nominatim = ThreadingHTTPServer(("127.0.0.1", 0), StubNominatim)
+threading.Thread(target=_nominatim.serve_forever, daemon=True).start()
+
+os.environ["NOMINATIM_URL"] = f"http://127.0.0.1:{_nominatim.server_port}/reverse"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def tmp_root():
+    return _TMP
+
+
+@pytest.fixture
+def nominatim():
+
+    StubNominatim.requests.clear()
+    StubNominatim.failing_latitudes.clear()
+
+    return StubNominatim
+
+
+@pytest.fixture(scope="session")
+def app():
+
+    import app as app_module
+
+    app_module.init_db()
+
+    return app_module.app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+
+    from models import db, User
+
+    def make(email=None, credits=0):
+
+        email = email or f"{uuid.uuid4().hex[:12]}@example.com"
+
+        with app.app_context():
+            user = User(name=email.split("@")[0], email=email, password="pw",
+                        credits=credits)
+            db.session.add(user)
+            db.session.commit()
+            return user.id
+
+    return make
+
+
+def login(client, user_id, officer=False):
+
+    with client.session_transaction() as s:
+        s["user_id"] = user_id
+        s["is_officer"] = officer
@@ -0,0 +1,111 @@
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy.exc import OperationalError
+
+from conftest import login
+from models import db, CreditAward, Issue, User
+from services.credits_service import award_credits, reward_for
+from services.storage import begin_write
+
+THREADS = 8
+AWARDS_PER_THREAD = 50
+
+
+def _balance(app, user_id):
+
+    with app.app_context():
+        credits = db.session.get(User, user_id).credits
+        awarded = db.session.query(db.func.sum(CreditAward.amount))\
+            .filter(CreditAward.user_id == user_id).scalar()
+        return credits, awarded
+
+
+def _award_with_retry(key, user_id):
+
+    while True:
+        try:
+            begin_write()
+            award_credits(user_id, 3, key)
+            db.session.commit()
+            return
+        except OperationalError:
+            # lock wait ran out; a real request would surface a 500
+            db.session.rollback()
+            time.sleep(0.01)
+
+
+def test_concurrent_awards_lose_no_updates(app, make_user):
+
+    uid = make_user()
+    errors = []
+
+    def worker(n):
+        with app.app_context():
+            try:
+                for i in range(AWARDS_PER_THREAD):
+                    key = f"test:{uid}:{n}:{i}"
+                    # every award submitted twice, like a retried request
+                    _award_with_retry(key, uid)
+                    _award_with_retry(key, uid)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.session.remove()
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(THREADS)]
+
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    credits, awarded = _balance(app, uid)
+    total = THREADS * AWARDS_PER_THREAD
+
+    print(f"\n{2 * total} award calls in {elapsed:.2f}s "
+          f"({2 * total / elapsed:.0f}/s), {total} distinct")
+
+    assert not errors
+    assert credits == awarded == 3 * total
+
+
+def test_officers_resolving_together_credit_each_issue_once(app, make_user):
+
+    citizen = make_user()
+    officers = [make_user(f"resolver{n}@delhi.gov.in") for n in range(4)]
+
+    with app.app_context():
+        issues = [
+            Issue(user_id=citizen, original_text="broken pipe", category="Water",
+                  location="Creditpur", status="SUBMITTED", created_at=datetime.utcnow())
+            for _ in range(25)
+        ]
+        db.session.add_all(issues)
+        db.session.commit()
+        ids = [i.id for i in issues]
+
+    statuses = []
+
+    def officer(officer_id):
+        client = app.test_client()
+        login(client, officer_id, officer=True)
+
+        for issue_id in ids:
+            resp = client.post(f"/api/officer/issue/{issue_id}/update",
+                               json={"status": "RESOLVED"})
+            statuses.append(resp.status_code)
+
+    threads = [threading.Thread(target=officer, args=(o,)) for o in officers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    credits, awarded = _balance(app, citizen)
+
+    assert set(statuses) == {200}
+    assert credits == awarded == len(ids) * reward_for("Water")
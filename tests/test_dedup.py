@@ -0,0 +1,165 @@
+import json
+import uuid
+from datetime import datetime, timedelta
+
+from conftest import login
+
+
+def _report(client, text, location):
+
+    res = client.post("/api/issue/report", json={
+        "description": text,
+        "category": "waste",
+        "subcategory": "garbage dump",
+        "location": location
+    })
+    assert res.status_code == 200
+
+    return res.get_json()
+
+
+# ---------------- open statuses ----------------
+
+def test_repeat_of_inspected_issue_links_to_it(app, client, make_user):
+
+    location = f"Dedup {uuid.uuid4().hex[:8]}"
+    text = "Garbage dumped next to the park gate, nobody has cleared it for days"
+
+    login(client, make_user())
+    first = _report(client, text, location)
+    assert first["duplicate_of"] is None
+
+    officer = app.test_client()
+    login(officer, make_user(), officer=True)
+
+    for status in ("INSPECTED", "IN_PROGRESS"):
+        officer.post(f"/api/officer/issue/{first['issue_id']}/update",
+                     json={"status": status})
+
+        repeat = _report(client, text + " again", location)
+        assert repeat["duplicate_of"] == first["issue_id"]
+        assert repeat["missions"] == []
+
+    officer.post(f"/api/officer/issue/{first['issue_id']}/update",
+                 json={"status": "RESOLVED"})
+
+    # a resolved issue is not reopened by a repeat
+    assert _report(client, text, location)["duplicate_of"] is None
+
+
+# ---------------- imports and pruning ----------------
+
+def _buckets(app, issue_id):
+
+    from models import db, DedupBucket, Issue
+
+    with app.app_context():
+        rows = DedupBucket.query.filter_by(issue_id=issue_id).count()
+        flag = db.session.get(Issue, issue_id).dedup_indexed
+        db.session.remove()
+
+    return rows, flag
+
+
+def test_imported_issues_are_indexed_after_the_import(app, client, make_user):
+
+    from models import db, Issue
+    from services.dedup_service import DEDUP_BANDS, index_pending
+
+    location = f"Dedup {uuid.uuid4().hex[:8]}"
+    text = "Streetlight outside the community hall has been dead for a month"
+
+    officer = app.test_client()
+    login(officer, make_user(), officer=True)
+
+    res = officer.post(
+        "/api/officer/import?format=jsonl",
+        data=json.dumps({"description": text, "category": "electricity",
+                         "subcategory": "streetlight", "location": location}),
+        content_type="application/x-ndjson"
+    )
+    assert res.get_json()["imported"] == 1
+
+    with app.app_context():
+        imported = db.session.query(db.func.max(Issue.id)).scalar()
+
+    # the import commits without building buckets
+    assert _buckets(app, imported) == (0, False)
+
+    with app.app_context():
+        index_pending()
+        db.session.remove()
+
+    assert _buckets(app, imported) == (DEDUP_BANDS, True)
+
+    login(client, make_user())
+    res = client.post("/api/issue/report", json={
+        "description": text, "category": "electricity",
+        "subcategory": "streetlight", "location": location
+    })
+    assert res.get_json()["duplicate_of"] == imported
+
+
+def test_import_accepts_timestamps_with_offsets(app, make_user):
+
+    from models import db, Issue
+
+    officer = app.test_client()
+    login(officer, make_user(), officer=True)
+
+    recent = datetime.utcnow() - timedelta(days=1)
+    stamps = [
+        recent.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        (recent + timedelta(hours=5, minutes=30)).strftime("%Y-%m-%dT%H:%M:%S+05:30"),
+        (recent - timedelta(days=60)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    ]
+
+    res = officer.post(
+        "/api/officer/import?format=jsonl",
+        data="\n".join(
+            json.dumps({"description": f"Pothole on the main road {uuid.uuid4().hex}",
+                        "location": "Offset Nagar", "created_at": stamp})
+            for stamp in stamps
+        ),
+        content_type="application/x-ndjson"
+    )
+    assert res.status_code == 200
+    assert res.get_json()["imported"] == 3
+
+    with app.app_context():
+        flags = [
+            flag for flag, in db.session.query(Issue.dedup_indexed)
+            .order_by(Issue.id.desc()).limit(3)
+        ][::-1]
+        db.session.remove()
+
+    # recent rows wait for the index pass, the old one is out of the window
+    assert flags == [False, False, None]
+
+
+def test_prune_drops_buckets_of_closed_and_old_issues(app, client, make_user):
+
+    from models import db, Issue
+    from services.dedup_service import DEDUP_BANDS, DEDUP_WINDOW_DAYS, prune_dedup_index
+
+    login(client, make_user())
+
+    ids = [
+        _report(client, f"Overflowing drain {n} flooding the lane {uuid.uuid4().hex}",
+                f"Dedup {uuid.uuid4().hex[:8]}")["issue_id"]
+        for n in range(3)
+    ]
+    resolved, old, open_ = ids
+
+    with app.app_context():
+        db.session.get(Issue, resolved).status = "RESOLVED"
+        db.session.get(Issue, old).created_at = \
+            datetime.utcnow() - timedelta(days=DEDUP_WINDOW_DAYS + 1)
+        db.session.commit()
+
+        assert prune_dedup_index() >= 2
+        db.session.remove()
+
+    assert _buckets(app, resolved) == (0, None)
+    assert _buckets(app, old) == (0, None)
+    assert _buckets(app, open_) == (DEDUP_BANDS, True)
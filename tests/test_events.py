@@ -0,0 +1,222 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+import uuid
+
+import pytest
+
+from conftest import login
+
+
+def _first_event(client, since, kind):
+
+    res = client.get("/api/events", headers={"Last-Event-ID": str(since)})
+    assert res.status_code == 200
+
+    # the replay comes first; the live part of the stream never ends
+    try:
+        for chunk in res.response:
+            chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+            if f"event: {kind}\n" in chunk:
+                data = chunk.split("data: ", 1)[1].strip()
+                return json.loads(data)
+    finally:
+        res.close()
+
+
+def test_citizens_get_public_fields_officers_get_the_row(app, client, make_user):
+
+    from models import db
+    from services.event_service import latest_event_id
+
+    with app.app_context():
+        since = latest_event_id()
+        db.session.remove()
+
+    text = f"Broken streetlight outside gate {uuid.uuid4().hex}"
+
+    login(client, make_user())
+    client.post("/api/issue/report", json={
+        "description": text,
+        "category": "electricity",
+        "subcategory": "streetlight",
+        "location": "Event Nagar",
+        "browser_location": {"lat": 28.61, "lng": 77.21}
+    })
+
+    citizen = _first_event(client, since, "issue.created")
+    assert citizen == {"location": "Event Nagar", "category": "electricity"}
+
+    officer = app.test_client()
+    login(officer, make_user(), officer=True)
+
+    full = _first_event(officer, since, "issue.created")
+    assert full["text"] == text
+    assert (full["lat"], full["lng"]) == (28.61, 77.21)
+
+
+def test_citizens_do_not_get_issue_updates(app, client, make_user):
+
+    from models import db
+    from services.event_service import events_since, latest_event_id, stream_events
+    import queue
+
+    with app.app_context():
+        since = latest_event_id()
+
+    officer = app.test_client()
+    login(officer, make_user(), officer=True)
+
+    login(client, make_user())
+    issue_id = client.post("/api/issue/report", json={
+        "description": f"Pothole {uuid.uuid4().hex}", "location": "Event Nagar"
+    }).get_json()["issue_id"]
+
+    officer.post(f"/api/officer/issue/{issue_id}/update", json={"status": "INSPECTED"})
+
+    with app.app_context():
+        replay = events_since(since)
+        db.session.remove()
+
+    def kinds(officer):
+
+        # a closed stream: the replay, then the end-of-stream marker
+        done = queue.Queue()
+        done.put(None)
+
+        return [
+            line.split(": ", 1)[1]
+            for chunk in stream_events(done, replay, since, officer=officer)
+            for line in chunk.splitlines() if line.startswith("event: ")
+        ]
+
+    assert "issue.updated" in kinds(True)
+    assert "issue.updated" not in kinds(False)
+    assert "issue.created" in kinds(False)
+
+
+# ---------------- event relay ----------------
+
+IDLE_STREAMS = 200
+
+
+@pytest.fixture
+def relay(app):
+
+    import app as app_module
+    from services.event_relay import EventRelay
+
+    loop = asyncio.new_event_loop()
+    relay = EventRelay(app, app_module.event_relay_user)
+    server = loop.run_until_complete(relay.start("127.0.0.1", 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    relay.port = server.sockets[0].getsockname()[1]
+
+    yield relay
+
+    async def shutdown():
+        server.close()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run_coroutine_threadsafe(shutdown(), loop).result(10)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def _open(relay, app, user_id=None, officer=False):
+
+    sock = socket.create_connection(("127.0.0.1", relay.port), timeout=10)
+    cookie = ""
+
+    if user_id is not None:
+        value = app.session_interface.get_signing_serializer(app)\
+            .dumps({"user_id": user_id, "is_officer": officer})
+        cookie = f"Cookie: session={value}\r\n"
+
+    sock.sendall(f"GET /api/events HTTP/1.1\r\nHost: x\r\n{cookie}\r\n".encode())
+
+    return sock
+
+
+def _read_until(sock, marker):
+
+    data = b""
+    while marker not in data:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+
+    return data.decode()
+
+
+def _read_event(sock, kind):
+
+    # the frame of the first `kind` event on the stream
+    data = b""
+    marker = f"event: {kind}\n".encode()
+
+    while marker not in data or b"\n\n" not in data.split(marker, 1)[1]:
+        chunk = sock.recv(65536)
+        assert chunk, "stream closed"
+        data += chunk
+
+    frame = data.split(marker, 1)[1].split(b"\n\n", 1)[0]
+
+    return json.loads(frame.decode().split("data: ", 1)[1])
+
+
+def test_relay_holds_idle_streams_without_threads(app, client, make_user, relay):
+
+    threads = threading.active_count()
+    citizen = make_user()
+
+    idle = [_open(relay, app, citizen) for _ in range(IDLE_STREAMS)]
+    for sock in idle:
+        assert _read_until(sock, b"\r\n\r\n").startswith("HTTP/1.1 200")
+
+    officer = _open(relay, app, make_user(), officer=True)
+    _read_until(officer, b"\r\n\r\n")
+
+    deadline = time.time() + 10
+    while relay.subscriber_count() < IDLE_STREAMS + 1 and time.time() < deadline:
+        time.sleep(0.05)
+
+    assert relay.subscriber_count() == IDLE_STREAMS + 1
+    # the relay's database pool, nothing per client
+    assert threading.active_count() - threads <= 2
+
+    text = f"Overflowing drain near gate {uuid.uuid4().hex}"
+    login(client, citizen)
+    client.post("/api/issue/report", json={
+        "description": text, "category": "water", "location": "Relay Nagar"
+    })
+
+    assert _read_event(idle[-1], "issue.created") == {
+        "location": "Relay Nagar", "category": "water"
+    }
+    assert _read_event(officer, "issue.created")["text"] == text
+
+    for sock in idle + [officer]:
+        sock.close()
+
+
+def test_relay_rejects_missing_or_forged_sessions(app, make_user, relay):
+
+    anonymous = _open(relay, app)
+    assert _read_until(anonymous, b"\r\n\r\n").startswith("HTTP/1.1 401")
+
+    forged = socket.create_connection(("127.0.0.1", relay.port), timeout=10)
+    forged.sendall(b"GET /api/events HTTP/1.1\r\nCookie: session=eyJ1c2VyX2lkIjoxfQ.x.y\r\n\r\n")
+    assert _read_until(forged, b"\r\n\r\n").startswith("HTTP/1.1 401")
+
+    for sock in (anonymous, forged):
+        sock.close()
@@ -0,0 +1,126 @@
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timedelta
+from functools import partial
+
+import app as app_module
+from conftest import login
+from models import db, Issue, Mission, LedgerEntry
+from services.export_service import export_issues
+from services.pagination import STREAM_BATCH_SIZE
+
+
+def _insert_issues(app, location, count, same_second_every=1):
+
+    start = datetime(2026, 3, 1)
+
+    with app.app_context():
+        db.session.execute(Issue.__table__.insert(), [
+            {
+                "user_id": 1,
+                "original_text": f"export row {i}",
+                "category": "Garbage",
+                "location": location,
+                "status": "Reported",
+                "created_at": start + timedelta(seconds=i // same_second_every)
+            }
+            for i in range(count)
+        ])
+        db.session.commit()
+
+        return [i for (i,) in db.session.query(Issue.id)
+                .filter_by(location=location).order_by(Issue.id)]
+
+
+def _officer(client, make_user):
+
+    uid = make_user(f"{uuid.uuid4().hex[:8]}@delhi.gov.in")
+    login(client, uid, officer=True)
+
+
+# ---------------- CSV export ----------------
+
+def test_csv_export_streams_every_issue_once_in_id_order(app, client, make_user,
+                                                         monkeypatch):
+
+    location = f"Exportpur {uuid.uuid4().hex[:6]}"
+    ids = _insert_issues(app, location, 23)
+
+    # one issue with a mission and two ledger entries: one row per entry
+    with app.app_context():
+        mission = Mission(issue_id=ids[3], user_id=1, status="completed")
+        db.session.add(mission)
+        db.session.flush()
+        db.session.add_all([
+            LedgerEntry(user_id=1, mission_id=mission.id, category="Garbage",
+                        timestamp=datetime(2026, 3, 2), entry_hash=uuid.uuid4().hex)
+            for _ in range(2)
+        ])
+        db.session.commit()
+
+    monkeypatch.setattr(app_module, "export_issues", partial(export_issues, batch_size=5))
+    _officer(client, make_user)
+
+    resp = client.get(f"/api/officer/export?location={location}", buffered=False)
+    assert resp.status_code == 200
+
+    chunks = list(resp.response)
+    rows = list(csv.DictReader(io.StringIO("".join(
+        c.decode() if isinstance(c, bytes) else c for c in chunks
+    ))))
+
+    # 23 issues in batches of 5, written out batch by batch
+    assert len(chunks) == 5
+    assert len(rows) == 24
+
+    exported = [int(r["issue_id"]) for r in rows]
+    assert exported == sorted(exported)
+    assert sorted(set(exported)) == ids
+    assert exported.count(ids[3]) == 2
+
+
+def test_export_is_officer_only(client, make_user):
+
+    assert client.get("/api/officer/export").status_code == 403
+
+    login(client, make_user())
+    assert client.get("/api/officer/export").status_code == 403
+
+
+# ---------------- JSON lines ----------------
+
+def test_ndjson_issue_stream_spans_batches_without_repeats(app, client, make_user):
+
+    location = f"Streamnagar {uuid.uuid4().hex[:6]}"
+    count = STREAM_BATCH_SIZE * 2 + 37
+    # several issues per second, so batches break inside ties
+    ids = _insert_issues(app, location, count, same_second_every=4)
+
+    _officer(client, make_user)
+
+    resp = client.get(f"/api/officer/issues?location={location}",
+                      headers={"Accept": "application/x-ndjson"})
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/x-ndjson"
+
+    streamed = [json.loads(line)["id"] for line in resp.data.decode().splitlines()]
+
+    # newest first on (created_at, id): ids fall strictly
+    assert len(streamed) == count
+    assert streamed == sorted(ids, reverse=True)
+
+
+def test_ndjson_issue_stream_is_officer_only(client, make_user):
+
+    headers = {"Accept": "application/x-ndjson"}
+
+    assert client.get("/api/officer/issues", headers=headers).status_code == 403
+
+    login(client, make_user())
+    assert client.get("/api/officer/issues", headers=headers).status_code == 403
+
+    # the session flag alone is not enough without a government address
+    login(client, make_user(), officer=True)
+    assert client.get("/api/officer/issues", headers=headers).status_code == 403
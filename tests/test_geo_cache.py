@@ -0,0 +1,112 @@
+import pytest
+
+import services.ai_service as ai_service
+import services.tiered_cache as tiered_cache
+from services.geo_cache import GeocodeCache
+
+
+# coordinates far from Delhi, so the offline grid finds nothing and the
+# lookup goes to the (stub) network
+LAT, LNG = 12.3451, 45.6781
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+
+    clock = Clock()
+    monkeypatch.setattr(tiered_cache, "time", clock)
+
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch, clock):
+
+    cache = GeocodeCache(path=str(tmp_path / "geo.sqlite"), ttl=3600,
+                         negative_ttl=60, max_memory=16)
+    monkeypatch.setattr(ai_service, "geocode_cache", cache)
+
+    return cache
+
+
+def test_stub_is_the_configured_nominatim(nominatim):
+
+    assert ai_service.NOMINATIM_URL.startswith("http://127.0.0.1:")
+
+
+def test_miss_then_hit_within_bucket(nominatim, cache):
+
+    assert ai_service.reverse_geocode(LAT, LNG) == f"Stub {LAT},{LNG}"
+    # ~20m away: same bucket, no second request
+    assert ai_service.reverse_geocode(LAT + 0.0002, LNG - 0.0002) == f"Stub {LAT},{LNG}"
+
+    assert len(nominatim.requests) == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_entries_expire_after_ttl(nominatim, cache, clock):
+
+    ai_service.reverse_geocode(LAT, LNG)
+
+    clock.now += 3599
+    ai_service.reverse_geocode(LAT, LNG)
+    assert len(nominatim.requests) == 1
+
+    clock.now += 2
+    ai_service.reverse_geocode(LAT, LNG)
+    assert len(nominatim.requests) == 2
+
+
+def test_failures_are_cached_for_the_negative_ttl(nominatim, cache, clock):
+
+    nominatim.failing_latitudes.add(12)
+
+    assert ai_service.reverse_geocode(LAT, LNG) is None
+    assert ai_service.reverse_geocode(LAT, LNG) is None
+
+    assert len(nominatim.requests) == 1
+    assert cache.stats()["negative_hits"] == 1
+
+    # the outage is over once the short negative TTL runs out
+    nominatim.failing_latitudes.clear()
+    clock.now += 61
+
+    assert ai_service.reverse_geocode(LAT, LNG) == f"Stub {LAT},{LNG}"
+    assert len(nominatim.requests) == 2
+
+
+def test_fresh_instance_reads_the_sqlite_tier(nominatim, cache, monkeypatch):
+
+    ai_service.reverse_geocode(LAT, LNG)
+
+    # a new process: empty memory tier, same file
+    fresh = GeocodeCache(path=cache.path, ttl=3600, negative_ttl=60)
+    monkeypatch.setattr(ai_service, "geocode_cache", fresh)
+
+    assert ai_service.reverse_geocode(LAT, LNG) == f"Stub {LAT},{LNG}"
+    assert len(nominatim.requests) == 1
+    assert fresh.stats() == {
+        "hits": 1, "negative_hits": 0, "misses": 0, "memory_entries": 1
+    }
+
+
+def test_memory_tier_is_bounded(nominatim, cache):
+
+    for i in range(40):
+        ai_service.reverse_geocode(LAT + i * 0.01, LNG)
+
+    assert cache.stats()["memory_entries"] == 16
+
+    # evicted from memory, still served from SQLite
+    ai_service.reverse_geocode(LAT, LNG)
+    assert len(nominatim.requests) == 40
@@ -0,0 +1,74 @@
+import json
+import uuid
+from datetime import datetime
+
+from conftest import login
+
+
+def _import(app, make_user, records):
+
+    from models import db, Issue
+
+    officer = app.test_client()
+    login(officer, make_user(), officer=True)
+
+    res = officer.post(
+        "/api/officer/import?format=jsonl",
+        data="\n".join(json.dumps(record) for record in records),
+        content_type="application/x-ndjson"
+    )
+    assert res.status_code == 200
+
+    stats = res.get_json()
+
+    with app.app_context():
+        issues = Issue.query.order_by(Issue.id.desc()).limit(stats["imported"]).all()[::-1]
+        db.session.expunge_all()
+        db.session.remove()
+
+    return stats, issues
+
+
+def _record(**fields):
+
+    return {
+        "description": f"Water logging outside the school {uuid.uuid4().hex}",
+        "location": "Import Nagar",
+        **fields
+    }
+
+
+def test_offset_timestamps_are_stored_as_naive_utc(app, make_user):
+
+    _, issues = _import(app, make_user, [
+        _record(created_at="2026-10-01T10:00:00+05:30"),
+        _record(created_at="2026-10-01T10:00:00Z"),
+        _record(created_at="2026-10-01T10:00:00"),
+    ])
+
+    assert [i.created_at for i in issues] == [
+        datetime(2026, 10, 1, 4, 30),
+        datetime(2026, 10, 1, 10, 0),
+        datetime(2026, 10, 1, 10, 0),
+    ]
+
+
+def test_records_with_invalid_coordinates_are_skipped(app, make_user):
+
+    good = _record(lat=28.61, lng=77.21)
+    stats, issues = _import(app, make_user, [
+        _record(lat="nan", lng=77.2),
+        _record(lat=28.6, lng="inf"),
+        _record(lat=200, lng=77.2),
+        _record(lat=28.6, lng=-181),
+        good,
+        _record(lat="", lng=""),
+    ])
+
+    assert (stats["imported"], stats["skipped"]) == (2, 4)
+
+    located, unlocated = issues
+    assert located.original_text == good["description"]
+    assert (located.lat, located.lng) == (28.61, 77.21)
+    assert located.geohash.startswith("ttnf")
+    assert (unlocated.lat, unlocated.lng, unlocated.geohash) == (None, None, None)
@@ -0,0 +1,50 @@
+import uuid
+
+from conftest import login
+from models import db, Issue
+from services.ingest_service import process_batch
+
+
+def _report(client, **extra):
+
+    return client.post("/api/issue/report", json={
+        "description": f"Garbage dumped near the park gate {uuid.uuid4().hex}",
+        "location": "Ingest Vihar",
+        **extra
+    })
+
+
+def test_async_flag_is_ignored_without_workers(app, client, make_user):
+
+    assert app.config["REPORT_INGEST_MODE"] == "sync"
+
+    login(client, make_user())
+    res = _report(client, **{"async": True})
+
+    # enriched inline, not left QUEUED for workers that never started
+    assert res.status_code == 200
+    assert res.get_json()["category"]
+
+    with app.app_context():
+        issue = db.session.get(Issue, res.get_json()["issue_id"])
+        assert issue.ingest_status == "DONE"
+        assert issue.severity is not None
+
+
+def test_async_mode_queues_for_the_workers(app, client, make_user, monkeypatch):
+
+    monkeypatch.setitem(app.config, "REPORT_INGEST_MODE", "async")
+
+    login(client, make_user())
+    res = _report(client)
+
+    assert res.status_code == 202
+    assert res.get_json()["ingest_status"] == "QUEUED"
+
+    with app.app_context():
+        while process_batch():
+            pass
+
+        issue = db.session.get(Issue, res.get_json()["issue_id"])
+        assert issue.ingest_status == "DONE"
+        assert issue.category is not None
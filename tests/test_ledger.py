@@ -0,0 +1,132 @@
+import shutil
+
+import pytest
+from flask import Flask
+
+from models import db, LedgerEntry, LedgerUserHead
+from services.ledger_service import add_ledger_entries, verify_ledger, verify_user_ledger
+from services.storage import begin_write
+
+ALICE, BOB = 1, 2
+
+
+def _ledger_app(path):
+
+    app = Flask("ledger")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{path}"
+    db.init_app(app)
+
+    return app
+
+
+@pytest.fixture(scope="module")
+def template(tmp_path_factory):
+
+    # a database of its own: the shared one holds raw rows other tests
+    # insert outside the chain. Built once, copied for every test
+    path = tmp_path_factory.mktemp("ledger") / "template.sqlite"
+    app = _ledger_app(path)
+    ids = []
+
+    with app.app_context():
+        db.create_all(bind_key=None)
+
+        for n in range(6):
+            begin_write()
+            ids += add_ledger_entries([(ALICE, n, "waste"), (BOB, n, "roads")])
+            db.session.commit()
+
+        db.session.remove()
+        db.engine.dispose()
+
+    return path, ids
+
+
+@pytest.fixture
+def ledger(template, tmp_path):
+
+    path, ids = template
+    copy = tmp_path / "ledger.sqlite"
+    shutil.copy(path, copy)
+
+    app = _ledger_app(copy)
+
+    with app.app_context():
+        yield ids
+
+        db.session.remove()
+        db.engine.dispose()
+
+
+def _tamper(statement, **params):
+
+    db.session.execute(db.text(statement), params)
+    db.session.commit()
+
+
+def test_untouched_ledger_verifies(ledger):
+
+    result = verify_ledger(full=True)
+    assert (result["ok"], result["checked"]) == (True, len(ledger))
+
+    for user_id in (ALICE, BOB):
+        result = verify_user_ledger(user_id)
+        assert (result["ok"], result["checked"]) == (True, len(ledger) // 2)
+
+
+def test_edited_entry_is_found(ledger):
+
+    edited = ledger[4]
+    _tamper("UPDATE ledger_entry SET category = 'forged' WHERE id = :id", id=edited)
+
+    assert verify_ledger(full=True)["first_bad_entry"] == edited
+    assert verify_ledger(full=True)["ok"] is False
+
+    user_id = db.session.get(LedgerEntry, edited).user_id
+    assert verify_user_ledger(user_id)["first_bad_entry"] == edited
+    assert verify_user_ledger(BOB if user_id == ALICE else ALICE)["ok"] is True
+
+
+def test_deleted_entry_is_found(ledger):
+
+    deleted = ledger[4]
+    user_id = db.session.get(LedgerEntry, deleted).user_id
+    _tamper("DELETE FROM ledger_entry WHERE id = :id", id=deleted)
+
+    # the next entry no longer links to its predecessor
+    result = verify_ledger(full=True)
+    assert (result["ok"], result["first_bad_entry"]) == (False, ledger[5])
+
+    # and the user's next entry no longer links to theirs
+    result = verify_user_ledger(user_id)
+    assert (result["ok"], result["first_bad_entry"]) == (False, ledger[6])
+
+
+def test_truncated_tail_is_found(ledger):
+
+    kept = ledger[-3]
+    _tamper("DELETE FROM ledger_entry WHERE id > :id", id=kept)
+
+    result = verify_ledger(full=True)
+    assert (result["ok"], result["first_bad_entry"]) == (False, kept + 1)
+
+    # each user's head names the entry that was cut off
+    for user_id in (ALICE, BOB):
+        head = db.session.get(LedgerUserHead, user_id)
+        result = verify_user_ledger(user_id)
+        assert (result["ok"], result["first_bad_entry"]) == (False, head.entry_id)
+
+
+def test_checkpointed_audit_still_finds_later_edits(ledger):
+
+    assert verify_ledger()["ok"]
+
+    begin_write()
+    newer = add_ledger_entries([(ALICE, 99, "waste")])[0]
+    db.session.commit()
+
+    _tamper("UPDATE ledger_entry SET mission_id = 7 WHERE id = :id", id=newer)
+
+    result = verify_ledger()
+    assert (result["ok"], result["from_entry"], result["first_bad_entry"]) == \
+        (False, ledger[-1], newer)
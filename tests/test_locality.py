@@ -0,0 +1,54 @@
+import pytest
+
+from services.ai_service import extract_location_from_text
+from services.locality_matcher import (
+    FUZZY_MAX_TOKENS,
+    MAX_TOKEN_EDITS,
+    build_fuzzy_index,
+    fuzzy_match_location,
+    _near_tokens
+)
+
+
+@pytest.mark.parametrize("text, place", [
+    ("garbage dumped in rohni", "Rohini"),
+    ("garbage in rohni sector 3", "Rohini"),
+    ("pothole near lajpath ngr", "Lajpat Nagar"),
+    ("laxmi ngr me paani nahi aa raha", "Laxmi Nagar"),
+    ("okhala phase 2 me kooda", "Okhla"),
+])
+def test_misspelt_places_are_found(text, place):
+
+    assert extract_location_from_text(text) == place
+
+
+@pytest.mark.parametrize("text", [
+    # near a place name, but not in a place-like context
+    "the palm tree fell on the road",
+    "a packet of chips on the road",
+    "param is not here",
+    # no place at all
+    "water logging near the stadium",
+    "street light broken for two weeks",
+])
+def test_ordinary_words_stay_unmatched(text):
+
+    assert extract_location_from_text(text) is None
+
+
+def test_long_complaints_are_capped():
+
+    index = build_fuzzy_index(["rohini", "lajpat nagar"])
+    lookups = []
+
+    def near(token, max_edits=MAX_TOKEN_EDITS):
+        lookups.append(token)
+        return _near_tokens(index, token, max_edits)
+
+    filler = [f"word{i}" for i in range(1000)]
+
+    # each searched word is looked up alone and joined with the next
+    assert fuzzy_match_location(filler + ["in", "rohni"], index, cache=near) is None
+    assert len(lookups) <= 2 * FUZZY_MAX_TOKENS
+
+    assert fuzzy_match_location(["in", "rohni"] + filler, index, cache=near) == "rohini"
@@ -0,0 +1,100 @@
+import logging
+import threading
+
+from models import db, Proof, ProofBatch
+from services import blockchain_service
+from services.blockchain_service import seal_batch, seal_pending, write_proof_to_blockchain
+from services.ledger_service import verify_ledger
+from services.storage import begin_write
+
+WRITERS = 4
+SEALERS = 3
+PROOFS_PER_WRITER = 100
+
+
+def test_sealers_and_writers_share_the_lock(app):
+
+    errors = []
+    done = threading.Event()
+
+    with app.app_context():
+        first = db.session.query(db.func.max(Proof.id)).scalar() or 0
+        # chain rows earlier tests wrote directly, outside the timed part
+        verify_ledger()
+        db.session.remove()
+
+    def writer(n):
+        with app.app_context():
+            try:
+                for i in range(PROOFS_PER_WRITER):
+                    begin_write()
+                    write_proof_to_blockchain(n * 100000 + i, "b", "a")
+                    db.session.commit()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.session.remove()
+
+    def sealer():
+        with app.app_context():
+            try:
+                while not done.is_set():
+                    seal_batch(limit=16)
+                    verify_ledger()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.session.remove()
+
+    writers = [threading.Thread(target=writer, args=(n,)) for n in range(WRITERS)]
+    sealers = [threading.Thread(target=sealer) for _ in range(SEALERS)]
+
+    for t in writers + sealers:
+        t.start()
+    for t in writers:
+        t.join()
+    done.set()
+    for t in sealers:
+        t.join()
+
+    assert not errors
+
+    with app.app_context():
+        seal_pending()
+
+        proofs = Proof.query.filter(Proof.id > first).all()
+        sizes = db.session.query(db.func.sum(ProofBatch.size))\
+            .filter(ProofBatch.id.in_({p.batch_id for p in proofs})).scalar()
+
+        # every proof sealed into exactly one batch
+        assert len(proofs) == WRITERS * PROOFS_PER_WRITER
+        assert all(p.batch_id is not None for p in proofs)
+        assert sizes == len(proofs)
+
+
+def test_failed_anchor_is_logged_and_retried(app, monkeypatch, caplog):
+
+    class Down:
+        def anchor(self, root):
+            raise ConnectionError("chain unreachable")
+
+    with app.app_context():
+        begin_write()
+        write_proof_to_blockchain(424242, "b", "a")
+        db.session.commit()
+
+        real = blockchain_service._backend
+        monkeypatch.setattr(blockchain_service, "_backend", Down())
+
+        with caplog.at_level(logging.ERROR, logger="services.blockchain_service"):
+            seal_pending()
+
+        assert "anchoring batch" in caplog.text
+
+        batch_id = Proof.query.filter_by(mission_id=424242).one().batch_id
+        assert db.session.get(ProofBatch, batch_id).anchored_at is None
+
+        monkeypatch.setattr(blockchain_service, "_backend", real)
+        seal_pending()
+
+        assert db.session.get(ProofBatch, batch_id).anchor_tx is not None
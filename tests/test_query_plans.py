@@ -0,0 +1,276 @@
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+from sqlalchemy import event
+
+from conftest import login
+from models import db, ensure_schema, Issue, Mission
+from services.rank_service import rank_index
+
+
+# the tables as they were before any index existed
+BASELINE_SCHEMA = """
+CREATE TABLE issue (
+    id INTEGER NOT NULL, user_id INTEGER, original_text TEXT,
+    category VARCHAR(50), subcategory VARCHAR(50), location VARCHAR(120),
+    severity VARCHAR(20), status VARCHAR(30), created_at DATETIME,
+    estimated_days INTEGER, PRIMARY KEY (id)
+);
+CREATE TABLE ledger_entry (
+    id INTEGER NOT NULL, user_id INTEGER, mission_id INTEGER,
+    category VARCHAR(50), timestamp DATETIME, PRIMARY KEY (id)
+);
+CREATE TABLE mission (
+    id INTEGER NOT NULL, issue_id INTEGER, user_id INTEGER, title VARCHAR(200),
+    category VARCHAR(50), location VARCHAR(120), blockchain_tx VARCHAR,
+    status VARCHAR(30), created_at DATETIME, completed_at DATETIME,
+    PRIMARY KEY (id)
+);
+CREATE TABLE reward (
+    id INTEGER NOT NULL, name VARCHAR, min_credits INTEGER,
+    description VARCHAR, PRIMARY KEY (id)
+);
+CREATE TABLE user (
+    id INTEGER NOT NULL, name VARCHAR(120), email VARCHAR(120),
+    password VARCHAR(200), credits INTEGER, public_profile BOOLEAN,
+    PRIMARY KEY (id), UNIQUE (email)
+);
+"""
+
+LOCATIONS = ["Rohini", "Saket", "Dwarka", "Karol Bagh", "Okhla"]
+CATEGORIES = ["Garbage", "Roads", "Water", "Electricity"]
+
+# every scan of a real table, including full walks of one of its indexes
+# ("SCAN issue USING INDEX ...", "USING COVERING INDEX ..."); scans of
+# subqueries or the FTS table don't name a real table
+FULL_SCAN = re.compile(r"^SCAN (\w+)(?: USING (?:COVERING )?INDEX (\w+))?")
+
+# the reward catalogue is a handful of rows, read whole and cached
+WHOLE_TABLE_READS = {"reward"}
+
+# index walks that are expected, and the statements they may serve
+EXPECTED_INDEX_SCANS = {
+    # region rollup: one pass over the covering index, cached per filter
+    ("issue", "ix_issue_location_category"):
+        re.compile(r"GROUP BY issue\.location, issue\.category"),
+    # newest-first officer pages stop at the page size (a substring
+    # location filter cannot seek any index, it reads on until the page
+    # is full)
+    ("issue", "ix_issue_created"):
+        re.compile(r"ORDER BY issue\.created_at DESC, issue\.id DESC\s+LIMIT"),
+    # leaderboards stop after the top entries
+    ("user", "ix_user_credits"):
+        re.compile(r"ORDER BY user\.credits DESC\s+LIMIT"),
+}
+
+
+def _fill_baseline(path):
+
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+
+    start = datetime(2026, 1, 1)
+
+    conn.executemany(
+        "INSERT INTO user (id, name, email, password, credits, public_profile) "
+        "VALUES (?, ?, ?, 'pw', ?, 1)",
+        [(i, f"u{i}", f"u{i}@example.com", i % 97) for i in range(1, 501)]
+    )
+    conn.executemany(
+        "INSERT INTO issue (id, user_id, original_text, category, location, "
+        "status, created_at) VALUES (?, ?, 'pothole', ?, ?, 'SUBMITTED', ?)",
+        [
+            (i, i % 500 + 1, CATEGORIES[i % 4], LOCATIONS[i % 5],
+             (start + timedelta(minutes=i)).isoformat(" "))
+            for i in range(1, 20001)
+        ]
+    )
+    conn.executemany(
+        "INSERT INTO mission (id, issue_id, user_id, title, category, location, "
+        "status) VALUES (?, ?, ?, 'Survey', ?, ?, ?)",
+        [
+            (i, i, i % 500 + 1, CATEGORIES[i % 4], LOCATIONS[i % 5],
+             "COMPLETED" if i % 3 else "OPEN")
+            for i in range(1, 20001)
+        ]
+    )
+    conn.executemany(
+        "INSERT INTO ledger_entry (id, user_id, mission_id, category, timestamp) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [
+            (i, i % 500 + 1, i, CATEGORIES[i % 4],
+             (start + timedelta(minutes=i)).isoformat(" "))
+            for i in range(1, 20001)
+        ]
+    )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture(scope="module")
+def upgraded_db(tmp_root):
+
+    path = f"{tmp_root}/baseline.sqlite"
+    _fill_baseline(path)
+
+    # a second app on the same models, so the upgrade runs exactly as it
+    # does at startup against a live db.sqlite
+    legacy = Flask("legacy")
+    legacy.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{path}"
+    db.init_app(legacy)
+
+    with legacy.app_context():
+        db.create_all(bind_key=None)
+        ensure_schema()
+        db.engine.dispose()
+
+    return path
+
+
+@pytest.fixture
+def captured(app):
+
+    # the rank index is built once per worker at startup, not per request
+    with app.app_context():
+        rank_index.warm_up()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and not executemany:
+            statements.append((statement, parameters))
+
+    with app.app_context():
+        engines = list(db.engines.values())
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", record)
+
+    yield statements
+
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def _endpoint_calls(app, client, make_user):
+
+    citizen = make_user(credits=40)
+    officer = make_user("planner@delhi.gov.in")
+
+    with app.app_context():
+        issue = Issue(user_id=citizen, original_text="pothole", category="Roads",
+                      location="Rohini", status="SUBMITTED",
+                      created_at=datetime(2026, 3, 1))
+        db.session.add(issue)
+        db.session.flush()
+        db.session.add(Mission(issue_id=issue.id, user_id=citizen, title="Survey",
+                               category="Roads", location="Rohini", status="OPEN"))
+        db.session.commit()
+        issue_id = issue.id
+
+    login(client, citizen)
+    citizen_urls = [
+        "/api/me",
+        "/api/me/summary",
+        "/api/me/impact",
+        "/api/me/metrics",
+        "/api/me/rewards",
+        "/api/me/rank",
+        "/api/leaderboard",
+        f"/api/user/{citizen}/ledger",
+        f"/api/issue/{issue_id}",
+        f"/api/issue/{issue_id}/missions",
+        "/api/admin/area-insights?location=Rohini",
+        "/api/map/regions",
+        "/api/map/issues?location=Rohini",
+    ]
+
+    for url in citizen_urls:
+        yield url, client.get(url)
+
+    login(client, officer, officer=True)
+    officer_urls = [
+        "/api/officer/issues",
+        "/api/officer/issues?location=Rohini",
+        "/api/admin/leaderboard",
+    ]
+
+    for url in officer_urls:
+        yield url, client.get(url)
+
+
+def test_hot_endpoints_avoid_full_table_scans(app, client, make_user,
+                                              upgraded_db, captured):
+
+    calls = list(_endpoint_calls(app, client, make_user))
+    assert all(resp.status_code == 200 for _, resp in calls), \
+        [(url, resp.status_code) for url, resp in calls if resp.status_code != 200]
+
+    tables = set(db.metadata.tables) - WHOLE_TABLE_READS
+    conn = sqlite3.connect(upgraded_db)
+    scans = []
+
+    try:
+        for statement, parameters in captured:
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+
+            for row in plan:
+                match = FULL_SCAN.match(row[-1])
+                if not match or match.group(1) not in tables:
+                    continue
+
+                expected = EXPECTED_INDEX_SCANS.get(match.groups())
+                if expected is None or not expected.search(statement):
+                    scans.append((row[-1], statement))
+    finally:
+        conn.close()
+
+    assert captured
+    assert not scans, scans
+
+
+# ---------------- concurrent boot ----------------
+
+BOOT_WORKERS = 4
+
+
+def test_workers_booting_together_migrate_once(tmp_root):
+
+    path = f"{tmp_root}/legacy-{uuid.uuid4().hex[:8]}.sqlite"
+    _fill_baseline(path)
+
+    # the factory's schema step, started in the same instant by every
+    # worker, as gunicorn does after forking
+    start = time.time() + 3
+    script = f"import time, app; time.sleep(max(0, {start} - time.time())); app.init_db()"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", script], cwd=root,
+            env={**os.environ, "DATABASE_URL": f"sqlite:///{path}"},
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        for _ in range(BOOT_WORKERS)
+    ]
+    failures = [w.communicate(timeout=120)[1] for w in workers if w.wait(timeout=120)]
+
+    assert not failures, failures[0]
+
+    conn = sqlite3.connect(path)
+    try:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(issue)")}
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(issue)")}
+    finally:
+        conn.close()
+
+    assert {"lat", "lng", "geohash", "dedup_indexed"} <= columns
+    assert {index.name for index in Issue.__table__.indexes} <= indexes
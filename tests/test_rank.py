@@ -0,0 +1,78 @@
+from datetime import datetime
+
+from conftest import login
+from models import db, Issue, Mission
+from services.credits_service import award_mission_completed
+from services.rank_service import RankIndex
+
+
+def _report(app, user_id, location, n=1):
+
+    with app.app_context():
+        db.session.add_all([
+            Issue(user_id=user_id, original_text="garbage", category="Waste",
+                  location=location, status="SUBMITTED", created_at=datetime.utcnow())
+            for _ in range(n)
+        ])
+        db.session.commit()
+
+
+def _award(app, user_id, category="Air"):
+
+    with app.app_context():
+        mission = Mission(user_id=user_id, category=category, title="Plant",
+                          location="Rankpur", status="OPEN")
+        db.session.add(mission)
+        db.session.flush()
+        award_mission_completed(mission)
+        db.session.commit()
+
+
+def test_rank_sees_awards_made_by_other_workers(app, make_user):
+
+    a, b = make_user(), make_user()
+    _report(app, a, "Rankpur")
+    _report(app, b, "Rankpur")
+
+    # two workers, each with its own index
+    first, second = RankIndex(), RankIndex()
+
+    with app.app_context():
+        first.warm_up()
+        second.warm_up()
+
+    _award(app, b)
+    _award(app, b)
+
+    with app.app_context():
+        assert first.rank(b) == second.rank(b)
+        assert first.rank(b)["rank_in_area"] == 1
+        assert second.rank(a)["rank_in_area"] == 2
+
+
+def test_rank_picks_up_new_reports(app, make_user):
+
+    uid = make_user()
+
+    index = RankIndex()
+
+    with app.app_context():
+        assert index.rank(uid)["area"] is None
+
+    _report(app, uid, "Newpur", n=2)
+    _report(app, uid, "Oldpur")
+
+    with app.app_context():
+        assert index.rank(uid)["area"] == "Newpur"
+
+
+def test_rank_endpoint(app, client, make_user):
+
+    uid = make_user()
+    _report(app, uid, "Rankpur")
+    login(client, uid)
+
+    resp = client.get("/api/me/rank")
+
+    assert resp.status_code == 200
+    assert resp.get_json()["area"] == "Rankpur"
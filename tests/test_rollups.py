@@ -0,0 +1,114 @@
+import json
+import uuid
+from collections import Counter
+
+from conftest import login
+from models import db, Issue, LedgerEntry, UserRollup
+from services.ledger_service import add_ledger_entries
+from services.rollup_service import user_summary
+from services.storage import begin_write
+
+
+def _report(client, location):
+
+    res = client.post("/api/issue/report", json={
+        "description": f"Broken street light outside block C {uuid.uuid4().hex}",
+        "location": location
+    })
+    assert res.status_code == 200
+
+    return res.get_json()
+
+
+def _rollups(user_ids):
+
+    return Counter({
+        (r.user_id, r.kind, r.key): r.count
+        for r in UserRollup.query.filter(UserRollup.user_id.in_(user_ids))
+    })
+
+
+def _recounted(user_ids):
+
+    # what rebuild_rollups would store, straight from the source tables
+    counts = Counter()
+
+    for user_id, location, n in db.session.query(
+        Issue.user_id, Issue.location, db.func.count(Issue.id)
+    ).filter(Issue.user_id.in_(user_ids)).group_by(Issue.user_id, Issue.location):
+        counts[(user_id, "location", location or "")] += n
+        counts[(user_id, "total", "reports")] += n
+
+    for user_id, category, n in db.session.query(
+        LedgerEntry.user_id, LedgerEntry.category, db.func.count(LedgerEntry.id)
+    ).filter(LedgerEntry.user_id.in_(user_ids)).group_by(
+        LedgerEntry.user_id, LedgerEntry.category
+    ):
+        counts[(user_id, "category", category or "")] += n
+        counts[(user_id, "total", "actions")] += n
+
+    return counts
+
+
+def test_rollups_match_the_source_tables(app, make_user):
+
+    alice, bob, officer = make_user(), make_user(), make_user()
+    users = [alice, bob, officer]
+
+    # reports through the API
+    client = app.test_client()
+    login(client, alice)
+    reported = [_report(client, place)
+                for place in ("Rollup Vihar", "Rollup Vihar", "Rollup Bagh")]
+
+    login(client, bob)
+    reported.append(_report(client, "Rollup Bagh"))
+
+    # completed missions write ledger entries for the issue owner
+    missions = [m["mission_id"] for r in reported for m in r["missions"]][:3]
+    assert len(missions) == 3
+
+    for mission_id in missions:
+        assert client.post(f"/api/mission/{mission_id}/complete",
+                           json={"before_hash": "b", "after_hash": "a"}).status_code == 200
+
+    # ledger entries written in one batch, several per user
+    with app.app_context():
+        begin_write()
+        add_ledger_entries([
+            (alice, None, "Roads"), (alice, None, "Roads"),
+            (bob, None, "Water"), (bob, None, None)
+        ])
+        db.session.commit()
+        db.session.remove()
+
+    # a bulk import: owners from the records, or the importing officer
+    records = [
+        {"description": f"Sewage overflow near the temple {uuid.uuid4().hex}",
+         "location": location, **({"user_id": owner} if owner else {})}
+        for owner, location in [
+            (alice, "Rollup Bagh"), (bob, "Rollup Nagar"),
+            (bob, "Rollup Nagar"), (None, "Rollup Vihar"), (None, None)
+        ]
+    ]
+
+    importer = app.test_client()
+    login(importer, officer, officer=True)
+    res = importer.post("/api/officer/import?format=jsonl",
+                        data="\n".join(json.dumps(r) for r in records),
+                        content_type="application/x-ndjson")
+    assert res.status_code == 200
+    assert res.get_json()["imported"] == len(records)
+
+    with app.app_context():
+        expected = _recounted(users)
+
+        assert expected[(alice, "total", "reports")] == 4
+        assert expected[(officer, "total", "reports")] == 2
+        assert sum(expected[(u, "total", "actions")] for u in users) == 4 + len(missions)
+
+        assert _rollups(users) == expected
+
+        summary = user_summary(bob)
+        assert summary["total_reports"] == expected[(bob, "total", "reports")]
+        assert summary["metrics"]["total_actions"] == expected[(bob, "total", "actions")]
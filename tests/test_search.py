@@ -0,0 +1,108 @@
+import uuid
+
+import pytest
+
+from conftest import login
+from models import db, Issue
+
+
+def _word():
+
+    # a token no other test writes
+    return "zq" + uuid.uuid4().hex[:10]
+
+
+@pytest.fixture
+def officer(app, make_user):
+
+    client = app.test_client()
+    login(client, make_user(), officer=True)
+
+    return client
+
+
+def _report(client, description, location="Search Nagar", **extra):
+
+    res = client.post("/api/issue/report", json={
+        "description": description, "location": location, **extra
+    })
+    assert res.status_code == 200
+
+    return res.get_json()["issue_id"]
+
+
+def _ids(officer, q, **params):
+
+    res = officer.get("/api/officer/issues/search", query_string={"q": q, **params})
+    assert res.status_code == 200, res.get_json()
+
+    return [row["id"] for row in res.get_json()]
+
+
+def test_results_are_the_matching_issues(app, client, officer, make_user):
+
+    word, other = _word(), _word()
+    login(client, make_user())
+
+    in_text = _report(client, f"Overflowing drain {word} near the market")
+    in_location = _report(client, "Overflowing drain near the school", location=f"{word} Vihar")
+    both_words = _report(client, f"Broken streetlight {word} {other}")
+    _report(client, f"Broken streetlight {other}")
+
+    # location hits rank above body text
+    assert _ids(officer, word) == [in_location, both_words, in_text]
+    assert _ids(officer, f"{word} {other}") == [both_words]
+
+    # a trailing * matches a prefix
+    assert set(_ids(officer, word[:8] + "*")) == {in_text, in_location, both_words}
+
+    # filters narrow the matches
+    officer.post(f"/api/officer/issue/{in_text}/update", json={"status": "RESOLVED"})
+    assert _ids(officer, word, status="RESOLVED") == [in_text]
+
+    assert _ids(officer, word, limit=1, offset=1) == [both_words]
+
+
+@pytest.mark.parametrize("q", [
+    '"', '""', "NEAR(", ")", "*", "(", "-", "^", ":", "AND", "OR NOT",
+    'drain" OR "garbage', "NEAR(drain garbage, 2)", "location:drain",
+    "{original_text}: drain", "drain*)", "* drain", "drain AND (", "\x00",
+])
+def test_fts_syntax_in_the_query_is_not_parsed(officer, q):
+
+    res = officer.get("/api/officer/issues/search", query_string={"q": q})
+    assert res.status_code in (200, 400), res.data
+    assert isinstance(res.get_json(), list) or "error" in res.get_json()
+
+
+def test_bad_parameters_are_rejected(officer):
+
+    for params in ({}, {"q": "drain", "limit": "x"}, {"q": "drain", "offset": -1},
+                   {"q": "drain", "since": "yesterday"}):
+        res = officer.get("/api/officer/issues/search", query_string=params)
+        assert res.status_code == 400
+
+
+def test_citizens_cannot_search(client, make_user):
+
+    login(client, make_user())
+    assert client.get("/api/officer/issues/search?q=drain").status_code == 403
+
+
+def test_edits_and_deletes_reach_the_index(app, client, officer, make_user):
+
+    old, new, place = _word(), _word(), _word()
+    login(client, make_user())
+    issue_id = _report(client, f"Garbage pile {old} behind the bus depot")
+    gone_id = _report(client, f"Garbage pile {old} by the canal")
+
+    with app.app_context():
+        issue = db.session.get(Issue, issue_id)
+        issue.original_text = f"Garbage pile {new} behind the bus depot"
+        issue.location = f"{place} Enclave"
+        db.session.delete(db.session.get(Issue, gone_id))
+        db.session.commit()
+
+    assert _ids(officer, old) == []
+    assert _ids(officer, new) == [issue_id]
+    assert _ids(officer, place) == [issue_id]
@@ -0,0 +1,112 @@
+import time
+
+import pytest
+
+from conftest import login
+from services.ai_service import reverse_geocode
+from services.offline_geocoder import LocalityGrid
+
+
+BAD = ["nan", "inf", "-inf", float("nan"), float("inf")]
+
+
+# ---------------- non-finite coordinates ----------------
+
+@pytest.mark.parametrize("value", BAD)
+def test_reverse_geocode_rejects_non_finite(nominatim, value):
+
+    assert reverse_geocode(value, 77.2) is None
+    assert reverse_geocode(28.6, value) is None
+    assert nominatim.requests == []
+
+
+@pytest.mark.parametrize("value", ["nan", "inf"])
+def test_reverse_geocode_endpoints_survive_non_finite(app, client, make_user, value):
+
+    res = client.post("/api/reverse-geocode", json={"lat": value, "lng": value})
+    assert res.status_code == 200
+    assert res.get_json() == {"location": None}
+
+    login(client, make_user())
+
+    res = client.post("/api/issue/prefill", json={
+        "text": "garbage everywhere",
+        "browser_location": {"lat": value, "lng": value}
+    })
+    assert res.status_code == 200
+
+    res = client.post("/api/issues/nearby",
+                      json={"lat": 28.6, "lng": 77.2, "radius_km": value})
+    assert res.status_code == 200
+
+
+def test_locality_grid_near_the_pole_returns_quickly():
+
+    grid = LocalityGrid([{"lat": 28.6, "lng": 77.2, "name": "somewhere"}])
+
+    started = time.perf_counter()
+    assert grid.nearest(89.9999, 0.0) is None
+    assert time.perf_counter() - started < 0.1
+
+
+# ---------------- map bbox validation ----------------
+
+@pytest.mark.parametrize("bbox", [
+    "nan,77.1,28.7,77.3",
+    "28.5,77.1,inf,77.3",
+    "-1e300,-1e300,1e300,1e300",
+    "28.7,77.1,28.5,77.3",
+    "28.5,77.1,28.7",
+    "a,b,c,d",
+])
+def test_map_bbox_rejects_bad_boxes(client, make_user, bbox):
+
+    login(client, make_user())
+
+    res = client.get(f"/api/map/issues?bbox={bbox}")
+    assert res.status_code == 400
+
+
+def test_map_bbox_and_radius_accept_good_input(client, make_user):
+
+    login(client, make_user())
+
+    assert client.get("/api/map/issues?bbox=28.5,77.1,28.7,77.3").status_code == 200
+    assert client.get("/api/map/issues?lat=28.6&lng=77.2&radius_km=nan").status_code == 200
+    assert client.get("/api/map/issues?lat=28.6&lng=77.2&radius_km=1e9").status_code == 200
+
+
+# ---------------- region stats cache ----------------
+
+def test_region_cache_keeps_only_recent_filters(app, client):
+
+    import app as app_module
+
+    app_module.invalidate_region_cache()
+
+    assert client.get("/api/map/regions").status_code == 200
+
+    for n in range(3 * app_module.REGION_CACHE_SIZE):
+        assert client.get(f"/api/map/regions?location=nowhere-{n}").status_code == 200
+        # the unfiltered view is in use and stays cached
+        client.get("/api/map/regions")
+
+    assert len(app_module._region_cache) == app_module.REGION_CACHE_SIZE
+    assert "" in app_module._region_cache
+    assert "nowhere-0" not in app_module._region_cache
+
+
+def test_map_limit_cannot_be_lifted(app, client, make_user):
+
+    login(client, make_user())
+
+    for lat in (28.601, 28.602, 28.603):
+        client.post("/api/issue/report", json={
+            "description": "Broken footpath tiles", "location": "Limit Nagar",
+            "browser_location": {"lat": lat, "lng": 77.2}
+        })
+
+    for limit in (-1, 0):
+        res = client.get(f"/api/map/issues?bbox=28.6,77.19,28.61,77.21&limit={limit}")
+        assert res.status_code == 200
+        assert len(res.get_json()) == 1
@@ -0,0 +1,67 @@
+import threading
+import time
+
+THREADS = 8
+
+
+def test_first_requests_together_migrate_once(app, monkeypatch):
+
+    import app as app_module
+
+    calls = []
+    real = app_module.ensure_schema
+
+    def slow_ensure_schema():
+        calls.append(threading.get_ident())
+        time.sleep(0.2)
+        real()
+
+    monkeypatch.setattr(app_module, "ensure_schema", slow_ensure_schema)
+    monkeypatch.delitem(app.extensions, "db_ready")
+
+    barrier = threading.Barrier(THREADS)
+    errors = []
+
+    def first_request():
+        barrier.wait()
+        try:
+            app.test_client().get("/")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=first_request) for _ in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert len(calls) == 1
+    assert app.extensions["db_ready"]
+
+
+def test_create_app_twice_starts_one_set_of_threads(app):
+
+    import app as app_module
+    from services.rank_service import rank_index
+
+    before = {t.name for t in threading.enumerate()}
+
+    try:
+        assert app_module.create_app(warm=False) is app
+        started = app.extensions["background_services"]
+
+        assert app_module.create_app(warm=False) is app
+        assert app.extensions["background_services"] is started
+
+        names = [t.name for t in threading.enumerate() if t.name not in before]
+        assert sorted(names) == ["dedup-maintenance", "proof-sealer", "rank-refresher"]
+    finally:
+        services = app.extensions.pop("background_services", {})
+        for stop, _ in services.values():
+            stop.set()
+        rank_index._wake.set()
+
+        for _, threads in services.values():
+            for t in threads if isinstance(threads, list) else [threads]:
+                t.join(timeout=30)
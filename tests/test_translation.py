@@ -0,0 +1,96 @@
+import pytest
+
+import services.translation_service as translation_service
+from services.tiered_cache import TieredCache
+from services.translation_service import (
+    StubTranslateBackend,
+    translate_many,
+    translate_to_english
+)
+
+
+class Recording(StubTranslateBackend):
+
+    # remembers each batch it was asked for
+    def __init__(self, translate=None):
+        super().__init__(translate or (lambda text: f"en:{text}"))
+        self.batches = []
+
+    def translate_batch(self, texts):
+        self.batches.append(list(texts))
+        return super().translate_batch(texts)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+
+    cache = TieredCache(str(tmp_path / "translate.sqlite"), "translation_cache",
+                        3600, max_memory=16)
+    monkeypatch.setattr(translation_service, "translation_cache", cache)
+
+    return cache
+
+
+@pytest.fixture
+def backend(monkeypatch, cache):
+
+    backend = Recording()
+    monkeypatch.setattr(translation_service, "_backend", backend)
+
+    return backend
+
+
+def test_miss_goes_to_the_backend(backend, cache):
+
+    assert translate_to_english("sadak pe gaddha hai") == "en:sadak pe gaddha hai"
+
+    assert backend.batches == [["sadak pe gaddha hai"]]
+    assert cache.stats()["misses"] == 1
+
+
+def test_hit_skips_the_backend(backend, cache):
+
+    translate_to_english("kooda nahi uthaya")
+    assert translate_to_english("kooda nahi uthaya") == "en:kooda nahi uthaya"
+
+    assert backend.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_hit_from_disk_after_restart(backend, cache, monkeypatch):
+
+    translate_to_english("paani nahi aa raha")
+
+    # a new process: empty memory tier, same SQLite file
+    fresh = TieredCache(cache.path, "translation_cache", 3600, max_memory=16)
+    monkeypatch.setattr(translation_service, "translation_cache", fresh)
+
+    assert translate_to_english("paani nahi aa raha") == "en:paani nahi aa raha"
+    assert backend.calls == 1
+
+
+def test_batch_sends_each_uncached_text_once(backend):
+
+    translate_to_english("batti gul")
+
+    texts = ["naali band", "batti gul", "", "naali band", "sadak tooti", "naali band"]
+
+    assert translate_many(texts) == [
+        "en:naali band", "en:batti gul", "", "en:naali band",
+        "en:sadak tooti", "en:naali band"
+    ]
+
+    # one backend call for the whole batch, duplicates and hits left out
+    assert backend.batches[1:] == [["naali band", "sadak tooti"]]
+
+
+def test_failures_fall_back_and_are_not_cached(backend):
+
+    backend.translate = lambda text: None
+
+    assert translate_many(["ganda paani"]) == ["ganda paani"]
+
+    backend.translate = lambda text: f"en:{text}"
+
+    assert translate_many(["ganda paani"]) == ["en:ganda paani"]
+    assert backend.calls == 2